@@ -3455,14 +3455,7 @@ def _db_migrate(cwd: pathlib.Path) -> int:
             rows = src.execute(
                 "SELECT subject, predicate, object, proof FROM facts"
             ).fetchall()
-            for subject, predicate, obj, proof in rows:
-                simba.kg.store.kg_add(
-                    subject,
-                    predicate,
-                    obj,
-                    proof,
-                    project_path=project_path,
-                )
+            simba.kg.store.kg_add_many(rows, project_path=project_path)
             if rows:
                 migrated["kg_edges (from neuron/truth.db)"] = len(rows)
         except sqlite3.OperationalError:
@@ -10,17 +10,45 @@ import contextlib
 import dataclasses
 import pathlib
 import sqlite3
+import threading
 import uuid
 from typing import TYPE_CHECKING
 
 import simba._vendor.peewee as pw
 import simba.config
+import simba.repo_root
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator
 
 _SCHEMA_INITIALIZERS: list[Callable[[sqlite3.Connection], None]] = []
 
+# Applied to every connection (peewee and raw).  WAL turns each commit into an
+# append to ``simba.db-wal`` instead of a rewrite + fsync of the main file, and
+# lets readers proceed while a writer commits; NORMAL sync is durable under
+# WAL except on power loss.  WAL is persistent, so ``simba.db-wal`` and
+# ``simba.db-shm`` sidecars live next to ``simba.db`` from the first connect.
+# ``mmap_size`` lets reads (FTS lookups in particular) come straight from the
+# page cache instead of a read() copy per page; it only reserves address space.
+PRAGMAS: dict[str, object] = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "temp_store": "memory",
+    "cache_size": -20000,
+    "mmap_size": 268435456,
+    "wal_autocheckpoint": 1000,
+    # ANALYZE (and ``PRAGMA optimize``) sample this many rows per index
+    # rather than scanning whole tables, so refreshing stats stays cheap.
+    "analysis_limit": 400,
+}
+
+# Per-connection prepared-statement cache (sqlite3 default: 128).  Peewee
+# renders the same SQL text for the same query shape, and the hooks, FTS and
+# context helpers together use more distinct statements than the default
+# holds, so keep room for all of them.
+CACHED_STATEMENTS = 256
+
 
 @simba.config.configurable("project")
 @dataclasses.dataclass
@@ -53,7 +81,7 @@ def register_schema(init_fn: Callable[[sqlite3.Connection], None]) -> None:
 # to this repo's ``.simba/simba.db`` and ensures all registered tables exist.
 # This is the ORM replacement for the raw ``get_db`` / ``register_schema`` path.
 
-database = pw.SqliteDatabase(None, pragmas={"busy_timeout": 3000})
+database = pw.SqliteDatabase(None, pragmas=PRAGMAS, cached_statements=CACHED_STATEMENTS)
 
 
 class BaseModel(pw.Model):
@@ -107,26 +135,46 @@ def connect(cwd: pathlib.Path | None = None) -> Generator[pw.SqliteDatabase]:
         if _schema_ready.get(path) != len(_MODELS):
             # Run legacy raw initializers first (FTS5 virtual tables + triggers
             # that peewee models can't express), then create model tables.
-            _init_schemas(database.connection())
+            _ensure_schemas(database.connection(), path)
             if _MODELS:
                 database.create_tables(_MODELS)
             _schema_ready[path] = len(_MODELS)
         yield database
 
 
-def find_repo_root(cwd: pathlib.Path) -> pathlib.Path | None:
-    """Walk up from *cwd* looking for a ``.git`` directory.
+# In-process writers queue on this lock instead of spinning in busy_timeout;
+# writers in other processes are still serialised by SQLite's write lock.
+_WRITE_LOCK = threading.RLock()
+
+
+@contextlib.contextmanager
+def write_transaction(cwd: pathlib.Path | None = None) -> Generator[pw.SqliteDatabase]:
+    """``connect()`` plus one ``BEGIN IMMEDIATE`` transaction.
+
+    The write lock is taken up front, so the transaction never has to upgrade
+    a read snapshot -- under WAL that upgrade fails with ``SQLITE_BUSY``
+    without waiting if another writer committed in between.  Commits on
+    exit, rolls back on exception.
+    """
+    with _WRITE_LOCK, connect(cwd) as db, db.atomic("IMMEDIATE"):
+        yield db
+
+
+@contextlib.contextmanager
+def read_transaction(cwd: pathlib.Path | None = None) -> Generator[pw.SqliteDatabase]:
+    """``connect()`` plus one read snapshot (deferred transaction).
 
-    Returns the repo root path, or ``None`` if not found.
+    Under WAL the snapshot neither blocks nor waits on writers.  Do not
+    write inside it; finish reading, then open a ``write_transaction``.
     """
-    current = cwd.resolve()
-    while True:
-        if (current / ".git").is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            return None
-        current = parent
+    with connect(cwd) as db, db.atomic("DEFERRED"):
+        yield db
+
+
+# Re-exported: the lookup lives in a dependency-free module so hot CLI paths
+# (``simba orchestration status``) can use it without importing the ORM.
+find_repo_root = simba.repo_root.find_repo_root
+_repo_roots = simba.repo_root._repo_roots
 
 
 def get_db_path(cwd: pathlib.Path | None = None) -> pathlib.Path:
@@ -148,23 +196,84 @@ def _init_schemas(conn: sqlite3.Connection) -> None:
         init_fn(conn)
 
 
+# path -> len(_SCHEMA_INITIALIZERS) when the raw initializers last ran for it.
+# Same scheme as ``_schema_ready``: a lazily-imported subsystem registering a
+# new initializer makes every path run them once more; otherwise ``open_db``
+# skips the DDL scripts and migration probes after the first open.
+_raw_schema_ready: dict[str, int] = {}
+
+
+def _ensure_schemas(conn: sqlite3.Connection, path: str) -> None:
+    """Run the raw initializers for *path* unless they already ran."""
+    if _raw_schema_ready.get(path) != len(_SCHEMA_INITIALIZERS):
+        _init_schemas(conn)
+        _refresh_stats(conn)
+        _raw_schema_ready[path] = len(_SCHEMA_INITIALIZERS)
+
+
+def _refresh_stats(conn: sqlite3.Connection) -> None:
+    """Keep the query planner's statistics current, without ever waiting.
+
+    A never-analyzed database gets a full ANALYZE; otherwise
+    ``PRAGMA optimize=0x10002`` (SQLite's advice for a connection that has
+    just opened) re-analyzes only tables whose size has drifted, and is
+    usually a no-op.  Both need the write lock, so ``busy_timeout`` is
+    dropped to 0 around them: when another process is writing, this open
+    skips the refresh instead of stalling.  Stale statistics only cost
+    plan quality.
+    """
+    conn.execute("PRAGMA busy_timeout = 0")
+    try:
+        with contextlib.suppress(sqlite3.Error):
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone():
+                conn.execute("PRAGMA optimize=0x10002")
+            else:
+                conn.execute("ANALYZE")
+    finally:
+        conn.execute(f"PRAGMA busy_timeout = {PRAGMAS['busy_timeout']}")
+
+
 @contextlib.contextmanager
 def get_db(cwd: pathlib.Path | None = None) -> Generator[sqlite3.Connection]:
     """Yield a connection to ``simba.db``, creating schema if needed.
 
     The connection is closed when the context manager exits.
     """
-    db_path = get_db_path(cwd)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
+    conn = open_db(get_db_path(cwd))
     try:
-        _init_schemas(conn)
         yield conn
     finally:
         conn.close()
 
 
+def open_db(
+    db_path: pathlib.Path, *, check_same_thread: bool = True
+) -> sqlite3.Connection:
+    """Open a connection to *db_path* with ``PRAGMAS`` applied and schema created.
+
+    For long-lived connections (e.g. a writer thread that keeps one open for
+    its whole life).  The caller is responsible for closing the connection.
+    """
+    path = str(db_path)
+    if not db_path.exists():
+        # New (or deleted) database: it needs its directory and full schema.
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        _raw_schema_ready.pop(path, None)
+    conn = sqlite3.connect(
+        path,
+        timeout=5.0,
+        check_same_thread=check_same_thread,
+        cached_statements=CACHED_STATEMENTS,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    _ensure_schemas(conn, path)
+    return conn
+
+
 def resolve_project_id(cwd: pathlib.Path | None = None) -> str:
     """Return the stable project id for the repo containing *cwd*.
 
@@ -195,7 +304,4 @@ def get_connection(cwd: pathlib.Path | None = None) -> sqlite3.Connection | None
     db_path = get_db_path(cwd)
     if not db_path.exists():
         return None
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    _init_schemas(conn)
-    return conn
+    return open_db(db_path)
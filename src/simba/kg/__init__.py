@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
-from simba.kg.store import kg_add, kg_invalidate, kg_query, kg_supersede
+from simba.kg.store import (
+    kg_add,
+    kg_add_many,
+    kg_invalidate,
+    kg_query,
+    kg_supersede,
+)
 
-__all__ = ["kg_add", "kg_invalidate", "kg_query", "kg_supersede"]
+__all__ = ["kg_add", "kg_add_many", "kg_invalidate", "kg_query", "kg_supersede"]
@@ -36,6 +36,8 @@ CREATE INDEX IF NOT EXISTS idx_kg_edges_subject
     ON kg_edges(subject, project_path);
 CREATE INDEX IF NOT EXISTS idx_kg_edges_project
     ON kg_edges(project_path);
+CREATE INDEX IF NOT EXISTS idx_kg_edges_predicate
+    ON kg_edges(predicate, project_path);
 """
 
 _SCHEMA_FTS_SQL = """\
@@ -262,8 +264,13 @@ def kg_add(
     now = _now()
     with simba.db.connect():
         subject, object = _canonicalize(subject, object, project_path)
-        try:
-            KgEdge.create(
+        # A duplicate -- the same edge re-recorded within the same second,
+        # since valid_from is part of the key -- is skipped rather than
+        # raised.  DO NOTHING covers only uniqueness conflicts, and kg_edges
+        # has one: UNIQUE(subject, predicate, object, project_path,
+        # valid_from).  NOT NULL and CHECK violations still raise.
+        inserted = (
+            KgEdge.insert(
                 subject=subject,
                 predicate=predicate,
                 object=object,
@@ -278,9 +285,63 @@ def kg_add(
                 project_path=project_path,
                 created_at=now,
             )
-            return "added"
-        except pw.IntegrityError:
-            return "exists"
+            .on_conflict(action="NOTHING")
+            .as_rowcount()
+            .execute()
+        )
+    return "added" if inserted else "exists"
+
+
+# Rows per INSERT statement in kg_add_many (13 bound columns each, well under
+# SQLite's host-parameter limit).
+_ADD_MANY_CHUNK = 500
+
+
+def kg_add_many(
+    facts: typing.Iterable[tuple[str, str, str, str]],
+    *,
+    subject_type: str = "concept",
+    object_type: str = "concept",
+    project_path: str | None = None,
+    occurred_at: str | None = None,
+) -> int:
+    """Insert many ``(subject, predicate, object, proof)`` edges in one commit.
+
+    The bulk form of :func:`kg_add` for verifiers, migrations and the sync
+    extractor recording facts in a batch: every edge shares one
+    ``valid_from``, one ``occurred_at`` and one transaction, and duplicates
+    are skipped.  Returns the number added.
+    """
+    if project_path is None:
+        project_path = simba.db.resolve_project_id()
+    now = _now()
+    added = 0
+    with simba.db.write_transaction():
+        rows = []
+        for subject, predicate, object, proof in facts:
+            subject, object = _canonicalize(subject, object, project_path)
+            rows.append(
+                {
+                    "subject": subject,
+                    "predicate": predicate,
+                    "object": object,
+                    "subject_type": subject_type,
+                    "object_type": object_type,
+                    "proof": proof,
+                    "valid_from": now,
+                    "occurred_at": occurred_at,
+                    "project_path": project_path,
+                    "created_at": now,
+                }
+            )
+        for batch in pw.chunked(rows, _ADD_MANY_CHUNK):
+            added += (
+                KgEdge.insert_many(batch)
+                .on_conflict(action="NOTHING")
+                .as_rowcount()
+                .execute()
+            )
+    return added
 
 
 def kg_invalidate(
@@ -551,6 +612,38 @@ def kg_density(project_path: str | None = None) -> dict[str, float]:
     }
 
 
+# Rendered SQL of the plain lookup (no FTS query, currently-valid edges only),
+# keyed by which of subject/predicate/project_path filter it.  That is the hot
+# ``kg_query(subject=...)`` call agents make before assuming a fact, so each
+# of the eight shapes is built and rendered by peewee once, then reused.
+_LOOKUP_SQL: dict[tuple[bool, bool, bool], str] = {}
+
+
+def _lookup_query(
+    subject: str | None, predicate: str | None, project_path: str | None, limit: int
+) -> typing.Any:
+    """Return the plain currently-valid lookup as a ``KgEdge.raw`` query."""
+    key = (bool(subject), bool(predicate), bool(project_path))
+    params = [v for v in (subject, predicate, project_path) if v]
+    params.append(limit)
+    sql = _LOOKUP_SQL.get(key)
+    if sql is None:
+        q = KgEdge.select()
+        if subject:
+            q = q.where(KgEdge.subject == subject)
+        if predicate:
+            q = q.where(KgEdge.predicate == predicate)
+        if project_path:
+            q = q.where(KgEdge.project_path == project_path)
+        q = q.where(KgEdge.valid_to.is_null()).limit(limit)
+        sql, rendered = q.sql()
+        if rendered == params:
+            _LOOKUP_SQL[key] = sql
+        else:
+            params = rendered
+    return KgEdge.raw(sql, *params)
+
+
 def kg_query(
     query: str | None = None,
     subject: str | None = None,
@@ -584,33 +677,42 @@ def kg_query(
     swallowed and yields ``[]``.
     """
     with simba.db.connect():
-        if query:
-            q = (
-                KgEdge.select()
-                .join(KgEdgeFTS, on=(KgEdgeFTS.rowid == KgEdge.id))
-                .where(KgEdgeFTS.match(query))
-            )
+        if (
+            not query
+            and as_of is None
+            and not include_expired
+            and occurred_after is None
+            and occurred_before is None
+        ):
+            q = _lookup_query(subject, predicate, project_path, limit)
         else:
-            q = KgEdge.select()
-            if subject:
-                q = q.where(KgEdge.subject == subject)
-            if predicate:
-                q = q.where(KgEdge.predicate == predicate)
+            if query:
+                q = (
+                    KgEdge.select()
+                    .join(KgEdgeFTS, on=(KgEdgeFTS.rowid == KgEdge.id))
+                    .where(KgEdgeFTS.match(query))
+                )
+            else:
+                q = KgEdge.select()
+                if subject:
+                    q = q.where(KgEdge.subject == subject)
+                if predicate:
+                    q = q.where(KgEdge.predicate == predicate)
 
-        if project_path:
-            q = q.where(KgEdge.project_path == project_path)
+            if project_path:
+                q = q.where(KgEdge.project_path == project_path)
 
-        q = _apply_temporal(
-            q,
-            as_of=as_of,
-            include_expired=include_expired,
-            occurred_after=occurred_after,
-            occurred_before=occurred_before,
-        )
+            q = _apply_temporal(
+                q,
+                as_of=as_of,
+                include_expired=include_expired,
+                occurred_after=occurred_after,
+                occurred_before=occurred_before,
+            )
 
-        if query:
-            q = q.order_by(KgEdgeFTS.bm25())
-        q = q.limit(limit)
+            if query:
+                q = q.order_by(KgEdgeFTS.bm25())
+            q = q.limit(limit)
 
         try:
             rows = list(q)
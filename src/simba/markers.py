@@ -11,7 +11,12 @@ All functions are string-based (no file I/O). Callers handle persistence.
 
 from __future__ import annotations
 
+import functools
 import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 NAMESPACE = "SIMBA"
 
@@ -46,21 +51,33 @@ def extract_blocks(content: str, name: str) -> list[str]:
     return _block_pattern(name).findall(content)
 
 
+@functools.lru_cache(maxsize=32)
+def _blocks_pattern(names: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile one regex matching a block of any of *names*."""
+    alternation = "|".join(re.escape(name) for name in names)
+    return re.compile(
+        rf"(<!--\s*BEGIN\s+{NAMESPACE}:(?P<name>{alternation})\s*-->)"
+        rf".*?"
+        rf"(<!--\s*END\s+{NAMESPACE}:(?P=name)\s*-->)",
+        re.DOTALL,
+    )
+
+
 def update_blocks(content: str, updates: dict[str, str]) -> str:
     """Replace content between existing SIMBA markers for the given sections.
 
     Only touches sections whose names are keys in *updates*.
-    Other SIMBA blocks (including ``core``) are left untouched.
+    Other SIMBA blocks (including ``core``) are left untouched.  All sections
+    are rewritten in a single scan of *content*; the new content is inserted
+    literally.
     """
-    for name, new_content in updates.items():
-        pattern = re.compile(
-            rf"(<!--\s*BEGIN\s+{NAMESPACE}:{re.escape(name)}\s*-->)"
-            rf".*?"
-            rf"(<!--\s*END\s+{NAMESPACE}:{re.escape(name)}\s*-->)",
-            re.DOTALL,
-        )
-        content = pattern.sub(rf"\1\n{new_content}\2", content)
-    return content
+    if not updates:
+        return content
+    pattern = _blocks_pattern(tuple(updates))
+    return pattern.sub(
+        lambda m: f"{m[1]}\n{updates[m['name']]}{m[3]}",
+        content,
+    )
 
 
 def has_marker(content: str, name: str) -> bool:
@@ -68,6 +85,24 @@ def has_marker(content: str, name: str) -> bool:
     return begin_tag(name) in content
 
 
+@functools.lru_cache(maxsize=32)
+def _begin_tags_pattern(names: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile one regex matching the exact BEGIN marker of any of *names*."""
+    alternation = "|".join(re.escape(name) for name in names)
+    return re.compile(rf"<!-- BEGIN {NAMESPACE}:({alternation}) -->")
+
+
+def present_markers(content: str, names: Iterable[str]) -> set[str]:
+    """Return the subset of *names* that :func:`has_marker` would find.
+
+    One scan of *content* regardless of how many names are checked.
+    """
+    names = tuple(names)
+    if not names:
+        return set()
+    return set(_begin_tags_pattern(names).findall(content))
+
+
 def make_empty_block(name: str) -> str:
     """Return an empty marker pair ready for injection."""
     return f"{begin_tag(name)}\n{end_tag(name)}"
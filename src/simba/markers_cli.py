@@ -245,6 +245,7 @@ def cmd_update(root: Path) -> int:
     # Group by file.
     files = sorted({h.path for h in hits})
     updated_count = 0
+    updates = simba.orchestration.templates.build_updates()
 
     for md_file in files:
         try:
@@ -252,7 +253,9 @@ def cmd_update(root: Path) -> int:
         except OSError:
             continue
 
-        result = simba.orchestration.templates.update_managed_sections(original)
+        result = simba.orchestration.templates.update_managed_sections(
+            original, updates
+        )
         if result != original:
             md_file.write_text(result)
             try:
@@ -5,13 +5,30 @@ Ported from claude-memory/services/vector-db.js.
 
 from __future__ import annotations
 
+import collections
+import datetime
 import inspect
 import logging
-import time
 import typing
 
 logger = logging.getLogger("simba.memory")
 
+# What the LanceDB/pyarrow stack actually raises on the data path: engine
+# failures surface as `RuntimeError("lance error: ...")`, bad input as
+# `ValueError` (pyarrow's `ArrowInvalid` subclasses it), a missing column as
+# `lancedb.exceptions.MissingColumnError` (a `KeyError`), storage as `OSError`.
+# Handlers catch exactly these so programming errors still surface and the
+# happy path carries no catch-all.
+_LANCE_ERRORS: tuple[type[Exception], ...] = (
+    RuntimeError,
+    ValueError,
+    KeyError,
+    OSError,
+)
+
+# ISO-8601 UTC stamp format for `lastAccessedAt` (matches `createdAt`).
+_ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
 # Columns a vector-search caller actually reads off each result row -- NEVER
 # `vector` itself. Mirrors `simba.memory.hybrid`'s `_session_record`/
 # `_from_vector` field set (duplicated rather than imported: `hybrid` imports
@@ -187,6 +204,13 @@ def _scope_match(
     return pp in set(project_scopes)
 
 
+def _str_array(values: typing.Iterable[str]) -> typing.Any:
+    """A pyarrow string array for ``pc.is_in`` value sets."""
+    import pyarrow as pa
+
+    return pa.array([str(v) for v in values], type=pa.string())
+
+
 async def find_duplicates(
     table: typing.Any, embedding: list[float], threshold: float
 ) -> dict[str, typing.Any]:
@@ -199,25 +223,28 @@ async def find_duplicates(
             await table.vector_search(embedding)
             .column("vector")
             .distance_type("cosine")
-            # Only `id`/`type`/`_distance` are read below (2026-07-18).
+            # SYSTEM rows are excluded by the (pre-)filter, so the single
+            # nearest remaining row is the only candidate worth shipping.
+            # `type != 'SYSTEM'` alone is NULL (not true) for an untyped row,
+            # which would drop it; those stay candidates, as before.
+            .where("type IS NULL OR type != 'SYSTEM'")
+            # Only `id`/`_distance` are read below (2026-07-18).
             # `_distance` is requested EXPLICITLY: Lance's auto-inclusion is
             # deprecated (WARN observed live 2026-07-20) and a future release
             # will drop it, silently breaking the similarity threshold.
-            .select(["_distance", "id", "type"])
-            .limit(5)
+            .select(["_distance", "id"])
+            .limit(1)
             .to_list()
         )
-        for result in results:
-            if result.get("type") == "SYSTEM":
-                continue
-            similarity = 1 - (result.get("_distance", 0))
+        if results:
+            similarity = 1 - (results[0].get("_distance", 0))
             if similarity >= threshold:
                 return {
                     "is_duplicate": True,
-                    "existing_id": result["id"],
+                    "existing_id": results[0]["id"],
                     "similarity": similarity,
                 }
-    except Exception:
+    except _LANCE_ERRORS:
         logger.warning("find_duplicates failed", exc_info=True)
 
     return {"is_duplicate": False}
@@ -257,7 +284,10 @@ async def search_memories(
         # message instead of a silent empty recall.
         check_embedding_dim(len(embedding), await _resolve_table_dim(table))
 
-        results = (
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arrow = (
             await table.vector_search(embedding)
             .column("vector")
             .distance_type("cosine")
@@ -266,55 +296,69 @@ async def search_memories(
             # itself (2026-07-18).
             .select(list(_SEARCH_RESULT_FIELDS))
             .limit(max_results * 3)
-            .to_list()
+            # Arrow, not `to_list()`: every filter below runs as a columnar
+            # mask and only the surviving top-K rows become Python dicts.
+            .to_arrow()
+        )
+        if arrow.num_rows == 0:
+            return []
+
+        def _col(name: str, fill: typing.Any) -> typing.Any:
+            # Null/absent cells take `fill`, like the old `r.get(name, fill)`.
+            if name not in arrow.column_names:
+                return pa.array([fill] * arrow.num_rows)
+            return pc.fill_null(arrow[name], fill)
+
+        # float64 so scores match the old per-row `1 - float(_distance)`.
+        similarity = pc.subtract(1, pc.cast(_col("_distance", 0.0), pa.float64()))
+        types = _col("type", "")
+        mask = pc.and_(
+            pc.not_equal(types, "SYSTEM"),
+            pc.greater_equal(similarity, min_similarity),
         )
 
+        filter_types = filters.get("types", [])
+        if filter_types:
+            mask = pc.and_(mask, pc.is_in(types, value_set=_str_array(filter_types)))
+
         # Hierarchical scoping is active only when the lever is on AND the client
         # supplied a scope chain; otherwise fall through to the strict legacy path
         # (byte-identical behavior when off).
         hierarchical = bool(filters.get("hierarchical_recall")) and bool(
             filters.get("project_scopes")
         )
-        project_scopes = filters.get("project_scopes") or []
-        include_global = bool(filters.get("hierarchical_recall_include_global", True))
-
-        memories = []
-        for r in results:
-            similarity = 1 - (r.get("_distance", 0))
-            if r.get("type") == "SYSTEM":
-                continue
-            if similarity < min_similarity:
-                continue
-
-            filter_types = filters.get("types", [])
-            if filter_types and r.get("type") not in filter_types:
-                continue
-
-            if hierarchical:
-                # Ancestor-membership scope (spec 26): keep exact-or-ancestor
-                # matches and (optionally) global memories.
-                if not _scope_match(
-                    r.get("projectPath"),
-                    project_scopes,
-                    include_global=include_global,
-                ):
-                    continue
-            else:
-                filter_project = filters.get("projectPath")
-                # Strict scope: keep only exact-project matches (drops both
-                # other-project and untagged/global memories).
-                if filter_project and r.get("projectPath") != filter_project:
-                    continue
-
-            memories.append({**r, "similarity": similarity})
-
-        memories.sort(key=lambda m: m["similarity"], reverse=True)
-        return memories[:max_results]
+        project_paths = _col("projectPath", "")
+        if hierarchical:
+            # Ancestor-membership scope (spec 26, see `_scope_match`): keep
+            # exact-or-ancestor matches and (optionally) global memories.
+            project_scopes = filters.get("project_scopes") or []
+            include_global = bool(
+                filters.get("hierarchical_recall_include_global", True)
+            )
+            in_scope = pc.is_in(project_paths, value_set=_str_array(project_scopes))
+            is_global = pc.equal(project_paths, "")
+            mask = pc.and_(
+                mask,
+                pc.or_(in_scope, is_global)
+                if include_global
+                else pc.and_(in_scope, pc.invert(is_global)),
+            )
+        else:
+            filter_project = filters.get("projectPath")
+            # Strict scope: keep only exact-project matches (drops both
+            # other-project and untagged/global memories).
+            if filter_project:
+                mask = pc.and_(mask, pc.equal(project_paths, filter_project))
+
+        kept = arrow.append_column("similarity", similarity).filter(mask)
+        # Stable descending sort, matching the old `list.sort(reverse=True)`.
+        order = pc.sort_indices(kept, sort_keys=[("similarity", "descending")])
+        return kept.take(order[:max_results]).to_pylist()
     except EmbeddingDimMismatchError as exc:
         # Loud + actionable: the store needs migration, not a silent empty recall.
         logger.error("recall disabled — %s", exc)
         return []
-    except Exception:
+    except _LANCE_ERRORS:
         logger.warning("search_memories failed", exc_info=True)
         return []
 
@@ -417,7 +461,7 @@ async def compact_table(
         stats = await table.optimize(**kwargs)
         logger.info("[compact] optimized: %s", stats)
         return stats
-    except Exception:
+    except Exception:  # maintenance must never take its caller down
         logger.debug("compact_table failed", exc_info=True)
         return None
 
@@ -426,36 +470,47 @@ async def count_rows(table: typing.Any) -> int:
     """Count total rows in a table."""
     try:
         return await table.count_rows()
-    except Exception:
+    except _LANCE_ERRORS:
         return 0
 
 
 async def update_access_tracking(table: typing.Any, memory_ids: list[str]) -> None:
     """Update lastAccessedAt and increment accessCount for recalled memories.
 
-    Fire-and-forget: exceptions are logged but never propagated.
+    Fire-and-forget: LanceDB failures are logged but never propagated.
     """
+    if not memory_ids:
+        return
     try:
-        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        for mid in memory_ids:
-            # Read current accessCount so we can increment it (only column
-            # read below -- never `vector`, 2026-07-18).
-            rows = (
-                await table.query()
-                .where(f"id = '{mid}'")
-                .select(["accessCount"])
-                .limit(1)
-                .to_list()
+        # One stamp per batch, hoisted out of the per-id loop.
+        now = datetime.datetime.now(datetime.UTC).strftime(_ISO_FORMAT)
+        # One columnar `id IN (...)` read of just `id`/`accessCount` for the
+        # whole batch, instead of a point query per id (never `vector`).
+        hits = collections.Counter(memory_ids)
+        quoted = {mid: str(mid).replace("'", "''") for mid in hits}
+        ids_sql = ", ".join(f"'{q}'" for q in quoted.values())
+        arrow = (
+            await table.query()
+            .where(f"id IN ({ids_sql})")
+            .select(["id", "accessCount"])
+            .to_arrow()
+        )
+        counts = dict(
+            zip(
+                arrow["id"].to_pylist(),
+                arrow["accessCount"].to_pylist(),
+                strict=True,
             )
-            current_count = rows[0].get("accessCount", 0) if rows else 0
+        )
+        for mid, n in hits.items():
             await table.update(
                 updates={
                     "lastAccessedAt": now,
-                    "accessCount": current_count + 1,
+                    "accessCount": (counts.get(mid) or 0) + n,
                 },
-                where=f"id = '{mid}'",
+                where=f"id = '{quoted[mid]}'",
             )
-    except Exception:
+    except _LANCE_ERRORS:
         logger.debug(
             "access-tracking update failed for ids=%s",
             memory_ids,
@@ -140,7 +140,6 @@ def run_derive(
         return DeriveResult()
 
     facts_dir: str | None = None
-    dl_file: str | None = None
     try:
         edges = _fetch_edges(project_path, cfg.derive_max_edges)
     except Exception:
@@ -154,12 +153,13 @@ def run_derive(
             "".join(f"{s}\t{p}\t{o}\t{eid}\n" for (eid, s, p, o) in edges)
         )
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".dl", delete=False) as f:
-            f.write(_SEED_RULES + extra_rules)
-            dl_file = f.name
+        # The program shares the facts directory, so the single rmtree below
+        # is the only cleanup.
+        dl_path = pathlib.Path(facts_dir) / "derive.dl"
+        dl_path.write_text(_SEED_RULES + extra_rules)
 
         result = subprocess.run(
-            [cfg.souffle_cmd, "-F", facts_dir, "-D", "-", dl_file],
+            [cfg.souffle_cmd, "-F", facts_dir, "-D", "-", str(dl_path)],
             capture_output=True,
             text=True,
             timeout=60,
@@ -175,8 +175,5 @@ def run_derive(
         logger.debug("derive: souffle run failed", exc_info=True)
         return DeriveResult(errors=1, edges_fed=len(edges))
     finally:
-        if dl_file:
-            with contextlib.suppress(OSError):
-                pathlib.Path(dl_file).unlink()
         if facts_dir:
             shutil.rmtree(facts_dir, ignore_errors=True)
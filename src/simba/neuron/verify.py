@@ -2,81 +2,251 @@
 
 from __future__ import annotations
 
+import json
+import os
+import pathlib
 import subprocess
 import tempfile
-from pathlib import Path
+import threading
+import typing
 
 import simba.neuron.config
 
+_Z3_TIMEOUT = 30  # seconds per script
+
+# Runs inside the worker: imports z3 once, then executes one JSON-encoded
+# script per request line in a fresh copy of the z3 namespace and answers
+# with one JSON line on the reply pipe (fd ``argv[1]``).  Requests are read
+# from a private dup of the stdin pipe and fd 0 is /dev/null, so a script
+# that reads stdin cannot swallow the next request.  fds 1 and 2 point at a
+# temp file while a script runs, so output that bypasses ``sys.stdout``
+# (``os.write``, z3's C code, child processes) is captured too and can never
+# be mistaken for a reply.  Afterwards builtins, ``sys.modules``, the z3
+# modules' globals, cwd, ``os.environ``, ``sys.path``, the recursion limit,
+# the standard streams and z3's global params are put back as they were.
+_Z3_WORKER_SCRIPT = """\
+import builtins, io, json, os, sys, tempfile, traceback
+reply = os.fdopen(int(sys.argv[1]), "w")
+os.set_inheritable(reply.fileno(), False)
+requests = os.fdopen(os.dup(0), "r")
+null_fd = os.open(os.devnull, os.O_RDONLY)
+os.dup2(null_fd, 0)
+os.close(null_fd)
+base = {}
+exec("from z3 import *", base)
+import z3
+builtins_dict = vars(builtins)
+pristine_builtins = dict(builtins_dict)
+pristine_modules = set(sys.modules)
+pristine_z3 = {
+    module: dict(vars(module))
+    for name, module in sys.modules.items()
+    if name == "z3" or name.startswith("z3.")
+}
+pristine_cwd = os.getcwd()
+pristine_environ = dict(os.environ)
+pristine_path = list(sys.path)
+pristine_recursion_limit = sys.getrecursionlimit()
+streams = sys.stdin, sys.stdout, sys.stderr
+real_fds = os.dup(1), os.dup(2)
+for line in requests:
+    code = 0
+    with tempfile.TemporaryFile() as buf:
+        os.dup2(buf.fileno(), 1)
+        os.dup2(buf.fileno(), 2)
+        sys.stdin = io.StringIO()
+        try:
+            exec(json.loads(line), {**base, "__name__": "__main__"})
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                code = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                code = 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+            sys.stdin, sys.stdout, sys.stderr = streams
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(real_fds[0], 1)
+            os.dup2(real_fds[1], 2)
+        buf.seek(0)
+        output = buf.read().decode(errors="replace")
+    builtins_dict.clear()
+    builtins_dict.update(pristine_builtins)
+    for name in set(sys.modules) - pristine_modules:
+        del sys.modules[name]
+    for module, namespace in pristine_z3.items():
+        vars(module).clear()
+        vars(module).update(namespace)
+    os.chdir(pristine_cwd)
+    if os.environ != pristine_environ:
+        os.environ.clear()
+        os.environ.update(pristine_environ)
+    sys.path[:] = pristine_path
+    sys.setrecursionlimit(pristine_recursion_limit)
+    z3.reset_params()
+    reply.write(json.dumps({"code": code, "output": output}) + "\\n")
+    reply.flush()
+"""
+
+
+class Z3Worker:
+    """A long-lived interpreter with z3 imported, running one script at a time.
+
+    Starting Python and importing z3 costs far more than a typical proof, so
+    scripts are sent to one worker over stdin instead of a process each.
+    Every script gets a fresh namespace and the worker undoes its global
+    side effects afterwards.  A script that hangs past the timeout, kills
+    the interpreter, or garbles a reply has the worker discarded, and the
+    next call starts a new one.
+    """
 
-class TempFileCleanup:
-    """Context manager that deletes a temporary file on exit."""
-
-    def __init__(self, filepath: str | Path) -> None:
-        self.path = Path(filepath)
-
-    def __enter__(self) -> Path:
-        return self.path
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._replies: typing.BinaryIO | None = None
+        self._lock = threading.Lock()
 
-    def __exit__(
-        self,
-        exc_type: type[BaseException] | None,
-        exc_val: BaseException | None,
-        exc_tb: object,
-    ) -> None:
-        if self.path.exists():
-            self.path.unlink()
+    def _spawn(self) -> None:
+        read_fd, write_fd = os.pipe()
+        try:
+            self._proc = subprocess.Popen(
+                [
+                    simba.neuron.config.CONFIG.python_cmd,
+                    "-u",
+                    "-c",
+                    _Z3_WORKER_SCRIPT,
+                    str(write_fd),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                # Only written outside scripts, e.g. a failing z3 import.
+                stderr=subprocess.PIPE,
+                pass_fds=(write_fd,),
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        self._replies = os.fdopen(read_fd, "rb")
+
+    def _discard(self) -> str:
+        """Kill the worker and return what it wrote to stderr."""
+        proc, replies = self._proc, self._replies
+        self._proc = self._replies = None
+        if replies is not None:
+            replies.close()
+        if proc is None:
+            return ""
+        proc.kill()
+        proc.wait()
+        proc.stdin.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        return stderr.decode(errors="replace")
+
+    def run(self, python_script: str, timeout: float) -> tuple[int, str]:
+        """Run *python_script*; return ``(exit_code, stdout + stderr)``.
+
+        Raises ``subprocess.TimeoutExpired`` when the script overruns, or
+        when an earlier script still holds the worker after *timeout*.
+        """
+        if not self._lock.acquire(timeout=timeout):
+            raise subprocess.TimeoutExpired(
+                simba.neuron.config.CONFIG.python_cmd, timeout
+            )
+        try:
+            if self._proc is None or self._proc.poll() is not None:
+                self._discard()
+                self._spawn()
+            proc, replies = self._proc, self._replies
+            timed_out = threading.Event()
+
+            def _expire() -> None:
+                timed_out.set()
+                proc.kill()
+
+            watchdog = threading.Timer(timeout, _expire)
+            watchdog.start()
+            try:
+                try:
+                    # The protocol is ASCII-only JSON, so the pipes stay binary.
+                    proc.stdin.write(json.dumps(python_script).encode() + b"\n")
+                    proc.stdin.flush()
+                    line = replies.readline()
+                except OSError:
+                    line = b""
+                finally:
+                    watchdog.cancel()
+                if line:
+                    reply = json.loads(line)
+                    return reply["code"], reply["output"]
+            except BaseException:
+                # A reply we cannot parse leaves the worker out of step with
+                # its callers; never reuse it.
+                self._discard()
+                raise
+            # The worker died: killed by the watchdog, or the script exited
+            # the interpreter outright (os._exit, a crash in z3).
+            stderr = self._discard()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            return proc.returncode, f"Z3 worker exited before replying.\n{stderr}"
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+
+_z3_worker = Z3Worker()
 
 
 def verify_z3(python_script: str) -> str:
-    """Execute a Z3 proof script in an isolated process.
+    """Execute a Z3 proof script in the isolated Z3 worker process.
 
     The script MUST print 'PROVEN' or 'COUNTEREXAMPLE' to stdout.
     The environment already has 'from z3 import *'.
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write("from z3 import *\n")
-        f.write(python_script)
-        temp_name = f.name
-
-    with TempFileCleanup(temp_name):
-        try:
-            result = subprocess.run(
-                [simba.neuron.config.CONFIG.python_cmd, temp_name],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            output = result.stdout + result.stderr
-            if result.returncode != 0:
-                return f"Script Error (Exit Code {result.returncode}):\n{output}"
-
-            return f"Execution Result:\n{output}"
-        except subprocess.TimeoutExpired:
-            return "Error: Z3 verification timed out (limit: 30s)."
-        except Exception as exc:
-            return f"Logic Execution Failed: {exc}"
+    try:
+        code, output = _z3_worker.run(python_script, _Z3_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return f"Error: Z3 verification timed out (limit: {_Z3_TIMEOUT}s)."
+    except Exception as exc:
+        return f"Logic Execution Failed: {exc}"
+    if code != 0:
+        return f"Script Error (Exit Code {code}):\n{output}"
+    return f"Execution Result:\n{output}"
 
 
 def analyze_datalog(datalog_code: str, facts_dir: str = ".") -> str:
     """Run a Soufflé Datalog analysis.
 
-    Writes code to a temporary file and executes against the specified
-    fact directory.
+    Writes the program into a private temporary directory and executes it
+    against the specified fact directory.
     """
     souffle_cmd = simba.neuron.config.CONFIG.souffle_cmd
     if not souffle_cmd:
         return "Error: 'souffle' binary not found in system PATH."
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".dl", delete=False) as f:
-        f.write(datalog_code)
-        temp_name = f.name
-
-    with TempFileCleanup(temp_name):
-        cmd = [souffle_cmd, "-F", facts_dir, "-D", "-", temp_name]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            return f"Souffle Logic Error:\n{result.stderr}"
-        return f"Analysis Output:\n{result.stdout}"
+    # souffle runs the C preprocessor over its input path and may open it
+    # more than once, so it needs a real file rather than a pipe.
+    with tempfile.TemporaryDirectory(prefix="simba-datalog-") as tmp:
+        program = pathlib.Path(tmp) / "program.dl"
+        program.write_bytes(datalog_code.encode())
+        cmd = [souffle_cmd, "-F", facts_dir, "-D", "-", str(program)]
+        # Binary pipes: decode only the stream that is actually returned.
+        result = subprocess.run(cmd, capture_output=True)
+
+    if result.returncode != 0:
+        return f"Souffle Logic Error:\n{result.stderr.decode(errors='replace')}"
+    return f"Analysis Output:\n{result.stdout.decode(errors='replace')}"
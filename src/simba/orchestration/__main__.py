@@ -14,24 +14,13 @@ from __future__ import annotations
 import argparse
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import simba.db
-import simba.orchestration.agents
-import simba.orchestration.config
-import simba.orchestration.install
-import simba.orchestration.templates
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
-def main(argv: list[str] | None = None) -> int:
-    if argv is None:
-        argv = sys.argv[1:]
-
-    parser = argparse.ArgumentParser(
-        description="Orchestration: Agent dispatch and management for Claude"
-    )
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-
-    # --- install ---
+def _add_install(subparsers: argparse._SubParsersAction) -> None:
     install_parser = subparsers.add_parser(
         "install",
         help="Register MCP server with Claude and bootstrap agents",
@@ -50,11 +39,13 @@ def main(argv: list[str] | None = None) -> int:
         help="Use hot-reload proxy mode",
     )
 
-    # --- run ---
+
+def _add_run(subparsers: argparse._SubParsersAction) -> None:
     run_parser = subparsers.add_parser("run", help="Run the MCP server (internal use)")
     run_parser.add_argument("--root-dir", type=Path, required=True, help="Project root")
 
-    # --- proxy ---
+
+def _add_proxy(subparsers: argparse._SubParsersAction) -> None:
     proxy_parser = subparsers.add_parser(
         "proxy", help="Run MCP server via hot-reload proxy"
     )
@@ -68,7 +59,8 @@ def main(argv: list[str] | None = None) -> int:
         "--root-dir", type=Path, required=True, help="Project root"
     )
 
-    # --- status ---
+
+def _add_status(subparsers: argparse._SubParsersAction) -> None:
     status_parser = subparsers.add_parser(
         "status", help="Update agent status (called by subagents)"
     )
@@ -76,7 +68,8 @@ def main(argv: list[str] | None = None) -> int:
     status_parser.add_argument("state", choices=["running", "completed", "failed"])
     status_parser.add_argument("--message", "-m", default="", help="Status message")
 
-    # --- agents ---
+
+def _add_agents(subparsers: argparse._SubParsersAction) -> None:
     agents_parser = subparsers.add_parser(
         "agents", help="Manage agent definition files"
     )
@@ -99,11 +92,12 @@ def main(argv: list[str] | None = None) -> int:
     agents_parser.add_argument(
         "--sections",
         nargs="+",
-        default=list(simba.orchestration.templates.MANAGED_SECTIONS.keys()),
-        help="Sections to inject/update",
+        default=None,
+        help="Sections to inject/update (default: all managed sections)",
     )
 
-    # --- sync ---
+
+def _add_sync(subparsers: argparse._SubParsersAction) -> None:
     sync_parser = subparsers.add_parser(
         "sync",
         help="Update managed sections in CLAUDE.md and agent files",
@@ -121,58 +115,85 @@ def main(argv: list[str] | None = None) -> int:
         help="Agent definitions directory",
     )
 
+
+# Subcommand -> subparser builder, in `--help` listing order.
+_SUBPARSER_BUILDERS: dict[str, Callable[[argparse._SubParsersAction], None]] = {
+    "install": _add_install,
+    "run": _add_run,
+    "proxy": _add_proxy,
+    "status": _add_status,
+    "agents": _add_agents,
+    "sync": _add_sync,
+}
+
+
+def _build_parser(argv: list[str]) -> argparse.ArgumentParser:
+    """Build the CLI parser, with only the requested subcommand's subparser.
+
+    ``status`` is invoked by subagents in a hot loop, so a recognised
+    ``argv[0]`` skips constructing the other subparsers. ``--help``, no
+    command, or an unknown command builds them all (unchanged UX).
+    """
+    parser = argparse.ArgumentParser(
+        description="Orchestration: Agent dispatch and management for Claude"
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    command = argv[0] if argv else None
+    if command in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = _build_parser(argv)
     args, _ = parser.parse_known_args(argv)
 
+    # Subsystem modules are imported per command (like proxy/server below) so
+    # the hot `status` call made by subagents skips the templates/install tree.
     if args.command == "status":
-        status_id = simba.orchestration.config.STATUS_NAME_MAP.get(args.state.lower())
-        if not status_id:
-            print(f"Invalid status: {args.state}", file=sys.stderr)
-            return 1
+        import simba.orchestration.collector
 
-        run = simba.orchestration.agents.AgentRun
-        with simba.db.connect():
-            if status_id in (
-                simba.orchestration.config.Status.COMPLETED,
-                simba.orchestration.config.Status.FAILED,
-            ):
-                run.update(
-                    status_id=int(status_id),
-                    error=(
-                        args.message
-                        if status_id == simba.orchestration.config.Status.FAILED
-                        else None
-                    ),
-                    completed_at_utc=simba.orchestration.config.utc_now(),
-                ).where(run.ticket_id == args.ticket_id).execute()
-            else:
-                run.update(status_id=int(status_id)).where(
-                    run.ticket_id == args.ticket_id
-                ).execute()
+        # A running server batches reports; only open the DB without one.
+        if not simba.orchestration.collector.send_status(
+            args.ticket_id, args.state, args.message
+        ):
+            import simba.orchestration.agents
+
+            simba.orchestration.agents.apply_status_reports(
+                [(args.ticket_id, args.state, args.message)]
+            )
         print(f"{args.ticket_id} -> {args.state}")
         return 0
 
     if args.command == "agents":
+        import simba.orchestration.templates
+
         agents_dir = Path(args.dir)
         if not agents_dir.exists():
             print(f"Directory not found: {agents_dir}", file=sys.stderr)
             return 1
         if args.inject:
+            sections = args.sections or list(
+                simba.orchestration.templates.MANAGED_SECTIONS
+            )
             print(f"Injecting markers into {agents_dir}...")
-            simba.orchestration.templates.inject_markers(agents_dir, args.sections)
+            simba.orchestration.templates.inject_markers(agents_dir, sections)
         if args.update or not args.inject:
             print(f"Updating managed sections in {agents_dir}...")
-            for agent_file in agents_dir.glob("*.md"):
-                original = agent_file.read_text()
-                updated = simba.orchestration.templates.update_managed_sections(
-                    original
-                )
-                if original != updated:
-                    agent_file.write_text(updated)
-                    print(f"   {agent_file.name}")
+            for agent_file in simba.orchestration.templates.sync_agents_dir(agents_dir):
+                print(f"   {agent_file.name}")
         print("Done.")
         return 0
 
     if args.command == "sync":
+        import simba.orchestration.templates
+
         print("Syncing managed sections...")
 
         claude_md = Path(args.claude_md)
@@ -189,14 +210,8 @@ def main(argv: list[str] | None = None) -> int:
 
         agents_dir = Path(args.agents_dir)
         if agents_dir.exists():
-            for agent_file in agents_dir.glob("*.md"):
-                original = agent_file.read_text()
-                updated = simba.orchestration.templates.update_managed_sections(
-                    original
-                )
-                if original != updated:
-                    agent_file.write_text(updated)
-                    print(f"   {agent_file.name}")
+            for agent_file in simba.orchestration.templates.sync_agents_dir(agents_dir):
+                print(f"   {agent_file.name}")
         else:
             print(f"   {agents_dir} not found", file=sys.stderr)
 
@@ -204,6 +219,8 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "install":
+        import simba.orchestration.install
+
         simba.orchestration.install.install_routine(args.name, args.force, args.proxy)
         return 0
 
@@ -6,12 +6,17 @@ and structured SQLite logging.
 
 from __future__ import annotations
 
+import contextlib
 import json
 import logging
+import mmap
 import os
+import queue
+import selectors
 import signal
 import subprocess
-import tempfile
+import threading
+import traceback
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -21,18 +26,41 @@ import simba.orchestration.config
 
 if TYPE_CHECKING:
     import sqlite3
+    from collections.abc import Iterable, Iterator
 
 # ---------------------------------------------------------------------------
 # Global logger (initialized lazily)
 # ---------------------------------------------------------------------------
 
 _agent_logger: logging.Logger | None = None
+_agent_logger_lock = threading.Lock()
+
+# Children dispatched by this process, by ticket id: ``poll()`` answers
+# "has it exited?" with one waitpid(WNOHANG).  Runs dispatched by another
+# process (or before a restart) fall back to _check_process_alive.
+_LIVE_PROCS: dict[str, subprocess.Popen] = {}
 
 
 # ---------------------------------------------------------------------------
 # Schema registration
 # ---------------------------------------------------------------------------
 
+# Inlined as literals (not bound parameters) so the planner can match the
+# partial idx_active_runs index, which only holds rows still in flight.
+_ACTIVE_RUNS_WHERE = (
+    f"status_id NOT IN ({int(simba.orchestration.config.Status.COMPLETED)},"
+    f" {int(simba.orchestration.config.Status.FAILED)})"
+)
+
+
+# Enum-table seed rows, built once at import.
+_STATUS_ROWS = [
+    (status.value, status.name.lower()) for status in simba.orchestration.config.Status
+]
+_LEVEL_ROWS = [
+    (level.value, level.name.lower()) for level in simba.orchestration.config.LogLevel
+]
+
 
 def _init_agent_db_schema(conn: sqlite3.Connection) -> None:
     """Initialize agent database schema with enum tables and main tables."""
@@ -42,11 +70,9 @@ def _init_agent_db_schema(conn: sqlite3.Connection) -> None:
             name TEXT UNIQUE NOT NULL
         )"""
     )
-    for status in simba.orchestration.config.Status:
-        conn.execute(
-            "INSERT OR IGNORE INTO status_types (id, name) VALUES (?, ?)",
-            (status.value, status.name.lower()),
-        )
+    conn.executemany(
+        "INSERT OR IGNORE INTO status_types (id, name) VALUES (?, ?)", _STATUS_ROWS
+    )
 
     conn.execute(
         """CREATE TABLE IF NOT EXISTS log_levels (
@@ -54,11 +80,9 @@ def _init_agent_db_schema(conn: sqlite3.Connection) -> None:
             name TEXT UNIQUE NOT NULL
         )"""
     )
-    for level in simba.orchestration.config.LogLevel:
-        conn.execute(
-            "INSERT OR IGNORE INTO log_levels (id, name) VALUES (?, ?)",
-            (level.value, level.name.lower()),
-        )
+    conn.executemany(
+        "INSERT OR IGNORE INTO log_levels (id, name) VALUES (?, ?)", _LEVEL_ROWS
+    )
 
     conn.execute(
         """CREATE TABLE IF NOT EXISTS agent_runs (
@@ -91,6 +115,18 @@ def _init_agent_db_schema(conn: sqlite3.Connection) -> None:
         )"""
     )
 
+    # Covers agent_status_check's columns, so polling active runs never
+    # touches the (potentially huge) stdout/stderr/command columns.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_active_runs ON agent_runs"
+        " (status_id, ticket_id, agent, pid, output_format, created_at_utc,"
+        f" result, error) WHERE {_ACTIVE_RUNS_WHERE}"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_logs_ticket"
+        " ON agent_logs (ticket_id, timestamp_utc)"
+    )
+
     conn.commit()
 
 
@@ -134,14 +170,12 @@ class AgentLog(simba.db.BaseModel):
         table_name = "agent_logs"
 
 
+_STATUS_NAMES = dict(_STATUS_ROWS)
+
+
 def _status_name(status_id: int | None) -> str | None:
     """Resolve a status id to its lowercase name via the Status enum."""
-    if status_id is None:
-        return None
-    try:
-        return simba.orchestration.config.Status(status_id).name.lower()
-    except ValueError:
-        return None
+    return _STATUS_NAMES.get(status_id)
 
 
 # ---------------------------------------------------------------------------
@@ -150,37 +184,95 @@ def _status_name(status_id: int | None) -> str | None:
 
 
 def _safe_read_file(file_path: Path) -> str:
-    """Safely read file with UTF-8 fallback to replace mode."""
-    if not file_path.exists():
-        return ""
+    """Safely read file as UTF-8, replacing undecodable bytes.
+
+    Decodes straight out of an mmap of the file, so multi-MB agent output is
+    never held as an intermediate ``bytes`` copy as well as the ``str``.
+    """
     try:
-        return file_path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        try:
-            return file_path.read_text(encoding="utf-8", errors="replace")
-        except Exception as exc:
-            return f"[Error reading file: {exc}]"
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return ""
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                return str(mm, "utf-8", "replace")
+    except FileNotFoundError:
+        return ""
     except PermissionError as exc:
         return f"[Permission denied: {exc}]"
     except Exception as exc:
         return f"[Unexpected error: {exc}]"
 
 
+def _iter_lines_reversed(
+    text: str | bytes | mmap.mmap, newline: str | bytes = "\n"
+) -> Iterator[str | bytes]:
+    """Yield the lines of *text* last-first without splitting all of it."""
+    end = len(text)
+    while end > 0:
+        start = text.rfind(newline, 0, end) + 1  # type: ignore[arg-type]
+        yield text[start:end]
+        end = start - 1
+
+
+def _result_event(lines: Iterable[str | bytes]) -> str | None:
+    """Return the ``result`` of the first stream-json result event in *lines*."""
+    for line in lines:
+        if ('"result"' if isinstance(line, str) else b'"result"') not in line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError:  # JSONDecodeError, or invalid UTF-8 in bytes
+            continue
+        if isinstance(obj, dict) and obj.get("type") == "result":
+            return obj.get("result", "")
+    return None
+
+
+# Claude Code writes the result event as one compact line starting with this.
+_RESULT_MARKER = '{"type":"result"'
+
+
+def _stream_json_result(buf: str | bytes | mmap.mmap) -> str | None:
+    """Return the ``result`` of the last result event in stream-json *buf*."""
+    if isinstance(buf, str):
+        marker, newline = _RESULT_MARKER, "\n"
+    else:
+        marker, newline = _RESULT_MARKER.encode(), b"\n"
+    # Fast path: jump straight to the last line that starts with the marker
+    # and decode only that; anything unexpected falls back to the line scan.
+    start = buf.rfind(marker)  # type: ignore[arg-type]
+    if start != -1 and (start == 0 or buf[start - 1 : start] == newline):
+        end = buf.find(newline, start)  # type: ignore[arg-type]
+        result = _result_event([buf[start : end if end != -1 else len(buf)]])
+        if result is not None:
+            return result
+    return _result_event(_iter_lines_reversed(buf, newline))
+
+
+def _read_stream_json_result(file_path: Path) -> str | None:
+    """Find the result event in a stream-json file, decoding only its tail.
+
+    Returns ``None`` when the file is missing/empty or has no result event.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return None
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                return _stream_json_result(mm)
+    except OSError:
+        return None
+
+
 def _extract_result(stdout: str, stderr: str, output_format: str = "text") -> str:
     """Extract result from Claude Code output, parsing stream-json if needed."""
     if output_format == "stream-json":
-        try:
-            lines = [line for line in stdout.strip().split("\n") if line.strip()]
-            for line in lines:
-                try:
-                    obj = json.loads(line)
-                    if obj.get("type") == "result":
-                        return obj.get("result", "")
-                except json.JSONDecodeError:
-                    continue
-            return stdout.strip()
-        except Exception:
-            return stdout.strip()
+        # The result event is the last line Claude prints: look from the end,
+        # decoding only lines that could be it.
+        result = _stream_json_result(stdout)
+        return stdout.strip() if result is None else result
 
     if output_format == "json":
         try:
@@ -198,9 +290,57 @@ def _extract_result(stdout: str, stderr: str, output_format: str = "text") -> st
 
 
 # ---------------------------------------------------------------------------
-# SIGCHLD handler for zombie reaping
+# Zombie reaping: pidfd watcher (Linux), SIGCHLD handler elsewhere
 # ---------------------------------------------------------------------------
 
+# Each dispatched child's pidfd is registered with one selector that a daemon
+# thread waits on: one wakeup per exited child, which reaps exactly that pid
+# (no waitpid(-1) sweep stealing other children's exit codes, no work in
+# signal context).  Without pidfd_open, register_sigchld_handler installs the
+# SIGCHLD handler below instead.
+_HAVE_PIDFD = hasattr(os, "pidfd_open")
+_reaper: selectors.BaseSelector | None = None
+_reaper_lock = threading.Lock()
+
+
+def _reap_children(selector: selectors.BaseSelector) -> None:
+    """Reaper thread: ``poll()`` each child whose pidfd became readable."""
+    while True:
+        for key, _events in selector.select():
+            selector.unregister(key.fd)
+            os.close(key.fd)
+            proc: subprocess.Popen = key.data
+            exit_code = proc.poll()
+            # Only log through a logger the request path already set up:
+            # creating it here would bind it to whichever repo is current when
+            # this background thread happens to run.
+            logger = _agent_logger
+            if logger:
+                logger.debug(
+                    "Zombie process reaped",
+                    extra={
+                        "ticket_id": None,
+                        "event": "zombie_reaped",
+                        "data": {"pid": proc.pid, "exit_code": exit_code},
+                    },
+                )
+
+
+def _watch_child(proc: subprocess.Popen) -> None:
+    """Have the reaper thread reap *proc* as soon as it exits."""
+    global _reaper
+    try:
+        fd = os.pidfd_open(proc.pid)
+    except OSError:
+        return
+    with _reaper_lock:
+        if _reaper is None:
+            _reaper = selectors.DefaultSelector()
+            threading.Thread(
+                target=_reap_children, args=(_reaper,), name="agent-reaper", daemon=True
+            ).start()
+    _reaper.register(fd, selectors.EVENT_READ, proc)
+
 
 def _sigchld_handler(signum: int, frame: object) -> None:
     """Reap terminated child processes to prevent zombie accumulation."""
@@ -227,7 +367,13 @@ def _sigchld_handler(signum: int, frame: object) -> None:
 
 
 def register_sigchld_handler() -> None:
-    """Register the SIGCHLD handler for zombie process reaping."""
+    """Register the SIGCHLD handler for zombie process reaping.
+
+    A no-op where ``os.pidfd_open`` exists: dispatched children are then
+    reaped by the pidfd watcher (see ``_watch_child``).
+    """
+    if _HAVE_PIDFD:
+        return
     signal.signal(signal.SIGCHLD, _sigchld_handler)
 
 
@@ -236,54 +382,143 @@ def register_sigchld_handler() -> None:
 # ---------------------------------------------------------------------------
 
 
+_LOG_INSERT_SQL = (
+    "INSERT INTO agent_logs (ticket_id, level_id, event, func, data, timestamp_utc)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def _data_json(data: dict | None) -> str:
+    """Encode a log record's ``data`` compactly; empty data skips the encoder."""
+    if not data:
+        return "{}"
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+# logging levelno -> agent_logs.level_id, resolved once instead of per record.
+_LEVEL_IDS = {
+    levelno: int(level)
+    for levelno, level in simba.orchestration.config.LOGGING_LEVEL_MAP.items()
+}
+_DEFAULT_LEVEL_ID = int(simba.orchestration.config.LogLevel.INFO)
+
+
 class SQLiteLogHandler(logging.Handler):
-    """Custom logging handler that writes structured logs to SQLite."""
+    """Logging handler that writes structured logs to SQLite.
+
+    ``emit`` only enqueues the row; a daemon thread drains the queue and
+    inserts up to ``_BATCH_SIZE`` rows per transaction over one long-lived
+    connection, so callers never wait on a commit.  ``flush``/``close`` (also
+    run by ``logging.shutdown`` at exit) block until everything queued so far
+    is written.
+    """
+
+    _BATCH_SIZE = 256
+    _BATCH_WAIT = 0.05  # seconds to wait for more rows before committing
 
     def __init__(self) -> None:
         super().__init__()
+        # Opened once, here, so it binds to this repo's database; after this
+        # only the drain thread touches it (until close() has joined it).
+        self._conn = simba.db.open_db(simba.db.get_db_path(), check_same_thread=False)
+        # SimpleQueue.put is reentrant: _sigchld_handler logs from a signal
+        # handler that can interrupt an in-progress put on the same thread.
+        self._queue: queue.SimpleQueue[tuple | threading.Event | None] = (
+            queue.SimpleQueue()
+        )
+        self._thread = threading.Thread(
+            target=self._drain, name="agent-log-writer", daemon=True
+        )
+        self._thread.start()
+        # DEBUG events (zombie_reaped, process_checked) are not stored unless
+        # SIMBA_LOG_LEVEL=DEBUG; records below the level never reach emit().
+        level = logging.getLevelName(os.environ.get("SIMBA_LOG_LEVEL", "INFO").upper())
+        self.setLevel(level if isinstance(level, int) else logging.INFO)
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
             ticket_id = getattr(record, "ticket_id", None)
             event = getattr(record, "event", "log")
             data = getattr(record, "data", {})
-            level_id = simba.orchestration.config.LOGGING_LEVEL_MAP.get(
-                record.levelno, simba.orchestration.config.LogLevel.INFO
-            )
-            data_json = json.dumps(data) if data else "{}"
-
-            with simba.db.connect():
-                AgentLog.create(
-                    ticket_id=ticket_id,
-                    level_id=int(level_id),
-                    event=event,
-                    func=record.funcName,
-                    data=data_json,
-                    timestamp_utc=simba.orchestration.config.utc_now(),
+            data_json = _data_json(data)
+
+            # record.created is the same clock utc_now() reads, taken at the
+            # logging call rather than again here.
+            self._queue.put(
+                (
+                    ticket_id,
+                    _LEVEL_IDS.get(record.levelno, _DEFAULT_LEVEL_ID),
+                    event,
+                    record.funcName,
+                    data_json,
+                    int(record.created),
                 )
+            )
         except Exception:
             self.handleError(record)
 
+    def _drain(self) -> None:
+        """Writer loop: batch queued rows; ``Event`` = flush, ``None`` = stop."""
+        while True:
+            items = [self._queue.get()]
+            with contextlib.suppress(queue.Empty):
+                while len(items) < self._BATCH_SIZE and isinstance(items[-1], tuple):
+                    items.append(self._queue.get(timeout=self._BATCH_WAIT))
+            rows = [item for item in items if isinstance(item, tuple)]
+            if rows:
+                self._write(rows)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if items[-1] is None:
+                return
+
+    def _write(self, rows: list[tuple]) -> None:
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(_LOG_INSERT_SQL, rows)
+            self._conn.commit()
+        except Exception:
+            with contextlib.suppress(Exception):
+                self._conn.rollback()
+            # Same contract as handleError: logging never takes the app down.
+            if logging.raiseExceptions:
+                traceback.print_exc()
+
+    def flush(self) -> None:
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            self._conn.close()
+        super().close()
+
 
 class StructuredFormatter(logging.Formatter):
     """Formatter that ensures data field is JSON-serializable."""
 
     def format(self, record: logging.LogRecord) -> str:
-        if hasattr(record, "data") and isinstance(record.data, dict):
-            record.data_json = json.dumps(record.data)  # type: ignore[attr-defined]
-        else:
-            record.data_json = "{}"  # type: ignore[attr-defined]
+        data = getattr(record, "data", None)
+        record.data_json = _data_json(data if isinstance(data, dict) else None)  # type: ignore[attr-defined]
         return super().format(record)
 
 
 def _setup_logger() -> logging.Logger:
     """Set up the agent logger with SQLite handler."""
     logger = logging.getLogger("neuron.agents")
-    logger.setLevel(logging.DEBUG)
-    logger.handlers.clear()
+    for old in logger.handlers[:]:
+        logger.removeHandler(old)
+        old.close()
     handler = SQLiteLogHandler()
     handler.setFormatter(StructuredFormatter())
     logger.addHandler(handler)
+    # Match the handler so filtered-out calls return before building a record.
+    logger.setLevel(handler.level)
     return logger
 
 
@@ -291,10 +526,14 @@ def _get_logger() -> logging.Logger | None:
     """Get the agent logger (lazy initialization)."""
     global _agent_logger
     if _agent_logger is None:
-        try:
-            _agent_logger = _setup_logger()
-        except Exception:
-            return None
+        # The reaper thread logs too; without the lock both threads could
+        # set up a handler and leave two writers on the logger.
+        with _agent_logger_lock:
+            if _agent_logger is None:
+                try:
+                    _agent_logger = _setup_logger()
+                except Exception:
+                    return None
     return _agent_logger
 
 
@@ -303,6 +542,15 @@ def _get_logger() -> logging.Logger | None:
 # ---------------------------------------------------------------------------
 
 
+# Linux exposes the process state in /proc/<pid>/stat (one read, no `ps`
+# fork+exec); elsewhere only liveness via kill(pid, 0) is available.
+_PROCFS = Path("/proc/self/stat").exists()
+
+
+def _read_proc_stat(pid: int) -> bytes:
+    return Path(f"/proc/{pid}/stat").read_bytes()
+
+
 def _check_process_alive(pid: int | None) -> tuple[bool, bool]:
     """Check if a process is still running (and not a zombie).
 
@@ -311,88 +559,142 @@ def _check_process_alive(pid: int | None) -> tuple[bool, bool]:
     if pid is None:
         return False, False
 
-    try:
-        os.kill(pid, 0)
+    if not _PROCFS:
         try:
-            result = subprocess.run(
-                ["ps", "-p", str(pid), "-o", "stat="],
-                stdin=subprocess.DEVNULL,
-                capture_output=True,
-                text=True,
-                timeout=1,
-            )
-            if result.returncode == 0:
-                stat = result.stdout.strip()
-                is_zombie = stat.startswith("Z")
-                if is_zombie:
-                    logger = _get_logger()
-                    if logger:
-                        logger.debug(
-                            "Zombie process detected",
-                            extra={
-                                "ticket_id": None,
-                                "event": "process_checked",
-                                "data": {
-                                    "pid": pid,
-                                    "alive": True,
-                                    "is_zombie": True,
-                                },
-                            },
-                        )
-                return not is_zombie, is_zombie
+            os.kill(pid, 0)
+        except ProcessLookupError:
             return False, False
-        except Exception:
+        except PermissionError:
             return True, False
-    except ProcessLookupError:
-        return False, False
-    except PermissionError:
+        except Exception:
+            return False, False
         return True, False
-    except Exception:
+
+    try:
+        stat = _read_proc_stat(pid)
+    except OSError:
         return False, False
+    # The state letter follows the last ")": comm may contain spaces or parens.
+    fields = stat.rpartition(b")")[2].split()
+    is_zombie = bool(fields) and fields[0] == b"Z"
+    if is_zombie:
+        logger = _get_logger()
+        if logger:
+            logger.debug(
+                "Zombie process detected",
+                extra={
+                    "ticket_id": None,
+                    "event": "process_checked",
+                    "data": {
+                        "pid": pid,
+                        "alive": True,
+                        "is_zombie": True,
+                    },
+                },
+            )
+    return not is_zombie, is_zombie
 
 
-def _capture_and_cleanup(
-    ticket_id: str,
-    stdout_path: Path,
-    stderr_path: Path,
-    output_format: str,
-) -> tuple[str, str, str]:
-    """Read output files, parse result, store in DB, delete files.
+def _record_log(ticket_id: str, event: str, func: str, data: dict) -> None:
+    """Insert an INFO ``agent_logs`` row inside the caller's write transaction.
 
-    Returns (stdout, stderr, result).
+    Lifecycle events are written alongside the ``agent_runs`` change they
+    describe -- one commit -- instead of going through the logging handler.
     """
-    stdout = _safe_read_file(stdout_path)
-    stderr = _safe_read_file(stderr_path)
-    result = _extract_result(stdout, stderr, output_format)
-
-    with simba.db.connect():
-        AgentRun.update(
-            stdout=stdout,
-            stderr=stderr,
-            result=result,
-            completed_at_utc=simba.orchestration.config.utc_now(),
-            status_id=int(simba.orchestration.config.Status.COMPLETED),
-        ).where(AgentRun.ticket_id == ticket_id).execute()
+    AgentLog.create(
+        ticket_id=ticket_id,
+        level_id=int(simba.orchestration.config.LogLevel.INFO),
+        event=event,
+        func=func,
+        data=_data_json(data),
+        timestamp_utc=simba.orchestration.config.utc_now(),
+    )
 
-    logger = _get_logger()
-    if logger:
-        logger.info(
-            "Output captured and cleaned up",
-            extra={
-                "ticket_id": ticket_id,
-                "event": "output_captured",
-                "data": {
-                    "stdout_len": len(stdout),
-                    "stderr_len": len(stderr),
+
+def _logs_dir() -> Path:
+    return simba.db.get_db_path().parent / "orchestration" / "logs"
+
+
+def _output_paths(ticket_id: str, logs_dir: Path | None = None) -> tuple[Path, Path]:
+    """Return the (stdout, stderr) capture files for *ticket_id*.
+
+    They live under ``.simba/orchestration/logs/`` until the run is captured;
+    ``agent_runs`` then stores only the parsed result, so rows stay small
+    however much an agent prints.
+    """
+    if logs_dir is None:
+        logs_dir = _logs_dir()
+    return logs_dir / f"{ticket_id}.stdout", logs_dir / f"{ticket_id}.stderr"
+
+
+def _list_names(directory: Path) -> set[str]:
+    """Entry names in *directory* from one ``scandir`` (empty if missing)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+def _file_size(file_path: Path) -> int:
+    try:
+        return file_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _capture_outputs(
+    captures: list[tuple[str, Path, Path, str]],
+) -> dict[str, str]:
+    """Parse finished runs' output files, store the results, delete the files.
+
+    *captures* holds ``(ticket_id, stdout_path, stderr_path, output_format)``
+    per finished run; every run is stored in one transaction (one commit).
+    The files are removed only after that commit, so a failed store leaves
+    them for the next status check to capture.
+
+    Returns ``{ticket_id: result}``.
+    """
+    outputs: list[tuple[str, int, int, str]] = []
+    for ticket_id, stdout_path, stderr_path, output_format in captures:
+        # stream-json usually needs only the last line; read it all otherwise.
+        result = None
+        if output_format == "stream-json":
+            result = _read_stream_json_result(stdout_path)
+        if result is None:
+            result = _extract_result(
+                _safe_read_file(stdout_path),
+                _safe_read_file(stderr_path),
+                output_format,
+            )
+        outputs.append(
+            (ticket_id, _file_size(stdout_path), _file_size(stderr_path), result)
+        )
+
+    now = simba.orchestration.config.utc_now()
+    with simba.db.write_transaction():
+        for ticket_id, stdout_len, stderr_len, result in outputs:
+            AgentRun.update(
+                result=result,
+                completed_at_utc=now,
+                status_id=int(simba.orchestration.config.Status.COMPLETED),
+            ).where(AgentRun.ticket_id == ticket_id).execute()
+            _record_log(
+                ticket_id,
+                "output_captured",
+                "_capture_outputs",
+                {
+                    "stdout_len": stdout_len,
+                    "stderr_len": stderr_len,
                     "result_len": len(result),
                 },
-            },
-        )
+            )
 
-    stdout_path.unlink(missing_ok=True)
-    stderr_path.unlink(missing_ok=True)
+    for _ticket_id, stdout_path, stderr_path, _output_format in captures:
+        stdout_path.unlink(missing_ok=True)
+        stderr_path.unlink(missing_ok=True)
 
-    return stdout, stderr, result
+    return {ticket_id: result for ticket_id, _, _, result in outputs}
 
 
 # ---------------------------------------------------------------------------
@@ -411,6 +713,48 @@ VALID_AGENTS = [
 ]
 
 
+# One statement for every transition: terminal states stamp completed_at_utc
+# and overwrite error (the message for failed, NULL for completed); other
+# states leave both columns as they are.
+_SET_STATUS_SQL = (
+    "UPDATE agent_runs SET status_id = ?,"
+    " error = CASE WHEN ? THEN ? ELSE error END,"
+    " completed_at_utc = CASE WHEN ? THEN ? ELSE completed_at_utc END"
+    " WHERE ticket_id = ?"
+)
+
+_TERMINAL = frozenset(
+    (
+        simba.orchestration.config.Status.COMPLETED,
+        simba.orchestration.config.Status.FAILED,
+    )
+)
+
+
+def _status_params(ticket_id: str, status_id: int, message: str, now: int) -> tuple:
+    """Bind parameters for ``_SET_STATUS_SQL``."""
+    terminal = status_id in _TERMINAL
+    error = message if status_id == simba.orchestration.config.Status.FAILED else None
+    return (int(status_id), terminal, error, terminal, now, ticket_id)
+
+
+def apply_status_reports(reports: Iterable[tuple[str, str, str]]) -> None:
+    """Apply ``(ticket_id, state, message)`` reports in order, in one commit.
+
+    Reports with an unknown state are skipped.
+    """
+    now = simba.orchestration.config.utc_now()
+    rows = []
+    for ticket_id, state, message in reports:
+        status_id = simba.orchestration.config.STATUS_NAME_MAP.get(state.lower())
+        if status_id is not None:
+            rows.append(_status_params(ticket_id, status_id, message, now))
+    if not rows:
+        return
+    with simba.db.write_transaction() as db:
+        db.connection().executemany(_SET_STATUS_SQL, rows)
+
+
 def agent_status_update(ticket_id: str, status: str, message: str = "") -> str:
     """Update the status of an async agent task.
 
@@ -426,49 +770,46 @@ def agent_status_update(ticket_id: str, status: str, message: str = "") -> str:
 
     status_id = simba.orchestration.config.STATUS_NAME_MAP[status_lower]
 
-    with simba.db.connect():
+    with simba.db.write_transaction() as db:
         run = AgentRun.get_or_none(AgentRun.ticket_id == ticket_id)
         old_status_id = run.status_id if run else None
+        db.execute_sql(
+            _SET_STATUS_SQL,
+            _status_params(
+                ticket_id, status_id, message, simba.orchestration.config.utc_now()
+            ),
+        )
 
-        if status_id in (
-            simba.orchestration.config.Status.COMPLETED,
-            simba.orchestration.config.Status.FAILED,
-        ):
-            AgentRun.update(
-                status_id=int(status_id),
-                error=(
-                    message
-                    if status_id == simba.orchestration.config.Status.FAILED
-                    else None
-                ),
-                completed_at_utc=simba.orchestration.config.utc_now(),
-            ).where(AgentRun.ticket_id == ticket_id).execute()
-        else:
-            AgentRun.update(status_id=int(status_id)).where(
-                AgentRun.ticket_id == ticket_id
-            ).execute()
-
-        logger = _get_logger()
-        if logger:
-            old_name = (
-                simba.orchestration.config.Status(old_status_id).name.lower()
-                if old_status_id
-                else "unknown"
-            )
-            logger.info(
-                "Status updated",
-                extra={
-                    "ticket_id": ticket_id,
-                    "event": "status_changed",
-                    "data": {
-                        "old_status": old_name,
-                        "new_status": status_lower,
-                        "message": message,
-                    },
+    logger = _get_logger()
+    if logger:
+        old_name = _status_name(old_status_id) or "unknown"
+        logger.info(
+            "Status updated",
+            extra={
+                "ticket_id": ticket_id,
+                "event": "status_changed",
+                "data": {
+                    "old_status": old_name,
+                    "new_status": status_lower,
+                    "message": message,
                 },
-            )
+            },
+        )
+
+    return f"Status updated: {ticket_id} -> {status_lower}"
 
-        return f"Status updated: {ticket_id} -> {status_lower}"
+
+# Exactly the columns idx_active_runs covers.
+_STATUS_CHECK_FIELDS = (
+    AgentRun.status_id,
+    AgentRun.ticket_id,
+    AgentRun.agent,
+    AgentRun.pid,
+    AgentRun.output_format,
+    AgentRun.created_at_utc,
+    AgentRun.result,
+    AgentRun.error,
+)
 
 
 def agent_status_check(ticket_id: str | None = None) -> str:
@@ -480,88 +821,91 @@ def agent_status_check(ticket_id: str | None = None) -> str:
         ticket_id: Optional specific ticket to check. If None, returns all
                  active agents.
     """
-    with simba.db.connect():
+    # Read under a snapshot; _capture_outputs opens its own write after.
+    with simba.db.read_transaction():
+        query = AgentRun.select(*_STATUS_CHECK_FIELDS)
         if ticket_id:
-            runs = list(AgentRun.select().where(AgentRun.ticket_id == ticket_id))
+            runs = list(query.where(AgentRun.ticket_id == ticket_id))
         else:
-            runs = list(
-                AgentRun.select().where(
-                    AgentRun.status_id.not_in(
-                        [
-                            int(simba.orchestration.config.Status.COMPLETED),
-                            int(simba.orchestration.config.Status.FAILED),
-                        ]
+            runs = list(query.where(pw.SQL(_ACTIVE_RUNS_WHERE)))
+
+    if not runs:
+        if not ticket_id:
+            return "No active agents."
+        return f"No status for {ticket_id}"
+
+    # Pass 1: detect exits; pass 2 (after one batched capture) renders.
+    statuses: dict[str, str | None] = {}
+    captures: list[tuple[str, Path, Path, str]] = []
+    # Resolved once per check; the directory is listed (one scandir) only if
+    # some run has exited, instead of two stat calls per exited run.
+    logs_dir = _logs_dir()
+    present: set[str] | None = None
+    for run in runs:
+        bid = run.ticket_id
+        statuses[bid] = _status_name(run.status_id)
+
+        # Auto-detect completion
+        if run.status_id in (
+            simba.orchestration.config.Status.STARTED,
+            simba.orchestration.config.Status.RUNNING,
+        ):
+            proc = _LIVE_PROCS.get(bid)
+            if proc is not None and proc.pid == run.pid:
+                is_alive = proc.poll() is None
+                if not is_alive:
+                    del _LIVE_PROCS[bid]
+            else:
+                is_alive, _is_zombie = _check_process_alive(run.pid)
+            if not is_alive:
+                if present is None:
+                    present = _list_names(logs_dir)
+                stdout_path, stderr_path = _output_paths(bid, logs_dir)
+
+                if stdout_path.name in present or stderr_path.name in present:
+                    captures.append(
+                        (bid, stdout_path, stderr_path, run.output_format or "text")
                     )
+                    statuses[bid] = "completed"
+                else:
+                    statuses[bid] = "finished (no output files)"
+
+    results = _capture_outputs(captures) if captures else {}
+    if results:
+        logger = _get_logger()
+        if logger:
+            for bid in results:
+                logger.info(
+                    "Agent completed",
+                    extra={
+                        "ticket_id": bid,
+                        "event": "status_changed",
+                        "data": {
+                            "old_status": "running",
+                            "new_status": "completed",
+                            "reason": "process_exited",
+                        },
+                    },
                 )
-            )
 
-        if not runs:
-            if not ticket_id:
-                return "No active agents."
-            return f"No status for {ticket_id}"
-
-        lines: list[str] = []
-        for run in runs:
-            bid = run.ticket_id
-            agent = run.agent
-            pid = run.pid
-            status_id = run.status_id
-            status_name = _status_name(status_id)
-            output_format = run.output_format
-            result = run.result
-            error = run.error
-            created_at = run.created_at_utc
-
-            # Auto-detect completion
-            if status_id in (
-                simba.orchestration.config.Status.STARTED,
-                simba.orchestration.config.Status.RUNNING,
-            ):
-                is_alive, _is_zombie = _check_process_alive(pid)
-                if not is_alive:
-                    stdout_path = Path(tempfile.gettempdir()) / f"neuron_{bid}.stdout"
-                    stderr_path = Path(tempfile.gettempdir()) / f"neuron_{bid}.stderr"
-
-                    if stdout_path.exists() or stderr_path.exists():
-                        _stdout, _stderr, result = _capture_and_cleanup(
-                            bid,
-                            stdout_path,
-                            stderr_path,
-                            output_format or "text",
-                        )
-                        status_name = "completed"
-
-                        logger = _get_logger()
-                        if logger:
-                            logger.info(
-                                "Agent completed",
-                                extra={
-                                    "ticket_id": bid,
-                                    "event": "status_changed",
-                                    "data": {
-                                        "old_status": "running",
-                                        "new_status": "completed",
-                                        "reason": "process_exited",
-                                    },
-                                },
-                            )
-                    else:
-                        status_name = "finished (no output files)"
-
-            now = simba.orchestration.config.utc_now()
-            elapsed = now - created_at if created_at else 0
-            status_line = f"{bid} ({agent}, PID {pid}): {status_name}"
-            if elapsed:
-                status_line += f" [{elapsed}s]"
-            if result:
-                preview = result[:100] + "..." if len(result) > 100 else result
-                status_line += f"\n   Result: {preview}"
-            if error:
-                status_line += f"\n   Error: {error}"
-
-            lines.append(status_line)
-
-        return "\n".join(lines)
+    now = simba.orchestration.config.utc_now()
+    lines: list[str] = []
+    for run in runs:
+        bid = run.ticket_id
+        result = results.get(bid, run.result)
+        elapsed = now - run.created_at_utc if run.created_at_utc else 0
+        status_line = f"{bid} ({run.agent}, PID {run.pid}): {statuses[bid]}"
+        if elapsed:
+            status_line += f" [{elapsed}s]"
+        if result:
+            preview = result[:100] + "..." if len(result) > 100 else result
+            status_line += f"\n   Result: {preview}"
+        if run.error:
+            status_line += f"\n   Error: {run.error}"
+
+        lines.append(status_line)
+
+    return "\n".join(lines)
 
 
 def dispatch_agent(agent_name: str, ticket_id: str, instructions: str) -> str:
@@ -585,8 +929,7 @@ def dispatch_agent(agent_name: str, ticket_id: str, instructions: str) -> str:
         f"When finished, output a clear summary of what you accomplished.\n"
     )
 
-    stdout_path = Path(tempfile.gettempdir()) / f"neuron_{ticket_id}.stdout"
-    stderr_path = Path(tempfile.gettempdir()) / f"neuron_{ticket_id}.stderr"
+    stdout_path, stderr_path = _output_paths(ticket_id)
 
     output_format = "stream-json"
     cmd = [
@@ -601,10 +944,13 @@ def dispatch_agent(agent_name: str, ticket_id: str, instructions: str) -> str:
     ]
 
     try:
+        stdout_path.parent.mkdir(parents=True, exist_ok=True)
         with (
             open(stdout_path, "w") as stdout_f,
             open(stderr_path, "w") as stderr_f,
         ):
+            # No preexec_fn: CPython then launches via vfork() + exec, so the
+            # server's address space is never copied per dispatch.
             proc = subprocess.Popen(
                 cmd,
                 stdin=subprocess.DEVNULL,
@@ -613,11 +959,14 @@ def dispatch_agent(agent_name: str, ticket_id: str, instructions: str) -> str:
                 cwd=project_root,
                 start_new_session=True,
             )
+        _LIVE_PROCS[ticket_id] = proc
+        if _HAVE_PIDFD:
+            _watch_child(proc)
 
         now = simba.orchestration.config.utc_now()
         cmd_str = " ".join(cmd)
 
-        with simba.db.connect():
+        with simba.db.write_transaction():
             AgentRun.replace(
                 ticket_id=ticket_id,
                 agent=agent_name,
@@ -629,20 +978,15 @@ def dispatch_agent(agent_name: str, ticket_id: str, instructions: str) -> str:
                 created_at_utc=now,
                 started_at_utc=now,
             ).execute()
-
-        logger = _get_logger()
-        if logger:
-            logger.info(
-                "Agent dispatched",
-                extra={
-                    "ticket_id": ticket_id,
-                    "event": "agent_dispatched",
-                    "data": {
-                        "pid": proc.pid,
-                        "agent": agent_name,
-                        "command": cmd_str,
-                        "working_dir": str(project_root),
-                    },
+            _record_log(
+                ticket_id,
+                "agent_dispatched",
+                "dispatch_agent",
+                {
+                    "pid": proc.pid,
+                    "agent": agent_name,
+                    "command": cmd_str,
+                    "working_dir": str(project_root),
                 },
             )
 
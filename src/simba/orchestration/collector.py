@@ -0,0 +1,202 @@
+"""Unix-socket status collector for subagent ``status`` reports.
+
+Every subagent reports progress by running ``simba orchestration status``,
+which used to open the database and commit one UPDATE per call. While the
+MCP server is running it listens on a datagram socket instead: the CLI
+sends one datagram and exits, and the server applies everything that
+arrived within a short window in a single transaction.
+
+When no collector is listening the CLI falls back to writing the row
+itself, so the socket is purely an optimisation.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+import simba.repo_root
+
+# Under the project root, found the same way as ``.simba/simba.db``, so a
+# report sent from any subdirectory reaches the server's collector.
+STATUS_SOCKET = Path(".claude") / "status.sock"
+
+# sun_path holds 104 bytes on macOS and 108 on Linux, NUL included.
+_MAX_SOCKET_ADDRESS = 103
+_SEP = "\x1f"
+_MAX_DATAGRAM = 65536
+_DRAIN_INTERVAL = 0.05
+_SEND_TIMEOUT = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def encode_report(ticket_id: str, state: str, message: str = "") -> bytes:
+    """Encode one status report as a datagram payload."""
+    return _SEP.join((ticket_id, state, message)).encode()
+
+
+def decode_report(data: bytes) -> tuple[str, str, str] | None:
+    """Decode a datagram payload, or return None if it is malformed."""
+    parts = data.decode(errors="replace").split(_SEP, 2)
+    if len(parts) != 3:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def status_socket_path(cwd: Path | None = None) -> Path:
+    """Return the collector socket of the project containing *cwd*.
+
+    Uses the repository root if one is found, otherwise *cwd* (or
+    ``Path.cwd()``), matching ``simba.db.get_db_path``.
+    """
+    if cwd is None:
+        cwd = Path.cwd()
+    root = simba.repo_root.find_repo_root(cwd)
+    return (root if root is not None else cwd) / STATUS_SOCKET
+
+
+def _address(path: Path) -> str:
+    """*path* as a socket address; relative to cwd if too long when absolute."""
+    address = str(path)
+    if len(os.fsencode(address)) > _MAX_SOCKET_ADDRESS:
+        address = str(path.relative_to(Path.cwd(), walk_up=True))
+    return address
+
+
+def send_status(
+    ticket_id: str, state: str, message: str = "", path: Path | None = None
+) -> bool:
+    """Hand a status report to a running collector.
+
+    *path* defaults to :func:`status_socket_path`.  True means the datagram
+    was queued for the collector, which commits it within
+    ``_DRAIN_INTERVAL``.  Returns False when it could not be delivered (no
+    socket file, a stale one, or a send error); the caller should then
+    update the row directly.  Anything but a missing socket is logged.
+    """
+    if path is None:
+        path = status_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(_SEND_TIMEOUT)
+            sock.sendto(encode_report(ticket_id, state, message), _address(path))
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        logger.warning(
+            "Status report for %s not delivered to %s (%s); writing it directly",
+            ticket_id,
+            path,
+            exc,
+        )
+        return False
+    return True
+
+
+def _is_listening(path: Path) -> bool:
+    """Return True if a live collector is bound to *path*."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(_address(path))
+    except OSError:
+        return False
+    return True
+
+
+class StatusCollector:
+    """Background thread that batches status datagrams into one commit.
+
+    The first datagram opens a ``_DRAIN_INTERVAL`` window; everything that
+    arrives inside it is applied, in arrival order, in a single
+    ``write_transaction``.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path if path is not None else status_socket_path()
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> bool:
+        """Bind the socket and start draining it.
+
+        Returns False (and leaves the CLI on its direct-write fallback) if
+        another live collector already owns the socket or binding fails.
+        """
+        if self.path.exists():
+            if _is_listening(self.path):
+                return False
+            self.path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            sock.bind(_address(self.path))
+        except OSError as exc:
+            sock.close()
+            logger.warning("Status collector disabled: %s", exc)
+            return False
+        sock.settimeout(_DRAIN_INTERVAL)
+        self._sock = sock
+        self._thread = threading.Thread(
+            target=self._run, name="simba-status-collector", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def close(self) -> None:
+        """Stop the drain thread, flush what it holds, and remove the socket."""
+        if self._sock is None:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sock.close()
+        self._sock = None
+        self.path.unlink(missing_ok=True)
+
+    def _collect(self) -> list[tuple[str, str, str]]:
+        """Wait for a first report, then gather the rest of its window."""
+        assert self._sock is not None
+        batch: list[tuple[str, str, str]] = []
+        deadline: float | None = None
+        while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._sock.settimeout(remaining)
+            try:
+                data = self._sock.recv(_MAX_DATAGRAM)
+            except TimeoutError:
+                if deadline is not None or self._stop.is_set():
+                    break
+                continue
+            report = decode_report(data)
+            if report is not None:
+                batch.append(report)
+            if deadline is None:
+                deadline = time.monotonic() + _DRAIN_INTERVAL
+        self._sock.settimeout(_DRAIN_INTERVAL)
+        return batch
+
+    def _run(self) -> None:
+        # Deferred so the `status` CLI, which imports this module, stays
+        # free of the ORM.
+        import simba.orchestration.agents
+
+        # Keep draining after close() is requested until the socket is empty.
+        while True:
+            batch = self._collect()
+            if not batch:
+                if self._stop.is_set():
+                    return
+                continue
+            try:
+                simba.orchestration.agents.apply_status_reports(batch)
+            except Exception:
+                logger.exception("Failed to apply %d status report(s)", len(batch))
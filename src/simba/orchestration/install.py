@@ -16,13 +16,14 @@ def install_agents(force: bool = False, update_sections: bool = True) -> None:
     agents_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"Agent definitions in {agents_dir}...")
+    updates = simba.orchestration.templates.build_updates()
 
     if update_sections:
         for agent_file in agents_dir.glob("*.md"):
             try:
                 original = agent_file.read_text()
                 updated = simba.orchestration.templates.update_managed_sections(
-                    original
+                    original, updates
                 )
                 if original != updated:
                     agent_file.write_text(updated)
@@ -38,7 +39,7 @@ def install_agents(force: bool = False, update_sections: bool = True) -> None:
 
         try:
             final_content = simba.orchestration.templates.update_managed_sections(
-                content.lstrip()
+                content.lstrip(), updates
             )
             file_path.write_text(final_content)
             print(f"   {filename} (created)")
@@ -7,10 +7,108 @@ restarts without dropping the frontend connection.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
 import signal
+import stat
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Capacity requested for the backend's stdout pipe in splice mode (Linux's
+# default pipe-max-size), and the most one splice(2) call moves: a burst of
+# backend output then crosses to stdout in one call and one loop wakeup.
+_PIPE_SIZE = 1 << 20
+_SPLICE_CHUNK = _PIPE_SIZE
+
+# Stream fallback: buffer limit for the backend stdout reader (a JSON-RPC
+# line may be far larger than asyncio's 64 KiB default).  _READ_CHUNK is the
+# most bytes taken per read from stdin or the backend.
+_STREAM_LIMIT = 1 << 20
+_READ_CHUNK = 1 << 16
+
+# Write-buffer watermarks for the backend's stdin: lines are written without
+# awaiting, and the forwarder only waits for a drain past the high mark.
+_WRITE_HIGH = 1 << 16
+_WRITE_LOW = 1 << 14
+
+
+def _can_splice(fd: int) -> bool:
+    """True when *fd* is a pipe and the platform has ``os.splice`` (Linux)."""
+    if not hasattr(os, "splice"):
+        return False
+    try:
+        return stat.S_ISFIFO(os.fstat(fd).st_mode)
+    except OSError:
+        return False
+
+
+def _backend_pipe() -> tuple[int, int]:
+    """Create the backend stdout pipe for splice mode, enlarged if allowed."""
+    import fcntl
+
+    read_fd, write_fd = os.pipe()
+    # Over /proc/sys/fs/pipe-max-size this fails; keep the default 64 KiB.
+    with contextlib.suppress(OSError):
+        fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, _PIPE_SIZE)
+    return read_fd, write_fd
+
+
+async def _stdout_writer() -> asyncio.StreamWriter | None:
+    """Non-blocking writer for stdout, or None when it is not a pipe/socket.
+
+    Writes through the loop's pipe transport never block the loop the way
+    ``sys.stdout.buffer`` writes and flushes do.  A terminal or file keeps the
+    plain buffered path: the transport would make the fd non-blocking, and a
+    tty's file description is usually shared with stderr.
+    """
+    fd = sys.stdout.fileno()
+    try:
+        mode = os.fstat(fd).st_mode
+    except OSError:
+        return None
+    if not (stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)):
+        return None
+    loop = asyncio.get_running_loop()
+    # A dup, so closing the transport at shutdown leaves sys.stdout usable.
+    # The dup shares fd 1's open file description, so the O_NONBLOCK the
+    # transport sets is seen by the parent too; _close_stdout_writer puts
+    # the blocking mode back.
+    pipe = os.fdopen(os.dup(fd), "wb", buffering=0)
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, pipe
+    )
+    transport.set_write_buffer_limits(high=_WRITE_HIGH, low=_WRITE_LOW)
+    return asyncio.StreamWriter(transport, protocol, None, loop)
+
+
+async def _close_stdout_writer(writer: asyncio.StreamWriter, blocking: bool) -> None:
+    """Flush and close a :func:`_stdout_writer`, then restore stdout's mode.
+
+    *blocking* is what ``os.get_blocking`` reported for stdout before the
+    writer was created.  Restoring it only after the buffer is empty keeps
+    the transport from ever making a blocking write on the loop.
+    """
+    writer.transport.set_write_buffer_limits(high=0)  # drain() waits for empty
+    with contextlib.suppress(ConnectionError):
+        await writer.drain()
+    writer.close()
+    os.set_blocking(sys.stdout.fileno(), blocking)
+
+
+async def _fd_ready(
+    add: Callable[..., None], remove: Callable[[int], object], fd: int
+) -> None:
+    """Wait until the loop reports *fd* ready (``add``/``remove`` a reader/writer)."""
+    fut = asyncio.get_running_loop().create_future()
+    add(fd, lambda: fut.done() or fut.set_result(None))
+    try:
+        await fut
+    finally:
+        remove(fd)
 
 
 class MCPProxy:
@@ -36,7 +134,19 @@ class MCPProxy:
         self.root_dir = root_dir
         self.backend: asyncio.subprocess.Process | None = None
         self.running = True
-        self._reload_event = asyncio.Event()
+        # SIGHUP sets the flag; one reload task runs until it stays clear, so
+        # a signal that lands mid-restart still gets a fresh backend.
+        self._reload_pending = False
+        self._reload_task: asyncio.Task[None] | None = None
+        # Set by start_backend; the stdout forwarder sleeps on it between
+        # backends.
+        self._backend_ready = asyncio.Event()
+        # Splice mode: the backend writes into a pipe we own, and its output
+        # is moved to our stdout by splice(2) without entering Python.
+        self._splice = False
+        self._backend_stdout_fd: int | None = None
+        # Stream mode: stdout as a loop transport (None for a tty or file).
+        self._stdout: asyncio.StreamWriter | None = None
 
     async def start_backend(self) -> None:
         """Start (or restart) the backend MCP server process."""
@@ -48,13 +158,38 @@ class MCPProxy:
                 self.backend.kill()
                 await self.backend.wait()
 
-        self.backend = await asyncio.create_subprocess_exec(
-            *self.backend_cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=sys.stderr,
-            cwd=str(self.root_dir),
+        if not self._splice:
+            self.backend = await asyncio.create_subprocess_exec(
+                *self.backend_cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=sys.stderr,
+                cwd=str(self.root_dir),
+                limit=_STREAM_LIMIT,
+            )
+        else:
+            read_fd, write_fd = _backend_pipe()
+            try:
+                self.backend = await asyncio.create_subprocess_exec(
+                    *self.backend_cmd,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=write_fd,
+                    stderr=sys.stderr,
+                    cwd=str(self.root_dir),
+                )
+            except BaseException:
+                os.close(read_fd)
+                raise
+            finally:
+                os.close(write_fd)
+            if self._backend_stdout_fd is not None:
+                # The previous backend's output was never picked up.
+                os.close(self._backend_stdout_fd)
+            self._backend_stdout_fd = read_fd
+        self.backend.stdin.transport.set_write_buffer_limits(
+            high=_WRITE_HIGH, low=_WRITE_LOW
         )
+        self._backend_ready.set()
         sys.stderr.write(f"Backend started (PID: {self.backend.pid})\n")
         sys.stderr.flush()
 
@@ -62,70 +197,178 @@ class MCPProxy:
         """Signal handler for SIGHUP — triggers backend reload."""
         sys.stderr.write("SIGHUP received, scheduling reload...\n")
         sys.stderr.flush()
-        self._reload_event.set()
-
-    async def _reload_watcher(self) -> None:
-        """Background task that watches for reload signals."""
-        while self.running:
-            await self._reload_event.wait()
-            self._reload_event.clear()
+        self._reload_pending = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.get_running_loop().create_task(self._reload())
+
+    async def _reload(self) -> None:
+        """Restart the backend until no further SIGHUP is pending."""
+        while self._reload_pending and self.running:
+            self._reload_pending = False
             await self.start_backend()
 
     async def forward_stdin_to_backend(self) -> None:
-        """Forward stdin from Claude Code to the backend server."""
-        loop = asyncio.get_event_loop()
-        reader = asyncio.StreamReader()
-        protocol = asyncio.StreamReaderProtocol(reader)
-        await loop.connect_read_pipe(lambda: protocol, sys.stdin)
-
-        while self.running:
+        """Forward stdin from Claude Code to the backend server.
+
+        A reader callback ``os.read``s whatever stdin has buffered and hands
+        the backend every complete line in one write.  A partial line waits
+        for its newline, so a reload never splits a message across backends.
+        """
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        done = loop.create_future()
+        pending = bytearray()
+        drains: set[asyncio.Task[None]] = set()
+
+        def finish() -> None:
+            loop.remove_reader(fd)
+            if not done.done():
+                done.set_result(None)
+
+        def forward(data: bytes) -> None:
+            if not (self.backend and self.backend.stdin):
+                return
+            writer = self.backend.stdin
+            writer.write(data)
+            # Pipe writes go straight to the kernel when it has room; only
+            # a backlog past the high mark pauses stdin until it drains.
+            if writer.transport.get_write_buffer_size() >= _WRITE_HIGH:
+                loop.remove_reader(fd)
+                task = loop.create_task(resume_after_drain(writer))
+                drains.add(task)
+                task.add_done_callback(drains.discard)
+
+        async def resume_after_drain(writer: asyncio.StreamWriter) -> None:
             try:
-                line = await reader.readline()
-                if not line:
-                    break
-                if self.backend and self.backend.stdin:
-                    self.backend.stdin.write(line)
-                    await self.backend.stdin.drain()
+                await writer.drain()
             except (BrokenPipeError, ConnectionResetError):
-                break
-            except Exception as exc:
-                sys.stderr.write(f"stdin forward error: {exc}\n")
-                break
+                finish()
+                return
+            if not done.done():
+                loop.add_reader(fd, on_readable)
 
-        self.running = False
+        def on_readable() -> None:
+            try:
+                chunk = os.read(fd, _READ_CHUNK)
+            except BlockingIOError:
+                return
+            except OSError as exc:
+                sys.stderr.write(f"stdin forward error: {exc}\n")
+                finish()
+                return
+            if not chunk:
+                if pending:  # a final line without its newline
+                    forward(bytes(pending))
+                finish()
+                return
+            pending.extend(chunk)
+            end = pending.rfind(b"\n") + 1
+            if end:
+                lines = bytes(pending[:end])
+                del pending[:end]
+                forward(lines)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            await done
+        finally:
+            loop.remove_reader(fd)
+            self.running = False
 
     async def forward_backend_to_stdout(self) -> None:
-        """Forward stdout from backend to Claude Code."""
+        """Forward stdout from backend to Claude Code.
+
+        Sleeps on ``_backend_ready`` between backends instead of polling:
+        each (re)start wakes it to forward the new backend until EOF.
+        """
         while self.running:
+            await self._backend_ready.wait()
+            self._backend_ready.clear()
             try:
-                if not self.backend or not self.backend.stdout:
-                    await asyncio.sleep(0.1)
-                    continue
+                if self._splice:
+                    await self._splice_backend_to_stdout()
+                else:
+                    await self._copy_backend_to_stdout(self.backend.stdout)
+            except (BrokenPipeError, ConnectionResetError):
+                break
+            sys.stderr.write("Backend stdout closed, waiting for reload...\n")
 
-                line = await self.backend.stdout.readline()
-                if not line:
-                    sys.stderr.write("Backend stdout closed, waiting for reload...\n")
-                    await asyncio.sleep(0.5)
+    async def _copy_backend_to_stdout(self, stdout: asyncio.StreamReader) -> None:
+        """Stream fallback: forward one backend's output until EOF."""
+        while True:
+            try:
+                # Forward whatever is buffered, not line by line: a burst of
+                # messages costs one write, flushed once it ends a message.
+                chunk = await stdout.read(_READ_CHUNK)
+                if self._stdout is None:
+                    if not chunk:
+                        sys.stdout.buffer.flush()
+                        return
+                    sys.stdout.buffer.write(chunk)
+                    if chunk.endswith(b"\n"):
+                        sys.stdout.buffer.flush()
                     continue
-
-                sys.stdout.buffer.write(line)
-                sys.stdout.buffer.flush()
+                if not chunk:
+                    return
+                self._stdout.write(chunk)
+                if self._stdout.transport.get_write_buffer_size() >= _WRITE_HIGH:
+                    await self._stdout.drain()
             except (BrokenPipeError, ConnectionResetError):
-                break
+                raise
             except Exception as exc:
                 sys.stderr.write(f"stdout forward error: {exc}\n")
                 await asyncio.sleep(0.1)
 
+    async def _splice_backend_to_stdout(self) -> None:
+        """Linux fast path: splice one backend's output pipe into stdout.
+
+        Bytes move between the two pipes inside the kernel, with no copy
+        into Python and no per-line scheduling.
+        """
+        src, self._backend_stdout_fd = self._backend_stdout_fd, None
+        try:
+            await self._splice_until_eof(
+                asyncio.get_running_loop(), src, sys.stdout.fileno()
+            )
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as exc:
+            sys.stderr.write(f"stdout forward error: {exc}\n")
+        finally:
+            os.close(src)
+
+    @staticmethod
+    async def _splice_until_eof(
+        loop: asyncio.AbstractEventLoop, src: int, dst: int
+    ) -> None:
+        flags = os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK
+        while True:
+            await _fd_ready(loop.add_reader, loop.remove_reader, src)
+            try:
+                n = os.splice(src, dst, _SPLICE_CHUNK, flags=flags)
+                while n == _SPLICE_CHUNK:  # more is likely queued; skip the poll
+                    n = os.splice(src, dst, _SPLICE_CHUNK, flags=flags)
+            except BlockingIOError:
+                # Nothing left to read, or stdout is full: wait for room.
+                await _fd_ready(loop.add_writer, loop.remove_writer, dst)
+                continue
+            if n == 0:
+                return
+
     async def run(self) -> None:
         """Main proxy loop."""
         if hasattr(signal, "SIGHUP"):
             loop = asyncio.get_event_loop()
             loop.add_signal_handler(signal.SIGHUP, self._handle_sighup)
 
+        self._splice = _can_splice(sys.stdout.fileno())
+        stdout_blocking = os.get_blocking(sys.stdout.fileno())
+        if not self._splice:
+            self._stdout = await _stdout_writer()
+
         await self.start_backend()
 
         tasks = [
-            asyncio.create_task(self._reload_watcher()),
             asyncio.create_task(self.forward_stdin_to_backend()),
             asyncio.create_task(self.forward_backend_to_stdout()),
         ]
@@ -134,9 +377,17 @@ class MCPProxy:
             await asyncio.gather(*tasks, return_exceptions=True)
         finally:
             self.running = False
+            if self._reload_task is not None:
+                self._reload_task.cancel()
             if self.backend and self.backend.returncode is None:
                 self.backend.terminate()
                 await self.backend.wait()
+            if self._backend_stdout_fd is not None:
+                os.close(self._backend_stdout_fd)
+                self._backend_stdout_fd = None
+            if self._stdout is not None:
+                await _close_stdout_writer(self._stdout, stdout_blocking)
+                self._stdout = None
             sys.stderr.write("Proxy shutdown complete\n")
 
     def __enter__(self) -> MCPProxy:
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 import simba.orchestration.agents
+import simba.orchestration.collector
 import simba.orchestration.proxy
 
 mcp = FastMCP("Orchestration")
@@ -73,4 +74,10 @@ def run_server(root_dir: Path | None = None) -> None:
     # Register SIGCHLD handler for zombie reaping
     simba.orchestration.agents.register_sigchld_handler()
 
-    mcp.run()
+    # Batch subagent `status` reports into one transaction per window
+    collector = simba.orchestration.collector.StatusCollector()
+    collector.start()
+    try:
+        mcp.run()
+    finally:
+        collector.close()
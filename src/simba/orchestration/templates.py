@@ -10,15 +10,34 @@ Content outside markers is preserved.
 
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import json
+import mmap
+import os
 import re
-from datetime import datetime
-from typing import TYPE_CHECKING
+import shutil
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
 
 import simba.markers
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
     from pathlib import Path
 
+# Sidecar (next to the agents dir, i.e. ``.claude/.sync-cache.json``) recording
+# ``path -> [mtime_ns, blake2b]`` of each agent file as ``sync`` last left it.
+SYNC_CACHE_NAME = ".sync-cache.json"
+
+# Pre-rename ``<!-- BEGIN NEURON:x -->`` markers, rewritten to SIMBA on update.
+_LEGACY_MARKER_RE = re.compile(r"<!-- (BEGIN|END) NEURON:(\w+) -->")
+# The per-block header written by build_updates; only its timestamp varies.
+_GENERATED_RE = re.compile(r"<!-- Generated by neuron @ [^>]*-->")
+
 MANAGED_SECTIONS: dict[str, str] = {
     "completion_protocol": """
 **ASYNC COMPLETION PROTOCOL:**
@@ -252,39 +271,222 @@ You are an Implementer. You execute plans precisely. You do NOT make architectur
 }
 
 
-def update_managed_sections(content: str) -> str:
-    """Update managed sections in content, preserving everything else."""
+# (minute since the epoch, its "%Y-%m-%d %H:%M" rendering) for the stamp.
+_timestamp_cache: tuple[int, str] | None = None
+
+
+def _current_timestamp() -> str:
+    """The block stamp for the current minute, formatted once per minute."""
+    global _timestamp_cache
+    now = time.time()
+    minute = int(now // 60)
+    cached = _timestamp_cache
+    if cached is None or cached[0] != minute:
+        cached = (minute, time.strftime("%Y-%m-%d %H:%M", time.localtime(now)))
+        _timestamp_cache = cached
+    return cached[1]
+
+
+def build_updates() -> dict[str, str]:
+    """Render every managed section's block body, stamped with the time now.
+
+    Build once per command and pass to :func:`update_managed_sections` for
+    each file, rather than re-rendering all sections per file.
+    """
+    timestamp = _current_timestamp()
+    return {
+        section_name: f"<!-- Generated by neuron @ {timestamp} -->{section_content}"
+        for section_name, section_content in MANAGED_SECTIONS.items()
+    }
+
+
+def update_managed_sections(content: str, updates: dict[str, str] | None = None) -> str:
+    """Update managed sections in content, preserving everything else.
+
+    ``updates`` is the output of :func:`build_updates`; built on the spot
+    when omitted.
+    """
     # Migration: convert legacy NEURON markers to SIMBA.
-    content = re.sub(
-        r"<!-- (BEGIN|END) NEURON:(\w+) -->",
-        r"<!-- \1 SIMBA:\2 -->",
-        content,
-    )
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    updates = {}
-    for section_name, section_content in MANAGED_SECTIONS.items():
-        updates[section_name] = (
-            f"<!-- Generated by neuron @ {timestamp} -->{section_content}"
+    content = _LEGACY_MARKER_RE.sub(r"<!-- \1 SIMBA:\2 -->", content)
+    if updates is None:
+        updates = build_updates()
+    updated = _update_blocks(content, tuple(updates.items()))
+    # Already current apart from the generated timestamps: keep the old
+    # stamps so an idempotent sync leaves the file byte-for-byte unchanged.
+    if updated != content and _GENERATED_RE.sub("", updated) == _GENERATED_RE.sub(
+        "", content
+    ):
+        return content
+    return updated
+
+
+@functools.lru_cache(maxsize=256)
+def _update_blocks(content: str, updates: tuple[tuple[str, str], ...]) -> str:
+    """Memoized :func:`simba.markers.update_blocks`.
+
+    Agent files are often identical (fresh installs from ``AGENT_TEMPLATES``),
+    and ``updates`` is the same tuple for a whole command.
+    """
+    return simba.markers.update_blocks(content, dict(updates))
+
+
+def _agent_files(agents_dir: Path) -> list[Path]:
+    """The ``*.md`` files directly in *agents_dir*, sorted, from one scandir."""
+    with os.scandir(agents_dir) as entries:
+        return sorted(
+            agents_dir / entry.name
+            for entry in entries
+            if entry.name.endswith(".md") and entry.is_file()
         )
-    return simba.markers.update_blocks(content, updates)
+
+
+def _read_text(path: Path) -> str:
+    with open(path, "rb") as fh:
+        return fh.read().decode()
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write *data* to *path* via a unique sibling temp file + atomic rename.
+
+    Symlinks are resolved first, so the link target is replaced rather than
+    the link itself, and an existing file keeps its permission bits.
+    """
+    target = path.resolve()
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        with contextlib.suppress(FileNotFoundError):
+            shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _inject_file(agent_file: Path, sections: list[str]) -> list[str]:
+    """Append empty marker pairs for missing *sections*; return those added."""
+    content = _read_text(agent_file)
+    present = simba.markers.present_markers(content, sections)
+    added = [section for section in sections if section not in present]
+    if added:
+        blocks = "\n\n".join(simba.markers.make_empty_block(s) for s in added)
+        content = content.rstrip() + "\n\n" + blocks + "\n"
+        _write_bytes(agent_file, content.encode())
+    return added
 
 
 def inject_markers(agents_dir: Path, sections: list[str]) -> None:
     """Inject managed section markers into agent files that lack them."""
-    for agent_file in agents_dir.glob("*.md"):
-        content = agent_file.read_text()
-        modified = False
-
-        for section in sections:
-            if not simba.markers.has_marker(content, section):
-                content = (
-                    content.rstrip()
-                    + "\n\n"
-                    + simba.markers.make_empty_block(section)
-                    + "\n"
-                )
-                modified = True
-                print(f"   + {agent_file.name}: added {section} markers")
-
-        if modified:
-            agent_file.write_text(content)
+    agent_files = _agent_files(agents_dir)
+    results = _map_files(lambda f: _inject_file(f, sections), agent_files)
+    for agent_file, added in zip(agent_files, results, strict=True):
+        for section in added:
+            print(f"   + {agent_file.name}: added {section} markers")
+
+
+def _sections_digest() -> str:
+    """Fingerprint of MANAGED_SECTIONS; a template change invalidates the cache."""
+    payload = json.dumps(MANAGED_SECTIONS, sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _file_digest(fd: int, size: int) -> str:
+    """blake2b of an open file, hashed straight off an mmap (no bytes copy)."""
+    if size == 0:  # mmap refuses empty files
+        return hashlib.blake2b(b"", digest_size=16).hexdigest()
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as buf:
+        return hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+
+def load_sync_cache(cache_path: Path) -> dict[str, list]:
+    """Load the sync sidecar; empty when missing, corrupt, or for stale sections."""
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("sections") != _sections_digest():
+        return {}
+    files = cache.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_sync_cache(cache_path: Path, files: dict[str, list]) -> None:
+    """Persist the sync sidecar via write-to-temp + atomic rename (best-effort)."""
+    payload = json.dumps({"sections": _sections_digest(), "files": files})
+    with contextlib.suppress(OSError):
+        _write_bytes(cache_path, payload.encode())
+
+
+def sync_file(
+    agent_file: Path,
+    cache: dict[str, list],
+    updates: dict[str, str] | None = None,
+) -> bool:
+    """Update one file's managed sections, skipping it when provably unchanged.
+
+    A matching ``mtime_ns`` skips the file on a single ``stat``; otherwise the
+    file is hashed via mmap and only decoded + regex-updated when its content
+    differs from what ``sync`` last wrote. ``cache`` is updated in place;
+    ``updates`` is passed to :func:`update_managed_sections`.
+    Returns True when the file was rewritten.
+    """
+    key = str(agent_file)
+    entry = cache.get(key)
+    if entry and entry[0] == agent_file.stat().st_mtime_ns:
+        return False
+    with open(agent_file, "rb") as fh:
+        st = os.fstat(fh.fileno())
+        digest = _file_digest(fh.fileno(), st.st_size)
+        if entry and entry[1] == digest:
+            cache[key] = [st.st_mtime_ns, digest]
+            return False
+        original = fh.read().decode()
+
+    updated = update_managed_sections(original, updates)
+    changed = original != updated
+    if changed:
+        # Encode once: the same bytes are written and fingerprinted.
+        data = updated.encode()
+        _write_bytes(agent_file, data)
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    cache[key] = [agent_file.stat().st_mtime_ns, digest]
+    return changed
+
+
+def _map_files(fn: Callable[[Path], Any], files: Iterable[Path]) -> list[Any]:
+    """Order-preserving thread-pool map over I/O-bound per-file work."""
+    files = list(files)
+    if len(files) < 2:
+        return [fn(f) for f in files]
+    workers = min(32, (os.cpu_count() or 1) * 4, len(files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, files))
+
+
+def sync_files(agent_files: Iterable[Path], cache: dict[str, list]) -> list[Path]:
+    """Run :func:`sync_file` over ``agent_files`` concurrently.
+
+    Returns the rewritten files in input order, so callers can report them
+    deterministically after the pool has drained.
+    """
+    agent_files = list(agent_files)
+    updates = build_updates()
+    changed = _map_files(lambda f: sync_file(f, cache, updates), agent_files)
+    return [
+        f for f, was_changed in zip(agent_files, changed, strict=True) if was_changed
+    ]
+
+
+def sync_agents_dir(agents_dir: Path) -> list[Path]:
+    """Sync every ``*.md`` in ``agents_dir`` through the sidecar cache.
+
+    The mtime + content-hash sidecar lets unchanged files cost one ``stat``.
+    Returns the rewritten files in sorted order.
+    """
+    cache_path = agents_dir.parent / SYNC_CACHE_NAME
+    cache = load_sync_cache(cache_path)
+    changed = sync_files(_agent_files(agents_dir), cache)
+    save_sync_cache(cache_path, cache)
+    return changed
@@ -0,0 +1,53 @@
+"""Repository root lookup, kept free of heavy imports.
+
+``simba.db`` re-exports :func:`find_repo_root`; callers on hot CLI paths
+import it from here so they do not pay for the ORM.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pathlib
+
+# absolute cwd -> repo root.  Only hits are remembered: a directory outside
+# any repo is walked again next time, so a later ``git init`` is still picked
+# up.  Relative paths are not cached, since they change meaning on chdir, and
+# a hit is confirmed with one stat, so long-lived processes notice a removed
+# repo.
+_repo_roots: dict[pathlib.Path, pathlib.Path] = {}
+
+
+def _has_git_dir(path: pathlib.Path | str) -> bool:
+    # One stat, without building a Path for ``.git``.
+    try:
+        return stat.S_ISDIR(os.stat(f"{path}/.git").st_mode)
+    except OSError:
+        return False
+
+
+def find_repo_root(cwd: pathlib.Path) -> pathlib.Path | None:
+    """Walk up from *cwd* looking for a ``.git`` directory.
+
+    Returns the repo root path, or ``None`` if not found.
+    """
+    cacheable = cwd.is_absolute()
+    if cacheable:
+        root = _repo_roots.get(cwd)
+        if root is not None:
+            if _has_git_dir(root):
+                return root
+            del _repo_roots[cwd]
+    current = cwd.resolve()
+    while True:
+        if _has_git_dir(current):
+            if cacheable:
+                _repo_roots[cwd] = current
+            return current
+        parent = current.parent
+        if parent == current:
+            return None
+        current = parent
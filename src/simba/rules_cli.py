@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import argparse
 import calendar
+import functools
 import json
 import pathlib
 import re
@@ -48,13 +49,20 @@ def _age_seconds(created_at: str) -> float | None:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _daemon_url() -> str:
+    """Daemon base URL from the ``hooks`` config, loaded once per process."""
     _ = simba.hooks.config  # register hooks section
     cfg = simba.config.load("hooks")
     return f"http://{cfg.daemon_host}:{cfg.daemon_port}"
 
 
-def _cmd_add(args: argparse.Namespace) -> int:
+def _client() -> httpx.Client:
+    """One keep-alive client per CLI invocation (``prune`` issues many calls)."""
+    return httpx.Client(base_url=_daemon_url(), timeout=5.0)
+
+
+def _cmd_add(args: argparse.Namespace, client: httpx.Client) -> int:
     """Store a new TOOL_RULE memory."""
     content = f"{args.tool}: {args.correction}"[
         : simba.memory.config.resolve_max_content_length()
@@ -78,7 +86,7 @@ def _cmd_add(args: argparse.Namespace) -> int:
         payload["projectPath"] = simba.db.resolve_project_id(pathlib.Path(args.project))
 
     try:
-        resp = httpx.post(f"{_daemon_url()}/store", json=payload, timeout=5.0)
+        resp = client.post("/store", json=payload)
         data = resp.json()
         if data.get("status") == "stored":
             print(f"Rule stored: {data.get('id', '?')}")
@@ -97,11 +105,18 @@ def _cmd_add(args: argparse.Namespace) -> int:
         return 1
 
 
-def _cmd_list(args: argparse.Namespace) -> int:
+def _cmd_list(args: argparse.Namespace, client: httpx.Client) -> int:
     """List existing TOOL_RULE memories."""
+    # Default: only this project's rules (the opaque id the matcher scopes by).
+    # ``--all`` shows every project; ``--project`` narrows by substring.
+    current_id = None if getattr(args, "all", False) else simba.db.resolve_project_id()
+
     params: dict = {"type": "TOOL_RULE", "limit": 50}
+    if current_id is not None:
+        # Exact match, so the daemon filters it before applying the limit.
+        params["projectPath"] = current_id
     try:
-        resp = httpx.get(f"{_daemon_url()}/list", params=params, timeout=5.0)
+        resp = client.get("/list", params=params)
         data = resp.json()
     except httpx.HTTPError as exc:
         print(f"Error contacting daemon: {exc}", file=sys.stderr)
@@ -112,46 +127,44 @@ def _cmd_list(args: argparse.Namespace) -> int:
         print("No tool rules found.")
         return 0
 
-    # Default: only this project's rules (the opaque id the matcher scopes by).
-    # ``--all`` shows every project; ``--project`` narrows by substring.
-    current_id = None if getattr(args, "all", False) else simba.db.resolve_project_id()
-
-    shown = 0
+    lines: list[str] = []
     for m in memories:
         mid = m.get("id", "?")
         content = m.get("content", "")
         project = m.get("projectPath", "")
-        ctx_str = m.get("context", "{}")
+
+        # Project filters first: they need no context decode.
+        if current_id is not None and project != current_id:
+            continue
+        if args.project and project and args.project not in project:
+            continue
+
         correction = ""
         tool = ""
         try:
-            ctx = json.loads(ctx_str)
+            ctx = json.loads(m.get("context", "{}"))
             correction = ctx.get("correction", "")
             tool = ctx.get("tool", "")
         except (json.JSONDecodeError, TypeError):
             pass
-
-        # Apply filters
-        if current_id is not None and project != current_id:
-            continue
         if args.tool and tool and tool != args.tool:
             continue
-        if args.project and project and args.project not in project:
-            continue
 
-        shown += 1
-        print(f"  {mid}  [{tool or '?'}]  {content}")
+        lines.append(f"  {mid}  [{tool or '?'}]  {content}")
         if correction:
-            print(f"         INSTEAD: {correction}")
+            lines.append(f"         INSTEAD: {correction}")
         if project:
-            print(f"         project: {project}")
+            lines.append(f"         project: {project}")
 
-    if shown == 0:
+    if not lines:
         print("No tool rules for this project (use --all to see all projects).")
+        return 0
+    # One write for the whole listing rather than a print per line.
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
-def _cmd_prune(args: argparse.Namespace) -> int:
+def _cmd_prune(args: argparse.Namespace, client: httpx.Client) -> int:
     """Bulk-delete TOOL_RULE memories (this project by default)."""
     max_age_seconds: int | None = None
     if args.older_than:
@@ -165,10 +178,8 @@ def _cmd_prune(args: argparse.Namespace) -> int:
             return 1
 
     try:
-        resp = httpx.get(
-            f"{_daemon_url()}/list",
-            params={"type": "TOOL_RULE", "limit": 1000},
-            timeout=10.0,
+        resp = client.get(
+            "/list", params={"type": "TOOL_RULE", "limit": 1000}, timeout=10.0
         )
         memories = resp.json().get("memories", [])
     except httpx.HTTPError as exc:
@@ -206,7 +217,7 @@ def _cmd_prune(args: argparse.Namespace) -> int:
         if not mid:
             continue
         try:
-            r = httpx.delete(f"{_daemon_url()}/memory/{mid}", timeout=10.0)
+            r = client.delete(f"/memory/{mid}", timeout=10.0)
             if r.status_code == 200:
                 deleted += 1
         except httpx.HTTPError:
@@ -216,10 +227,10 @@ def _cmd_prune(args: argparse.Namespace) -> int:
     return 0
 
 
-def _cmd_remove(args: argparse.Namespace) -> int:
+def _cmd_remove(args: argparse.Namespace, client: httpx.Client) -> int:
     """Delete a TOOL_RULE memory by ID."""
     try:
-        resp = httpx.delete(f"{_daemon_url()}/memory/{args.rule_id}", timeout=5.0)
+        resp = client.delete(f"/memory/{args.rule_id}")
         if resp.status_code == 200:
             print(f"Removed rule {args.rule_id}")
             return 0
@@ -264,14 +275,15 @@ def main(args: list[str]) -> int:
     )
 
     parsed = parser.parse_args(args)
-    if parsed.subcmd == "add":
-        return _cmd_add(parsed)
-    elif parsed.subcmd == "list":
-        return _cmd_list(parsed)
-    elif parsed.subcmd == "remove":
-        return _cmd_remove(parsed)
-    elif parsed.subcmd == "prune":
-        return _cmd_prune(parsed)
-    else:
+    commands = {
+        "add": _cmd_add,
+        "list": _cmd_list,
+        "remove": _cmd_remove,
+        "prune": _cmd_prune,
+    }
+    command = commands.get(parsed.subcmd)
+    if command is None:
         parser.print_help()
         return 1
+    with _client() as client:
+        return command(parsed, client)
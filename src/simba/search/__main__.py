@@ -10,22 +10,83 @@ Usage:
     python -m simba.search context "query" [token_limit]
     python -m simba.search recent [n]
     python -m simba.search stats
+
+JSON output (search, recent, stats) is compact unless stdout is a terminal
+or --pretty is given.
 """
 
 from __future__ import annotations
 
+import concurrent.futures
 import json
 import pathlib
 import subprocess
 import sys
 
-import simba.db
-import simba.search.deps
-import simba.search.project_memory
+_COMMANDS = frozenset(
+    {
+        "init",
+        "index",
+        "add-session",
+        "add-knowledge",
+        "add-fact",
+        "search",
+        "context",
+        "recent",
+        "stats",
+    }
+)
+
+
+def _print_json(data: object, *, pretty: bool) -> None:
+    """Print *data* as JSON: indented for people, compact for pipes."""
+    if pretty:
+        sys.stdout.write(json.dumps(data, indent=2) + "\n")
+    else:
+        sys.stdout.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+
+def _count_files(cwd: pathlib.Path) -> int | None:
+    """Number of files ``rg --files`` lists under *cwd*, or None on failure."""
+    try:
+        result = subprocess.run(
+            ["rg", "--files"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            cwd=str(cwd),
+        )
+    except (subprocess.SubprocessError, OSError):
+        return None
+    stdout = result.stdout.strip()
+    return len(stdout.splitlines()) if stdout else 0
+
+
+def _run_qmd_step(cmd: list[str], cwd: pathlib.Path, *, timeout: int) -> bool:
+    """Run one qmd step; report a non-zero exit (and its stderr) and return success."""
+    # Only stderr is kept, to explain a failure.
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=timeout,
+        cwd=str(cwd),
+    )
+    if result.returncode == 0:
+        return True
+    step = " ".join(cmd[1:3])
+    print(f"  QMD {step} returned code {result.returncode}", file=sys.stderr)
+    if result.stderr:
+        print(f"  {result.stderr.strip()}", file=sys.stderr)
+    return False
 
 
 def _cmd_index(cwd: pathlib.Path) -> int:
     """Check dependencies, initialize project memory, and index with QMD."""
+    import simba.db
+    import simba.search.deps
+
     project_name = cwd.name
 
     # 1. Check dependencies
@@ -40,6 +101,13 @@ def _cmd_index(cwd: pathlib.Path) -> int:
         print(f"  {name}: {'ok' if found else 'missing'}{status}")
     print()
 
+    # The file count for the summary depends on nothing below, so it runs
+    # in the background while QMD indexes.
+    background = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    file_count = (
+        background.submit(_count_files, cwd) if deps.get("rg", (False, ""))[0] else None
+    )
+
     # 2. Initialize SQLite project memory
     db_path = simba.db.get_db_path(cwd)
     with simba.db.get_db(cwd):
@@ -50,65 +118,48 @@ def _cmd_index(cwd: pathlib.Path) -> int:
     qmd_available = deps.get("qmd", (False, ""))[0]
     if qmd_available:
         print(f"\nIndexing with QMD (collection: {project_name})...")
+        collection_cmd = [
+            "qmd",
+            "collection",
+            "add",
+            ".",
+            "--name",
+            project_name,
+            "--mask",
+            "**/*.md",
+        ]
+        context_cmd = [
+            "qmd",
+            "context",
+            "add",
+            ".",
+            f"Codebase documentation for {project_name}",
+        ]
         try:
-            subprocess.run(
-                [
-                    "qmd",
-                    "collection",
-                    "add",
-                    ".",
-                    "--name",
-                    project_name,
-                    "--mask",
-                    "**/*.md",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=str(cwd),
-            )
-            desc = f"Codebase documentation for {project_name}"
-            subprocess.run(
-                ["qmd", "context", "add", ".", desc],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=str(cwd),
-            )
-            result = subprocess.run(
-                ["qmd", "embed"],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=str(cwd),
-            )
-            if result.returncode == 0:
-                print("  QMD indexing complete.")
-            else:
-                print(f"  QMD embed returned code {result.returncode}", file=sys.stderr)
+            # The context annotates the collection, so it can only be added
+            # once the collection exists; without one there is nothing to embed.
+            if _run_qmd_step(collection_cmd, cwd, timeout=30):
+                subprocess.run(
+                    context_cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=30,
+                    cwd=str(cwd),
+                )
+                if _run_qmd_step(["qmd", "embed"], cwd, timeout=120):
+                    print("  QMD indexing complete.")
         except (subprocess.SubprocessError, OSError) as exc:
             print(f"  QMD indexing failed: {exc}", file=sys.stderr)
     else:
         print("\nQMD not installed — skipping semantic indexing.")
 
     # 4. Summary
-    rg_available = deps.get("rg", (False, ""))[0]
-    if rg_available:
-        try:
-            result = subprocess.run(
-                ["rg", "--files"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(cwd),
-            )
-            stdout = result.stdout.strip()
-            file_count = len(stdout.splitlines()) if stdout else 0
-            print(f"\nProject: {project_name} ({file_count} files)")
-        except (subprocess.SubprocessError, OSError):
-            print(f"\nProject: {project_name}")
-    else:
+    count = file_count.result() if file_count is not None else None
+    background.shutdown()
+    if count is None:
         print(f"\nProject: {project_name}")
+    else:
+        print(f"\nProject: {project_name} ({count} files)")
 
     print("Index complete.")
     return 0
@@ -116,11 +167,24 @@ def _cmd_index(cwd: pathlib.Path) -> int:
 
 def main() -> int:
     args = sys.argv[1:]
+    pretty = "--pretty" in args
+    if pretty:
+        args = [a for a in args if a != "--pretty"]
+    pretty = pretty or sys.stdout.isatty()
     if not args:
         print(__doc__)
         return 1
 
     cmd = args[0]
+    if cmd not in _COMMANDS:
+        print(__doc__)
+        return 1
+
+    # Deferred past the usage check.  Every command needs project_memory,
+    # `init` and `index` for the tables it registers with simba.db.
+    import simba.db
+    import simba.search.project_memory
+
     cwd = pathlib.Path.cwd()
 
     if cmd == "init":
@@ -155,7 +219,7 @@ def main() -> int:
     elif cmd == "search" and len(args) >= 2:
         limit = int(args[2]) if len(args) >= 3 else 10
         results = simba.search.project_memory.search_fts(args[1], limit, cwd=cwd)
-        print(json.dumps(results, indent=2))
+        _print_json(results, pretty=pretty)
 
     elif cmd == "context" and len(args) >= 2:
         budget = int(args[2]) if len(args) >= 3 else 500
@@ -165,11 +229,11 @@ def main() -> int:
     elif cmd == "recent":
         limit = int(args[1]) if len(args) >= 2 else 5
         sessions = simba.search.project_memory.get_recent_sessions(limit, cwd=cwd)
-        print(json.dumps(sessions, indent=2))
+        _print_json(sessions, pretty=pretty)
 
     elif cmd == "stats":
         stats = simba.search.project_memory.get_stats(cwd)
-        print(json.dumps(stats, indent=2))
+        _print_json(stats, pretty=pretty)
 
     else:
         print(__doc__)
@@ -5,7 +5,7 @@ Ported from claude-turbo-search/scripts/track-activity.sh.
 
 from __future__ import annotations
 
-import datetime
+import time
 from typing import TYPE_CHECKING
 
 import simba._vendor.peewee as pw
@@ -26,6 +26,9 @@ CREATE INDEX IF NOT EXISTS idx_activities_ts ON activities(timestamp DESC);
 """
 
 _MAX_ROWS = 200
+# Rotate on every _ROTATE_EVERY-th row id rather than on every insert, so the
+# table holds at most _MAX_ROWS + _ROTATE_EVERY - 1 rows between rotations.
+_ROTATE_EVERY = 32
 
 
 def _init_schema(conn: sqlite3.Connection) -> None:
@@ -50,17 +53,43 @@ class Activity(simba.db.BaseModel):
 
 simba.db.register_model(Activity)
 
+_timestamp_cache: tuple[int, str] | None = None
+
+
+def _current_timestamp() -> str:
+    """The local time as ``YYYY-MM-DD HH:MM:SS``, formatted once per second."""
+    global _timestamp_cache
+    second = int(time.time())
+    cached = _timestamp_cache
+    if cached is None or cached[0] != second:
+        cached = (second, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)))
+        _timestamp_cache = cached
+    return cached[1]
+
 
 def log_activity(cwd: pathlib.Path, tool_name: str, detail: str) -> None:
-    """Insert a timestamped activity entry and rotate if needed."""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    """Insert a timestamped activity entry and rotate if needed.
+
+    The hook runs once per process, so rotation keys off the new row id
+    instead of an in-memory counter.
+    """
+    timestamp = _current_timestamp()
     with simba.db.connect(cwd):
-        Activity.create(timestamp=timestamp, tool_name=tool_name, detail=detail)
-        # Rotation: keep only the last _MAX_ROWS rows.
-        keep = (
-            Activity.select(Activity.id).order_by(Activity.id.desc()).limit(_MAX_ROWS)
+        row = Activity.create(timestamp=timestamp, tool_name=tool_name, detail=detail)
+        # AUTOINCREMENT ids only grow, so an id within _MAX_ROWS means the
+        # table cannot be over the cap yet.
+        if row.id % _ROTATE_EVERY or row.id <= _MAX_ROWS:
+            return
+        # Rotation: keep only the last _MAX_ROWS rows.  The oldest id to keep
+        # comes from a backwards walk of the primary key, so this is a range
+        # delete rather than a NOT IN scan of the whole table.
+        oldest_kept = (
+            Activity.select(Activity.id)
+            .order_by(Activity.id.desc())
+            .offset(_MAX_ROWS - 1)
+            .limit(1)
         )
-        Activity.delete().where(Activity.id.not_in(keep)).execute()
+        Activity.delete().where(Activity.id < oldest_kept).execute()
 
 
 def read_activity_log(
@@ -68,16 +97,22 @@ def read_activity_log(
 ) -> list[tuple[str, str, str]]:
     """Read activity entries as (timestamp, tool_name, detail) tuples.
 
-    Returns entries in chronological order.
+    Returns the newest ``_MAX_ROWS`` entries in chronological order, even
+    while rotation of the overflow is still pending.
     Returns an empty list when the database does not exist.
     """
     if not simba.db.get_db_path(cwd).exists():
         return []
     with simba.db.connect(cwd):
-        return [
-            (a.timestamp, a.tool_name, a.detail)
-            for a in Activity.select().order_by(Activity.id)
-        ]
+        # Plain tuples straight off the cursor: no Model instance per row.
+        rows = list(
+            Activity.select(Activity.timestamp, Activity.tool_name, Activity.detail)
+            .order_by(Activity.id.desc())
+            .limit(_MAX_ROWS)
+            .tuples()
+        )
+    rows.reverse()
+    return rows
 
 
 def clear_activity_log(cwd: pathlib.Path) -> None:
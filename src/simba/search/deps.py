@@ -5,6 +5,7 @@ Checks availability and versions of CLI tools required by the search package.
 
 from __future__ import annotations
 
+import concurrent.futures
 import platform
 import shutil
 import subprocess
@@ -31,9 +32,18 @@ def check_dependency(name: str) -> tuple[bool, str]:
         return (True, "unknown")
 
 
+_TOOLS = ("rg", "fzf", "jq", "qmd")
+
+
 def check_all() -> dict[str, tuple[bool, str]]:
-    """Check availability of all required external tools."""
-    return {name: check_dependency(name) for name in ("rg", "fzf", "jq", "qmd")}
+    """Check availability of all required external tools.
+
+    The ``--version`` probes run concurrently, so a slow tool costs at most
+    one probe timeout rather than adding to the others.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(_TOOLS)) as pool:
+        futures = {name: pool.submit(check_dependency, name) for name in _TOOLS}
+    return {name: future.result() for name, future in futures.items()}
 
 
 def get_install_instructions(name: str) -> str:
@@ -6,14 +6,15 @@ Ported from claude-turbo-search/memory/memory-db.sh + schema.sql.
 from __future__ import annotations
 
 import contextlib
+import re
 import sqlite3
 import typing
 
 import simba._vendor.peewee as pw
 import simba.db
-from simba._vendor.playhouse.sqlite_ext import FTS5Model, RowIDField, SearchField
 
 if typing.TYPE_CHECKING:
+    import collections.abc
     import pathlib
 
 _SCHEMA_BASE_SQL = """\
@@ -50,83 +51,185 @@ CREATE INDEX IF NOT EXISTS idx_knowledge_area ON knowledge(area);
 CREATE INDEX IF NOT EXISTS idx_facts_category ON facts(category);
 """
 
-_SCHEMA_FTS_SQL = """\
--- Full-text search virtual table for fast local search
-CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
-    content,
-    source_type,
-    source_id,
-    tokenize='porter unicode61'
+# The five newest facts and three newest sessions that get_context shows on
+# every prompt, kept up to date by triggers so the hook reads one tiny table
+# instead of sorting facts (no created_at index) and sessions on each call.
+# Inserts, the hot path, add the row and trim the kind back to its cap;
+# updates and deletes are rare and refill the kind from scratch.
+_CONTEXT_CACHE_LIMITS = {"fact": 5, "session": 3}
+
+_SCHEMA_CONTEXT_CACHE_SQL = """\
+CREATE TABLE IF NOT EXISTS context_cache (
+    kind TEXT NOT NULL,
+    source_id INTEGER NOT NULL,
+    created_at TIMESTAMP,
+    text TEXT NOT NULL,
+    PRIMARY KEY (kind, source_id)
 );
+"""
 
--- Triggers to keep FTS in sync
 
--- Session FTS triggers
-CREATE TRIGGER IF NOT EXISTS sessions_ai AFTER INSERT ON sessions BEGIN
-    INSERT INTO memory_fts(content, source_type, source_id)
-    VALUES (NEW.summary || ' ' || COALESCE(NEW.topics, ''), 'session', NEW.id);
-END;
+def _refill_context_cache_sql(kind: str, table: str, column: str) -> str:
+    """Return the statements that rebuild *kind*'s slice of ``context_cache``."""
+    return f"""\
+DELETE FROM context_cache WHERE kind = '{kind}';
+INSERT INTO context_cache(kind, source_id, created_at, text)
+SELECT '{kind}', id, created_at, {column} FROM {table}
+ORDER BY created_at DESC, id DESC LIMIT {_CONTEXT_CACHE_LIMITS[kind]};
+"""
 
-CREATE TRIGGER IF NOT EXISTS sessions_au AFTER UPDATE ON sessions BEGIN
-    DELETE FROM memory_fts WHERE source_type = 'session' AND source_id = OLD.id;
-    INSERT INTO memory_fts(content, source_type, source_id)
-    VALUES (NEW.summary || ' ' || COALESCE(NEW.topics, ''), 'session', NEW.id);
-END;
 
-CREATE TRIGGER IF NOT EXISTS sessions_ad AFTER DELETE ON sessions BEGIN
-    DELETE FROM memory_fts WHERE source_type = 'session' AND source_id = OLD.id;
+def _context_cache_triggers_sql(kind: str, table: str, column: str) -> str:
+    """Return the triggers that keep *kind*'s slice of ``context_cache`` current."""
+    refill = _refill_context_cache_sql(kind, table, column)
+    return f"""\
+CREATE TRIGGER IF NOT EXISTS {table}_cache_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO context_cache(kind, source_id, created_at, text)
+    VALUES ('{kind}', NEW.id, NEW.created_at, NEW.{column});
+    DELETE FROM context_cache WHERE kind = '{kind}' AND source_id NOT IN (
+        SELECT source_id FROM context_cache WHERE kind = '{kind}'
+        ORDER BY created_at DESC, source_id DESC
+        LIMIT {_CONTEXT_CACHE_LIMITS[kind]}
+    );
 END;
 
--- Knowledge FTS triggers
-CREATE TRIGGER IF NOT EXISTS knowledge_ai AFTER INSERT ON knowledge BEGIN
-    INSERT INTO memory_fts(content, source_type, source_id)
-    VALUES (NEW.area || ' ' || NEW.summary || ' ' || COALESCE(NEW.patterns, ''),
-            'knowledge', NEW.id);
-END;
+CREATE TRIGGER IF NOT EXISTS {table}_cache_au AFTER UPDATE ON {table} BEGIN
+{refill}END;
 
-CREATE TRIGGER IF NOT EXISTS knowledge_au AFTER UPDATE ON knowledge BEGIN
-    DELETE FROM memory_fts WHERE source_type = 'knowledge' AND source_id = OLD.id;
-    INSERT INTO memory_fts(content, source_type, source_id)
-    VALUES (NEW.area || ' ' || NEW.summary || ' ' || COALESCE(NEW.patterns, ''),
-            'knowledge', NEW.id);
-END;
+CREATE TRIGGER IF NOT EXISTS {table}_cache_ad AFTER DELETE ON {table} BEGIN
+{refill}END;
+"""
 
-CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
-    DELETE FROM memory_fts WHERE source_type = 'knowledge' AND source_id = OLD.id;
-END;
 
--- Facts FTS triggers
-CREATE TRIGGER IF NOT EXISTS facts_ai AFTER INSERT ON facts BEGIN
-    INSERT INTO memory_fts(content, source_type, source_id)
-    VALUES (NEW.fact || ' ' || COALESCE(NEW.category, ''), 'fact', NEW.id);
+_CONTEXT_CACHE_SOURCES = (("fact", "facts", "fact"), ("session", "sessions", "summary"))
+_SCHEMA_CONTEXT_CACHE_SQL += "".join(
+    _context_cache_triggers_sql(*source) for source in _CONTEXT_CACHE_SOURCES
+)
+# Seeds a newly created cache from rows written before it existed.
+_REFILL_CONTEXT_CACHE_SQL = "".join(
+    _refill_context_cache_sql(*source) for source in _CONTEXT_CACHE_SOURCES
+)
+
+# Full-text search: one FTS5 index per source table.  Each is external-content
+# (``content=<table>``, as kg_edges_fts does): the text is stored only in the
+# source row, and the triggers just add/remove index entries by rowid instead
+# of copying the text and scanning the index for the old entry.
+#   *_fts      porter-stemmed, for prose queries
+#   *_fts_tri  trigram (SQLite >= 3.34), for substring matches on code
+#              identifiers (``build_context`` inside ``rag_context.build_context``)
+_FTS_SOURCES: dict[str, tuple[str, tuple[str, ...], tuple[float, ...]]] = {
+    # table: (source_type, indexed columns, bm25() column weights)
+    "sessions": ("session", ("summary", "topics"), (10.0, 2.0)),
+    "knowledge": ("knowledge", ("area", "summary", "patterns"), (10.0, 10.0, 2.0)),
+    "facts": ("fact", ("fact", "category"), (10.0, 2.0)),
+}
+_FTS_TOKENIZERS = {"fts": "porter unicode61", "fts_tri": "trigram"}
+
+
+def _fts_schema_sql(table: str, suffix: str) -> str:
+    """Return the DDL for *table*'s ``{table}_{suffix}`` index and its triggers."""
+    fts = f"{table}_{suffix}"
+    columns = _FTS_SOURCES[table][1]
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{c}" for c in columns)
+    old = ", ".join(f"OLD.{c}" for c in columns)
+    return f"""\
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+    {cols},
+    content='{table}', content_rowid='id', tokenize='{_FTS_TOKENIZERS[suffix]}'
+);
+
+CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.id, {new});
 END;
 
-CREATE TRIGGER IF NOT EXISTS facts_au AFTER UPDATE ON facts BEGIN
-    DELETE FROM memory_fts WHERE source_type = 'fact' AND source_id = OLD.id;
-    INSERT INTO memory_fts(content, source_type, source_id)
-    VALUES (NEW.fact || ' ' || COALESCE(NEW.category, ''), 'fact', NEW.id);
+CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
 END;
 
-CREATE TRIGGER IF NOT EXISTS facts_ad AFTER DELETE ON facts BEGIN
-    DELETE FROM memory_fts WHERE source_type = 'fact' AND source_id = OLD.id;
+CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+    INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.id, {new});
 END;
 """
 
+
+# The earlier shared memory_fts (+ memory_fts_tri) kept its own copy of every
+# row and was synced by these triggers.
+_DROP_LEGACY_FTS_SQL = """\
+DROP TRIGGER IF EXISTS sessions_ai;
+DROP TRIGGER IF EXISTS sessions_au;
+DROP TRIGGER IF EXISTS sessions_ad;
+DROP TRIGGER IF EXISTS knowledge_ai;
+DROP TRIGGER IF EXISTS knowledge_au;
+DROP TRIGGER IF EXISTS knowledge_ad;
+DROP TRIGGER IF EXISTS facts_ai;
+DROP TRIGGER IF EXISTS facts_au;
+DROP TRIGGER IF EXISTS facts_ad;
+DROP TRIGGER IF EXISTS sessions_tri_ai;
+DROP TRIGGER IF EXISTS sessions_tri_au;
+DROP TRIGGER IF EXISTS sessions_tri_ad;
+DROP TRIGGER IF EXISTS knowledge_tri_ai;
+DROP TRIGGER IF EXISTS knowledge_tri_au;
+DROP TRIGGER IF EXISTS knowledge_tri_ad;
+DROP TRIGGER IF EXISTS facts_tri_ai;
+DROP TRIGGER IF EXISTS facts_tri_au;
+DROP TRIGGER IF EXISTS facts_tri_ad;
+DROP TABLE IF EXISTS memory_fts;
+DROP TABLE IF EXISTS memory_fts_tri;
+"""
+
+_SCHEMA_FTS_SQL = "\n".join(
+    _fts_schema_sql(table, suffix)
+    for suffix in _FTS_TOKENIZERS
+    for table in _FTS_SOURCES
+)
+
 # Combined schema for reference / documentation purposes.
-_SCHEMA_SQL = _SCHEMA_BASE_SQL + _SCHEMA_FTS_SQL
+_SCHEMA_SQL = _SCHEMA_BASE_SQL + _SCHEMA_CONTEXT_CACHE_SQL + _SCHEMA_FTS_SQL
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _drop_legacy_fts(conn: sqlite3.Connection) -> None:
+    """Retire the shared ``memory_fts`` mirror.  Idempotent."""
+    if _table_exists(conn, "memory_fts") or _table_exists(conn, "memory_fts_tri"):
+        with contextlib.suppress(sqlite3.OperationalError):
+            conn.executescript(_DROP_LEGACY_FTS_SQL)
 
 
 def _init_schema(conn: sqlite3.Connection) -> None:
     """Initialize project memory tables and FTS indexes.
 
-    FTS5 tables and triggers are installed when supported by the SQLite build;
-    core tables and indexes are always created.
+    FTS5 tables and triggers are installed when supported by the SQLite build
+    (the trigram ones also need the trigram tokenizer); core tables and
+    indexes are always created.  A newly created index is rebuilt from the
+    rows already in its source table.
     """
     conn.executescript(_SCHEMA_BASE_SQL)
-    with contextlib.suppress(sqlite3.OperationalError):
-        # FTS5 module not available in this SQLite build; full-text search
-        # will gracefully return empty results.
-        conn.executescript(_SCHEMA_FTS_SQL)
+    has_cache = _table_exists(conn, "context_cache")
+    conn.executescript(_SCHEMA_CONTEXT_CACHE_SQL)
+    if not has_cache:
+        conn.executescript(f"BEGIN;\n{_REFILL_CONTEXT_CACHE_SQL}COMMIT;")
+    _drop_legacy_fts(conn)
+    for suffix in _FTS_TOKENIZERS:
+        for table in _FTS_SOURCES:
+            fts = f"{table}_{suffix}"
+            existed = _table_exists(conn, fts)
+            try:
+                conn.executescript(_fts_schema_sql(table, suffix))
+            except sqlite3.OperationalError:
+                # FTS5 (or this tokenizer) is not available in this SQLite
+                # build; searches skip the missing index.
+                break
+            if not existed:
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES('rebuild')")
+                conn.commit()
 
 
 simba.db.register_schema(_init_schema)
@@ -162,17 +265,16 @@ class Fact(simba.db.BaseModel):
         table_name = "facts"
 
 
-class ProjectMemoryFTS(FTS5Model):
-    # Query-only view of the porter-tokenized FTS mirror (creation + sync stay
-    # in the raw DDL/triggers above). Used for snippet() + rank in search_fts.
-    rowid = RowIDField()
-    content = SearchField()
-    source_type = SearchField()
-    source_id = SearchField()
+class ContextCache(simba.db.BaseModel):
+    # Trigger-maintained; see _SCHEMA_CONTEXT_CACHE_SQL.
+    kind = pw.TextField()
+    source_id = pw.IntegerField()
+    created_at = pw.TextField(null=True)
+    text = pw.TextField()
 
     class Meta:
-        database = simba.db.database
-        table_name = "memory_fts"
+        table_name = "context_cache"
+        primary_key = pw.CompositeKey("kind", "source_id")
 
 
 def add_session(
@@ -193,6 +295,57 @@ def add_session(
         ).id
 
 
+# Rows per INSERT statement in the batch helpers (at most 4 bound columns
+# each, well under SQLite's host-parameter limit).
+_ADD_MANY_CHUNK = 500
+
+
+def add_sessions(
+    sessions: collections.abc.Iterable[tuple[str, str, str, str]],
+    *,
+    cwd: pathlib.Path | None = None,
+) -> int:
+    """Insert many ``(summary, files_touched, tools_used, topics)`` rows at once.
+
+    The bulk form of :func:`add_session`: one ``BEGIN IMMEDIATE`` transaction
+    (one commit, one fsync) for the whole batch.  Returns the number inserted.
+    """
+    fields = [
+        Session.summary,
+        Session.files_touched,
+        Session.tools_used,
+        Session.topics,
+    ]
+    return _insert_many(Session, fields, sessions, cwd)
+
+
+def add_facts(
+    facts: collections.abc.Iterable[tuple[str, str]],
+    *,
+    cwd: pathlib.Path | None = None,
+) -> int:
+    """Insert many ``(fact, category)`` rows in one transaction.
+
+    The bulk form of :func:`add_fact`.  Returns the number inserted.
+    """
+    return _insert_many(Fact, [Fact.fact, Fact.category], facts, cwd)
+
+
+def _insert_many(
+    model: type[simba.db.BaseModel],
+    fields: list[pw.Field],
+    rows: collections.abc.Iterable[tuple[str, ...]],
+    cwd: pathlib.Path | None,
+) -> int:
+    rows = list(rows)
+    if not rows:
+        return 0
+    with simba.db.write_transaction(cwd):
+        for batch in pw.chunked(rows, _ADD_MANY_CHUNK):
+            model.insert_many(batch, fields=fields).execute()
+    return len(rows)
+
+
 def add_knowledge(
     area: str,
     summary: str,
@@ -227,52 +380,167 @@ def add_fact(
         return Fact.create(fact=fact, category=category).id
 
 
+# A single token with an underscore or a lower->upper camelCase hump.
+_IDENTIFIER_RE = re.compile(r"\S*(?:_|[a-z][A-Z])\S*")
+
+
+def _looks_like_identifier(query: str) -> bool:
+    """Return True for code-identifier queries best served by substring match."""
+    query = query.strip()
+    # Trigram matching needs at least three characters to find anything.
+    return len(query) >= 3 and _IDENTIFIER_RE.fullmatch(query) is not None
+
+
+_DROP_QUOTES = str.maketrans("", "", '"')
+_FTS_TOKEN_RE = re.compile(r"\S+")
+
+
 def _escape_fts_query(query: str) -> str:
     """Escape special FTS5 characters so the query is treated as plain terms."""
     # FTS5 special characters that need quoting: * " ( ) : ^
-    # Wrap each token in double quotes to treat as a literal phrase/term.
-    tokens = query.split()
-    escaped = []
-    for token in tokens:
-        # Strip characters that would break even inside quotes
-        cleaned = token.replace('"', "")
-        if cleaned:
-            escaped.append(f'"{cleaned}"')
-    return " ".join(escaped)
+    # Wrap each token in double quotes to treat as a literal phrase/term, after
+    # stripping the quotes that would break even inside them (one pass each).
+    return " ".join(
+        f'"{m.group()}"' for m in _FTS_TOKEN_RE.finditer(query.translate(_DROP_QUOTES))
+    )
+
+
+def _fts_search_sql(suffix: str, *, snippet: bool) -> str:
+    """Return one ranked query over every ``*_{suffix}`` index.
+
+    Bound parameters: the MATCH expression once per source table, then the
+    row limit.
+    """
+    branches = []
+    for table, (source_type, _columns, weights) in _FTS_SOURCES.items():
+        fts = f"{table}_{suffix}"
+        match = f", snippet({fts}, -1, '**', '**', '...', 32) AS match"
+        branches.append(
+            f"SELECT '{source_type}' AS source_type, rowid AS source_id"
+            f"{match if snippet else ''},"
+            f" bm25({fts}, {', '.join(map(str, weights))}) AS score"
+            f" FROM {fts} WHERE {fts} MATCH ?"
+        )
+    columns = "source_type, source_id" + (", match" if snippet else "")
+    return (
+        f"SELECT {columns} FROM ({' UNION ALL '.join(branches)}) ORDER BY score LIMIT ?"
+    )
+
+
+_FTS_SEARCH_SQL = {
+    (suffix, snippet): _fts_search_sql(suffix, snippet=snippet)
+    for suffix in _FTS_TOKENIZERS
+    for snippet in (True, False)
+}
+
+_KNOWLEDGE_MATCH_SQL = (
+    "SELECT knowledge.area, knowledge.summary FROM knowledge_fts"
+    " JOIN knowledge ON knowledge.id = knowledge_fts.rowid"
+    " WHERE knowledge_fts MATCH ?"
+    " ORDER BY bm25(knowledge_fts, {})"
+    " LIMIT ?"
+).format(", ".join(map(str, _FTS_SOURCES["knowledge"][2])))
 
 
 def search_fts(
     query: str,
     limit: int = 10,
     *,
+    snippet: bool = True,
     cwd: pathlib.Path | None = None,
 ) -> list[dict[str, typing.Any]]:
     """Full-text search with snippet extraction.
 
-    Returns list of {source_type, source_id, match}.
+    Returns list of {source_type, source_id, match}; with ``snippet=False``
+    the ``match`` key is omitted and SQLite skips building the excerpt.
     Returns an empty list when FTS5 is unavailable.
     """
     safe_query = _escape_fts_query(query)
     if not safe_query:
         return []
 
-    snippet = pw.fn.snippet(ProjectMemoryFTS._meta.entity, 0, "**", "**", "...", 32)
-    with simba.db.connect(cwd):
-        q = (
-            ProjectMemoryFTS.select(
-                ProjectMemoryFTS.source_type,
-                ProjectMemoryFTS.source_id,
-                snippet.alias("match"),
-            )
-            .where(ProjectMemoryFTS.match(safe_query))
-            .order_by(ProjectMemoryFTS.bm25())
+    suffixes = ["fts"]
+    if _looks_like_identifier(query):
+        suffixes.insert(0, "fts_tri")
+    params = (safe_query,) * len(_FTS_SOURCES) + (limit,)
+    with simba.db.connect(cwd) as db:
+        for suffix in suffixes:
+            try:
+                cursor = db.execute_sql(_FTS_SEARCH_SQL[suffix, snippet], params)
+            except pw.OperationalError:
+                # FTS5 (or the trigram tokenizer) may be missing from this
+                # SQLite build; try the next index.
+                continue
+            names = [d[0] for d in cursor.description]
+            rows = [dict(zip(names, row, strict=True)) for row in cursor]
+            if rows:
+                return rows
+    return []
+
+
+def _match_knowledge(query: str, limit: int = 3) -> list[Knowledge]:
+    """Return the knowledge rows whose FTS mirror best matches *query*.
+
+    Falls back to a ``LIKE`` scan when FTS5 is unavailable.  Callers hold
+    the connection open.
+    """
+    safe_query = _escape_fts_query(query)
+    if not safe_query:
+        return []
+    try:
+        return list(Knowledge.raw(_KNOWLEDGE_MATCH_SQL, safe_query, limit))
+    except pw.OperationalError:
+        # No knowledge_fts table in this SQLite build.
+        return list(
+            Knowledge.select(Knowledge.area, Knowledge.summary)
+            .where(Knowledge.area.contains(query) | Knowledge.summary.contains(query))
             .limit(limit)
         )
-        try:
-            return list(q.dicts())
-        except Exception:
-            # FTS5 virtual table may not exist if SQLite lacks FTS5 support
-            return []
+
+
+def _context_sections(
+    query: str, cwd: pathlib.Path | None
+) -> collections.abc.Iterator[str]:
+    """Yield get_context's markdown sections in order, querying lazily.
+
+    Each section's lookup runs only when the caller asks for it, so a caller
+    that has filled its budget skips the remaining queries.
+    """
+    # Newest facts and sessions, precomputed by the context_cache triggers.
+    recent: dict[str, list[str]] = {"fact": [], "session": []}
+    cached = ContextCache.select(ContextCache.kind, ContextCache.text).order_by(
+        ContextCache.created_at.desc(), ContextCache.source_id.desc()
+    )
+    for kind, text in cached.tuples():
+        recent[kind].append(text)
+
+    # 1. Facts (highest value, lowest cost)
+    if recent["fact"]:
+        lines = ["## Project Facts"]
+        lines += [f"- {fact}" for fact in recent["fact"]]
+        yield "\n".join(lines)
+
+    # 2. Relevant knowledge areas (FTS match on query)
+    if query:
+        knowledge = _match_knowledge(query)
+        if knowledge:
+            lines = ["## Relevant Code Areas"]
+            lines += [f"- **{k.area}**: {k.summary}" for k in knowledge]
+            yield "\n".join(lines)
+
+    # 3. Recent sessions
+    if recent["session"]:
+        lines = ["## Recent Work"]
+        lines += [f"- {summary}" for summary in recent["session"]]
+        yield "\n".join(lines)
+
+    # 4. FTS results for query-specific context
+    if query:
+        fts_results = search_fts(query, limit=5, cwd=cwd)
+        if fts_results:
+            lines = ["## Related Context"]
+            lines += [f"- {r['match']}" for r in fts_results]
+            yield "\n".join(lines)
 
 
 def get_context(
@@ -288,48 +556,21 @@ def get_context(
     """
     char_limit = token_budget * 4
     parts: list[str] = []
-
-    with simba.db.connect(cwd):
-        # 1. Facts (highest value, lowest cost)
-        facts = list(Fact.select(Fact.fact).order_by(Fact.created_at.desc()).limit(5))
-        if facts:
-            lines = ["## Project Facts"]
-            lines += [f"- {f.fact}" for f in facts]
-            parts.append("\n".join(lines))
-
-        # 2. Relevant knowledge areas (LIKE match on query)
-        if query:
-            knowledge = list(
-                Knowledge.select(Knowledge.area, Knowledge.summary)
-                .where(
-                    Knowledge.area.contains(query) | Knowledge.summary.contains(query)
-                )
-                .limit(3)
-            )
-            if knowledge:
-                lines = ["## Relevant Code Areas"]
-                lines += [f"- **{k.area}**: {k.summary}" for k in knowledge]
-                parts.append("\n".join(lines))
-
-        # 3. Recent sessions
-        sessions = list(
-            Session.select(Session.summary).order_by(Session.created_at.desc()).limit(3)
-        )
-        if sessions:
-            lines = ["## Recent Work"]
-            lines += [f"- {s.summary}" for s in sessions]
-            parts.append("\n".join(lines))
-
-        # 4. FTS results for query-specific context
-        if query:
-            fts_results = search_fts(query, limit=5, cwd=cwd)
-            if fts_results:
-                lines = ["## Related Context"]
-                lines += [f"- {r['match']}" for r in fts_results]
-                parts.append("\n".join(lines))
+    size = -2  # no "\n\n" separator before the first section
+
+    # All lookups share one read snapshot instead of one autocommit
+    # statement each.
+    with simba.db.read_transaction(cwd):
+        for section in _context_sections(query, cwd):
+            parts.append(section)
+            size += 2 + len(section)
+            if size >= char_limit:
+                # Anything after this would be truncated away; skip its query.
+                break
 
     output = "\n\n".join(parts)
-    return output[:char_limit]
+    # ``size`` is len(output): only slice when something has to be cut.
+    return output if size <= char_limit else output[:char_limit]
 
 
 def get_recent_sessions(
@@ -349,11 +590,16 @@ def get_recent_sessions(
         return list(rows.dicts())
 
 
+_STATS_SQL = (
+    "SELECT (SELECT COUNT(*) FROM sessions),"
+    " (SELECT COUNT(*) FROM knowledge),"
+    " (SELECT COUNT(*) FROM facts)"
+)
+
+
 def get_stats(cwd: pathlib.Path | None = None) -> dict[str, int]:
     """Return counts for sessions, knowledge, and facts."""
-    with simba.db.connect(cwd):
-        return {
-            "sessions": Session.select().count(),
-            "knowledge": Knowledge.select().count(),
-            "facts": Fact.select().count(),
-        }
+    with simba.db.connect(cwd) as db:
+        # One statement, so all three counts come from a single read snapshot.
+        sessions, knowledge, facts = db.execute_sql(_STATS_SQL).fetchone()
+    return {"sessions": sessions, "knowledge": knowledge, "facts": facts}
@@ -121,6 +121,7 @@ _STOP_WORDS = frozenset(
 )
 _MIN_TERM_LENGTH = 3
 _MAX_TERMS = 8
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
 def is_available() -> bool:
@@ -134,9 +135,15 @@ def extract_search_terms(prompt: str) -> str:
     Lowercases, removes stop words and short tokens, and returns up to
     ``_MAX_TERMS`` terms joined by spaces.
     """
-    tokens = re.findall(r"[a-z0-9]+", prompt.lower())
-    terms = [t for t in tokens if t not in _STOP_WORDS and len(t) >= _MIN_TERM_LENGTH]
-    return " ".join(terms[:_MAX_TERMS])
+    terms: list[str] = []
+    # finditer so long prompts stop being scanned once enough terms are found.
+    for match in _TOKEN_RE.finditer(prompt.lower()):
+        term = match.group()
+        if len(term) >= _MIN_TERM_LENGTH and term not in _STOP_WORDS:
+            terms.append(term)
+            if len(terms) == _MAX_TERMS:
+                break
+    return " ".join(terms)
 
 
 def search(
@@ -154,14 +161,18 @@ def search(
     if files_only:
         cmd.append("--files")
     try:
+        # Bytes in, straight to json.loads (which detects UTF-8 itself); stdin
+        # closed so qmd can never block reading the hook's inherited stdin.
         result = subprocess.run(
             cmd,
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=5,
+            check=False,
         )
         data = json.loads(result.stdout)
-    except (subprocess.SubprocessError, json.JSONDecodeError, OSError):
+    except (subprocess.SubprocessError, ValueError, OSError):
+        # ValueError covers JSONDecodeError and undecodable bytes.
         return []
 
     if not isinstance(data, list):
@@ -171,8 +182,7 @@ def search(
     for item in data:
         if not isinstance(item, dict):
             continue
-        path = str(item.get("path", ""))
-        path = re.sub(r"^qmd://", "", path)
+        path = str(item.get("path", "")).removeprefix("qmd://")
         entries.append(
             {
                 "path": path,
@@ -5,11 +5,13 @@ Ported from claude-turbo-search/hooks/rag-context-hook.sh.
 
 from __future__ import annotations
 
+import concurrent.futures
 import re
 from typing import TYPE_CHECKING
 
 import simba.config
 import simba.db
+import simba.search.config
 import simba.search.project_memory
 import simba.search.qmd
 
@@ -17,9 +19,7 @@ if TYPE_CHECKING:
     import pathlib
 
 
-def _search_cfg():
-    import simba.search.config
-
+def _search_cfg() -> simba.search.config.SearchConfig:
     return simba.config.load("search")
 
 
@@ -28,6 +28,20 @@ _SKIP_PATTERNS = re.compile(
 )
 
 
+def _memory_context(
+    search_terms: str, cfg: simba.search.config.SearchConfig, cwd: pathlib.Path
+) -> str:
+    """Return project-memory context for *search_terms*, or "" on any failure."""
+    try:
+        if simba.db.get_db_path(cwd).exists():
+            return simba.search.project_memory.get_context(
+                search_terms, cfg.memory_token_budget, cwd=cwd
+            )
+    except Exception:
+        pass
+    return ""
+
+
 def build_context(prompt: str, cwd: pathlib.Path) -> str:
     """Build a formatted context string from project memory and QMD search.
 
@@ -51,33 +65,39 @@ def build_context(prompt: str, cwd: pathlib.Path) -> str:
     if not search_terms:
         return ""
 
-    # -- Phase 1: Query SQLite project memory -------------------------------
-    memory_context = ""
+    # -- Phase 1: Start QMD -------------------------------------------------
+    # qmd is a subprocess, so its search runs on a worker thread while the
+    # SQLite read below proceeds: latency is max(sqlite, qmd), not the sum.
+    code_results: concurrent.futures.Future[list[dict[str, str]]] | None = None
     try:
-        if simba.db.get_db_path(cwd).exists():
-            memory_context = simba.search.project_memory.get_context(
-                search_terms, cfg.memory_token_budget, cwd=cwd
+        if simba.search.qmd.is_available():
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            code_results = pool.submit(
+                simba.search.qmd.search,
+                search_terms,
+                max_results=cfg.max_code_results,
             )
+            pool.shutdown(wait=False)
     except Exception:
-        memory_context = ""
+        code_results = None
 
-    # -- Phase 2: Query QMD -------------------------------------------------
+    # -- Phase 2: Query SQLite project memory -------------------------------
+    memory_context = _memory_context(search_terms, cfg, cwd)
+
+    # -- Phase 3: Collect QMD results ---------------------------------------
     code_context = ""
     try:
-        if simba.search.qmd.is_available():
-            results = simba.search.qmd.search(
-                search_terms, max_results=cfg.max_code_results
-            )
-            if results:
-                lines: list[str] = []
-                for entry in results:
-                    lines.append(f"### {entry['path']} (relevance: {entry['score']})")
-                    lines.append(f"```\n{entry['snippet']}\n```")
-                code_context = "\n".join(lines)
+        results = code_results.result() if code_results is not None else []
+        if results:
+            lines: list[str] = []
+            for entry in results:
+                lines.append(f"### {entry['path']} (relevance: {entry['score']})")
+                lines.append(f"```\n{entry['snippet']}\n```")
+            code_context = "\n".join(lines)
     except Exception:
         code_context = ""
 
-    # -- Phase 3: Combine and format ----------------------------------------
+    # -- Phase 4: Combine and format ----------------------------------------
     if not memory_context and not code_context:
         return ""
 
@@ -6,7 +6,9 @@ to display a summary of tool usage and estimated token savings.
 
 from __future__ import annotations
 
+import collections
 import contextlib
+import re
 import subprocess
 from typing import TYPE_CHECKING
 
@@ -21,15 +23,15 @@ _TOKENS_PER_SEARCH = 50
 _TOKENS_PER_FILE_READ = 1000
 _BLIND_EXPLORATION_FILES = 20
 
+# The count after each "path\0" in ``rg --count --null`` output.
+_COUNT_RE = re.compile(rb"\0(\d+)$", re.MULTILINE)
+
 
 def _count_activities(
     entries: list[tuple[str, str, str]],
-) -> dict[str, int]:
+) -> collections.Counter[str]:
     """Tally activity entries by tool name."""
-    counts: dict[str, int] = {}
-    for _ts, tool, _detail in entries:
-        counts[tool] = counts.get(tool, 0) + 1
-    return counts
+    return collections.Counter(tool for _ts, tool, _detail in entries)
 
 
 def _codebase_size(cwd: pathlib.Path) -> tuple[int, int]:
@@ -38,34 +40,29 @@ def _codebase_size(cwd: pathlib.Path) -> tuple[int, int]:
     Returns ``(0, 0)`` when ``rg`` is unavailable.
     """
     try:
-        files_result = subprocess.run(
-            ["rg", "--files"],
+        # One pass: --include-zero lists every file (empty ones too) with its
+        # line count, so the record count doubles as the file count.  Output
+        # stays bytes; only the counts are parsed.
+        result = subprocess.run(
+            [
+                "rg",
+                "--count",
+                "--include-zero",
+                "--binary",
+                "--with-filename",
+                "--null",
+                "--no-messages",
+                "",
+            ],
             capture_output=True,
-            text=True,
             timeout=10,
             cwd=str(cwd),
         )
-        stdout = files_result.stdout.strip()
-        lines = stdout.splitlines() if stdout else []
-        file_count = len(lines)
-
-        count_result = subprocess.run(
-            ["rg", "-c", ""],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            cwd=str(cwd),
-        )
-        line_count = 0
-        for entry in count_result.stdout.strip().splitlines():
-            # rg -c outputs "path:count"
-            parts = entry.rsplit(":", 1)
-            if len(parts) == 2:
-                with contextlib.suppress(ValueError):
-                    line_count += int(parts[1])
-        return file_count, line_count
     except (subprocess.SubprocessError, OSError):
         return 0, 0
+    # Tally in C: one regex scan over the raw output, no per-line Python loop.
+    counts = _COUNT_RE.findall(result.stdout)
+    return len(counts), sum(map(int, counts))
 
 
 def run_stats(cwd: pathlib.Path) -> str:
@@ -81,8 +78,14 @@ def run_stats(cwd: pathlib.Path) -> str:
         f"  Files: {file_count}  Lines: {line_count}  Est. tokens: {est_tokens:,}"
     )
 
+    # Both database reads share one connection: the helpers' own connect()
+    # calls nest inside this one instead of each opening and closing its own.
+    db_exists = simba.db.get_db_path(cwd).exists()
+    with simba.db.connect(cwd) if db_exists else contextlib.nullcontext():
+        entries = simba.search.activity_tracker.read_activity_log(cwd)
+        pm_stats = simba.search.project_memory.get_stats(cwd) if db_exists else None
+
     # -- Activity (this session / recent) --
-    entries = simba.search.activity_tracker.read_activity_log(cwd)
     counts = _count_activities(entries)
     searches = counts.get("search", 0) + counts.get("grep", 0)
     reads = counts.get("read", 0) + counts.get("Read", 0)
@@ -107,8 +110,7 @@ def run_stats(cwd: pathlib.Path) -> str:
     )
 
     # -- Project memory --
-    if simba.db.get_db_path(cwd).exists():
-        pm_stats = simba.search.project_memory.get_stats(cwd)
+    if pm_stats is not None:
         sections.append(
             f"Project memory\n"
             f"  Sessions: {pm_stats['sessions']}  "
@@ -67,28 +67,26 @@ def _fetch_memories(
     return memories, data.get("total", 0)
 
 
-def _store_fact(
-    subject: str,
-    predicate: str,
-    obj: str,
-    proof: str,
-    *,
-    cwd: str,
-    occurred_at: str | None = None,
-) -> str:
-    """Store a fact triple into the knowledge graph (kg_edges)."""
+def _store_facts(
+    batches: dict[str | None, list[tuple[str, str, str, str]]], *, cwd: Path
+) -> tuple[int, int]:
+    """Store extracted triples into the knowledge graph (kg_edges) in one commit.
+
+    *batches* maps each ``occurred_at`` to the triples that share it.  Returns
+    ``(added, duplicate)`` counts.
+    """
     import simba.db
     import simba.kg.store
 
-    result = simba.kg.store.kg_add(
-        subject,
-        predicate,
-        obj,
-        proof,
-        project_path=simba.db.resolve_project_id(Path(cwd)),
-        occurred_at=occurred_at,
-    )
-    return "ok" if result == "added" else "duplicate"
+    project_path = simba.db.resolve_project_id(cwd)
+    total = added = 0
+    with simba.db.write_transaction():
+        for occurred_at, facts in batches.items():
+            total += len(facts)
+            added += simba.kg.store.kg_add_many(
+                facts, project_path=project_path, occurred_at=occurred_at
+            )
+    return added, total - added
 
 
 def build_extraction_prompt(
@@ -253,6 +251,8 @@ def run_extract(
 
     client = httpx.Client(base_url=daemon_url, timeout=10)
     no_fact_memories: list[dict] = []
+    # occurred_at -> triples awaiting _store_facts
+    pending: dict[str | None, list[tuple[str, str, str, str]]] = {}
 
     try:
         # Collect all new (above-watermark) memories across pages, then process
@@ -318,20 +318,20 @@ def run_extract(
                     logger.info("[dry-run] %s %s %s (proof: %s)", s, p, o, proof)
                 result.facts_extracted += len(triples)
             else:
-                for s, p, o, proof in triples:
-                    status = _store_fact(
-                        s, p, o, proof, cwd=cwd_str, occurred_at=occurred_at
-                    )
-                    if status == "ok":
-                        result.facts_extracted += 1
-                    else:
-                        result.facts_duplicate += 1
+                pending.setdefault(occurred_at, []).extend(triples)
 
             if not triples:
                 no_fact_memories.append(mem)
 
             latest_ts = created  # sorted ascending → the running high-water mark
 
+        # Store everything in one commit (not one per fact), before the
+        # watermark moves past these memories.
+        if pending:
+            added, duplicate = _store_facts(pending, cwd=cwd_path)
+            result.facts_extracted += added
+            result.facts_duplicate += duplicate
+
         # Update watermark
         if result.memories_processed > 0 and not dry_run:
             set_watermark(
@@ -7,8 +7,9 @@ import sqlite3
 
 import pytest
 
+import simba._vendor.peewee as pw
 import simba.db
-from simba.kg import kg_add, kg_invalidate, kg_query
+from simba.kg import kg_add, kg_add_many, kg_invalidate, kg_query
 from simba.kg.store import backup_and_drop_proven_facts
 
 
@@ -54,6 +55,17 @@ class TestKgAdd:
         assert rows[0]["subject_type"] == "concept"
         assert rows[0]["object_type"] == "concept"
 
+    def test_other_constraint_violations_raise(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Only the UNIQUE key is treated as "exists"; a NOT NULL project_path
+        # must not be silently swallowed.
+        monkeypatch.setattr(simba.db, "resolve_project_id", lambda cwd=None: None)
+        with pytest.raises(pw.IntegrityError):
+            kg_add("a", "rel", "b", "proof")
+        with pytest.raises(pw.IntegrityError):
+            kg_add_many([("a", "rel", "b", "proof")])
+
     def test_duplicate_returns_exists(self, monkeypatch: pytest.MonkeyPatch) -> None:
         # Dedup keys on UNIQUE(..., valid_from); freeze the clock so both adds
         # share a valid_from (otherwise a second-boundary makes the 2nd a new
@@ -431,3 +443,79 @@ class TestKgSupersede:
         kg_add("Alice", "location", "NYC", "p", project_path="proj-1")
         kg_supersede("Alice", "location", "NYC", "LA", "moved", project_path="proj-1")
         assert ops.query_audit(project_path="proj-1") == []
+
+
+class TestKgLookupSql:
+    def test_each_lookup_shape_rendered_once(self) -> None:
+        import simba.kg.store as store
+
+        store._LOOKUP_SQL.clear()
+        kg_add("a", "uses", "b", "p", project_path="proj-1")
+        kg_add("a", "owns", "c", "p", project_path="proj-2")
+
+        assert len(kg_query(subject="a")) == 2
+        assert len(kg_query(subject="a", project_path="proj-1")) == 1
+        assert [r["object"] for r in kg_query(predicate="owns")] == ["c"]
+        assert kg_query(subject="zzz", project_path="proj-1") == []
+        assert len(kg_query(subject="a", limit=1)) == 1
+        assert set(store._LOOKUP_SQL) == {
+            (True, False, False),
+            (True, False, True),
+            (False, True, False),
+        }
+
+    def test_expired_edges_excluded_from_cached_lookup(self) -> None:
+        kg_add("a", "uses", "b", "p", project_path="proj-1")
+        assert len(kg_query(subject="a", project_path="proj-1")) == 1
+        kg_invalidate("a", "uses", "b", project_path="proj-1")
+        assert kg_query(subject="a", project_path="proj-1") == []
+        assert len(kg_query(subject="a", include_expired=True)) == 1
+
+    def test_predicate_lookup_uses_index(self) -> None:
+        # Enough distinct predicates that, with real statistics, the index
+        # beats a scan.
+        kg_add_many(
+            [("a", f"rel{i}", f"b{j}", "p") for i in range(20) for j in range(5)],
+            project_path="proj-1",
+        )
+        with simba.db.get_db() as conn:
+            plan = " ".join(
+                row[3]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM kg_edges"
+                    " WHERE predicate = ? AND project_path = ?",
+                    ("rel3", "proj-1"),
+                )
+            )
+        assert "idx_kg_edges_predicate" in plan
+
+
+class TestKgAddMany:
+    def test_adds_batch_and_skips_duplicates(self) -> None:
+        kg_add("a", "uses", "b", "p", project_path="proj-1")
+        facts = [
+            ("a", "uses", "c", "p"),
+            ("d", "uses", "e", "p"),
+            ("d", "uses", "e", "p"),
+        ]
+
+        assert kg_add_many(facts, project_path="proj-1") == 2
+        rows = kg_query(predicate="uses", project_path="proj-1")
+        assert sorted((r["subject"], r["object"]) for r in rows) == [
+            ("a", "b"),
+            ("a", "c"),
+            ("d", "e"),
+        ]
+        assert {r["subject_type"] for r in rows} == {"concept"}
+
+    def test_empty_batch_adds_nothing(self) -> None:
+        assert kg_add_many([], project_path="proj-1") == 0
+
+    def test_records_shared_occurred_at(self) -> None:
+        kg_add_many(
+            [("a", "uses", "b", "p"), ("c", "uses", "d", "p")],
+            project_path="proj-1",
+            occurred_at="2025-03-01",
+        )
+        rows = kg_query(predicate="uses", project_path="proj-1")
+        assert {r["occurred_at"] for r in rows} == {"2025-03-01"}
@@ -255,3 +255,37 @@ class TestAccessTracking:
             # The response should include queryTimeMs — no error leaked.
             assert "error" not in data
             assert "queryTimeMs" in data
+
+
+class TestUpdateAccessTrackingBatch:
+    """Direct calls: one bulk read serves every id in the batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_increments_each_id(self, lance_table) -> None:
+        await lance_table.add(
+            [
+                _make_memory("mem_x", access_count=3),
+                _make_memory("mem_o'q", access_count=0),
+            ]
+        )
+
+        await simba.memory.vector_db.update_access_tracking(
+            lance_table, ["mem_x", "mem_o'q", "mem_missing"]
+        )
+
+        rows = await lance_table.query().select(["id", "accessCount"]).to_list()
+        counts = {r["id"]: r["accessCount"] for r in rows}
+        assert counts["mem_x"] == 4
+        assert counts["mem_o'q"] == 1
+        assert counts["init_0"] == 0
+
+    @pytest.mark.asyncio
+    async def test_repeated_id_counts_every_hit(self, lance_table) -> None:
+        await lance_table.add([_make_memory("mem_dup", access_count=1)])
+
+        await simba.memory.vector_db.update_access_tracking(
+            lance_table, ["mem_dup", "mem_dup"]
+        )
+
+        rows = await lance_table.query().where("id = 'mem_dup'").to_list()
+        assert rows[0]["accessCount"] == 3
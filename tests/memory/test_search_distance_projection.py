@@ -43,6 +43,11 @@ class _RecordingSearch:
     async def to_list(self) -> list[dict]:
         return []
 
+    async def to_arrow(self) -> typing.Any:
+        import pyarrow as pa
+
+        return pa.table({})
+
 
 class _FakeTable:
     def __init__(self) -> None:
@@ -65,3 +70,91 @@ async def test_find_duplicates_selects_distance() -> None:
     await vdb.find_duplicates(table, [0.0] * 4, 0.92)
     assert table.selected_columns is not None
     assert "_distance" in table.selected_columns
+
+
+@pytest.mark.asyncio
+async def test_find_duplicates_skips_system_rows(lance_table) -> None:
+    """The nearest non-SYSTEM row is found even when a SYSTEM row is closer."""
+
+    def _row(memory_id: str, type_: str, vector: list[float]) -> dict:
+        return {
+            "id": memory_id,
+            "type": type_,
+            "content": memory_id,
+            "context": "",
+            "tags": "[]",
+            "confidence": 1.0,
+            "sessionSource": "",
+            "projectPath": "",
+            "createdAt": "2025-01-01T00:00:00Z",
+            "lastAccessedAt": "2025-01-01T00:00:00Z",
+            "accessCount": 0,
+            "vector": vector,
+        }
+
+    query = [1.0] + [0.0] * 767
+    near = [1.0, 0.05] + [0.0] * 766
+    await lance_table.add(
+        [_row("sys", "SYSTEM", query), _row("gotcha", "GOTCHA", near)]
+    )
+
+    dup = await vdb.find_duplicates(lance_table, query, 0.92)
+
+    assert dup["is_duplicate"] is True
+    assert dup["existing_id"] == "gotcha"
+    assert await vdb.find_duplicates(lance_table, [0.0, 1.0] + [0.0] * 766, 0.92) == {
+        "is_duplicate": False
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_duplicates_keeps_untyped_rows(lance_table) -> None:
+    """A row with a NULL ``type`` is still a duplicate candidate."""
+    query = [1.0] + [0.0] * 767
+    await lance_table.add(
+        [
+            {
+                "id": "untyped",
+                "type": None,
+                "content": "untyped",
+                "context": "",
+                "tags": "[]",
+                "confidence": 1.0,
+                "sessionSource": "",
+                "projectPath": "",
+                "createdAt": "2025-01-01T00:00:00Z",
+                "lastAccessedAt": "2025-01-01T00:00:00Z",
+                "accessCount": 0,
+                "vector": query,
+            }
+        ]
+    )
+
+    dup = await vdb.find_duplicates(lance_table, query, 0.92)
+
+    assert dup["is_duplicate"] is True
+    assert dup["existing_id"] == "untyped"
+
+
+class _RaisingTable:
+    def __init__(self, exc: Exception) -> None:
+        self._exc = exc
+
+    def vector_search(self, *_a: typing.Any, **_k: typing.Any) -> typing.NoReturn:
+        raise self._exc
+
+
+@pytest.mark.asyncio
+async def test_lance_errors_are_soft_failures() -> None:
+    table = _RaisingTable(RuntimeError("lance error: Schema error"))
+    assert await vdb.search_memories(table, [0.0] * 4, 0.5, 5) == []
+    assert await vdb.find_duplicates(table, [0.0] * 4, 0.92) == {"is_duplicate": False}
+
+
+@pytest.mark.asyncio
+async def test_programming_errors_propagate() -> None:
+    table = _RaisingTable(TypeError("bad call"))
+    with pytest.raises(TypeError):
+        await vdb.search_memories(table, [0.0] * 4, 0.5, 5)
+    with pytest.raises(TypeError):
+        await vdb.find_duplicates(table, [0.0] * 4, 0.92)
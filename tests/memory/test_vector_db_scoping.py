@@ -33,6 +33,11 @@ class _FakeQuery:
     async def to_list(self) -> list[dict]:
         return self._rows
 
+    async def to_arrow(self) -> typing.Any:
+        import pyarrow as pa
+
+        return pa.Table.from_pylist(self._rows)
+
 
 class _FakeTable:
     """Minimal LanceDB table stand-in: no schema (skips the dim guard)."""
@@ -171,3 +176,38 @@ class TestSearchMemoriesHierarchical:
         )
         ids = {r["id"] for r in results}
         assert ids == {"api1"}
+
+
+class TestSearchMemoriesColumnarFilters:
+    """The Arrow mask keeps the per-row semantics of the old Python loop."""
+
+    @pytest.mark.asyncio
+    async def test_filters_sorts_and_truncates(self) -> None:
+        rows = [
+            _row("far", "", dist=0.6),
+            _row("near", "", dist=0.05),
+            _row("mid", "", dist=0.2),
+            {**_row("sys", "", dist=0.0), "type": "SYSTEM"},
+            {**_row("fail", "", dist=0.1), "type": "FAILURE"},
+        ]
+        results = await vdb.search_memories(
+            _FakeTable(rows),
+            [0.1] * 4,
+            min_similarity=0.5,
+            max_results=2,
+            filters={"types": ["PATTERN"]},
+        )
+        assert [r["id"] for r in results] == ["near", "mid"]
+        assert results[0]["similarity"] == 1 - 0.05
+
+    @pytest.mark.asyncio
+    async def test_null_project_path_is_global(self) -> None:
+        rows = [_row("glob", None), _row("other", "/elsewhere")]  # type: ignore[arg-type]
+        results = await vdb.search_memories(
+            _FakeTable(rows),
+            [0.1] * 4,
+            min_similarity=0.0,
+            max_results=10,
+            filters={"project_scopes": ["/repo"], "hierarchical_recall": True},
+        )
+        assert [r["id"] for r in results] == ["glob"]
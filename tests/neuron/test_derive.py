@@ -67,3 +67,26 @@ def test_derive_subprocess_error_is_fail_open(monkeypatch) -> None:
         result = run_derive("/proj", cfg=NeuronConfig(souffle_cmd="souffle"))
     assert result.errors >= 1
     assert result.candidates == []
+
+
+def test_derive_program_lives_in_facts_dir_and_is_removed(tmp_path, monkeypatch):
+    from simba.neuron.config import NeuronConfig
+    from simba.neuron.derive import run_derive
+
+    monkeypatch.setattr(
+        simba.db, "get_db_path", lambda cwd=None: tmp_path / ".simba" / "simba.db"
+    )
+    seen: dict[str, pathlib.Path] = {}
+
+    def _fake_run(cmd, **_kwargs):
+        facts_dir, program = pathlib.Path(cmd[2]), pathlib.Path(cmd[-1])
+        seen.update(facts_dir=facts_dir, program=program)
+        assert program.parent == facts_dir
+        assert "transitively_uses" in program.read_text()
+        return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+
+    with patch("subprocess.run", side_effect=_fake_run):
+        result = run_derive("/proj", cfg=NeuronConfig(souffle_cmd="souffle"))
+
+    assert result.errors == 0
+    assert not seen["facts_dir"].exists()
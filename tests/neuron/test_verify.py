@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-import subprocess
+import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
-from simba.neuron.verify import TempFileCleanup, analyze_datalog, verify_z3
+import pytest
+
+import simba.neuron.config
+import simba.neuron.verify
+from simba.neuron.verify import analyze_datalog, verify_z3
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 # ---------------------------------------------------------------------------
 # verify_z3 tests
@@ -14,79 +22,174 @@ from simba.neuron.verify import TempFileCleanup, analyze_datalog, verify_z3
 
 
 class TestVerifyZ3:
-    """Tests for the verify_z3 function."""
+    """Tests for the verify_z3 function (runs the real Z3 worker)."""
 
-    @patch("simba.neuron.verify.subprocess.run")
-    @patch("simba.neuron.verify.simba.neuron.config.CONFIG")
-    def test_proven_result(self, mock_config: MagicMock, mock_run: MagicMock) -> None:
+    @pytest.fixture(autouse=True)
+    def _worker(self) -> Iterator[None]:
+        pytest.importorskip("z3")
+        yield
+        simba.neuron.verify._z3_worker.close()
+
+    def test_proven_result(self) -> None:
         """verify_z3 returns execution result when script prints PROVEN."""
-        mock_config.python_cmd = "python3"
-        mock_run.return_value = MagicMock(
-            stdout="PROVEN\n",
-            stderr="",
-            returncode=0,
+        result = verify_z3(
+            "x = Int('x')\n"
+            "s = Solver()\n"
+            "s.add(x + 1 != 1 + x)\n"
+            "print('PROVEN' if s.check() == unsat else 'COUNTEREXAMPLE')"
         )
 
-        result = verify_z3("s = Solver(); print('PROVEN')")
+        assert result == "Execution Result:\nPROVEN\n"
 
-        assert "Execution Result:" in result
-        assert "PROVEN" in result
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args
-        assert call_args.kwargs["capture_output"] is True
-        assert call_args.kwargs["text"] is True
-        assert call_args.kwargs["timeout"] == 30
-
-    @patch("simba.neuron.verify.subprocess.run")
-    @patch("simba.neuron.verify.simba.neuron.config.CONFIG")
-    def test_counterexample_result(
-        self, mock_config: MagicMock, mock_run: MagicMock
-    ) -> None:
+    def test_counterexample_result(self) -> None:
         """verify_z3 returns execution result when script prints COUNTEREXAMPLE."""
-        mock_config.python_cmd = "python3"
-        mock_run.return_value = MagicMock(
-            stdout="COUNTEREXAMPLE\nx = 42\n",
-            stderr="",
-            returncode=0,
+        result = verify_z3(
+            "x = Int('x')\n"
+            "s = Solver()\n"
+            "s.add(x * 2 == 84)\n"
+            "s.check()\n"
+            "print('COUNTEREXAMPLE')\n"
+            "print('x =', s.model()[x])"
         )
 
-        result = verify_z3("s = Solver(); print('COUNTEREXAMPLE')")
-
         assert "Execution Result:" in result
         assert "COUNTEREXAMPLE" in result
         assert "x = 42" in result
 
-    @patch("simba.neuron.verify.subprocess.run")
-    @patch("simba.neuron.verify.simba.neuron.config.CONFIG")
-    def test_timeout(self, mock_config: MagicMock, mock_run: MagicMock) -> None:
-        """verify_z3 returns timeout error when subprocess exceeds time limit."""
-        mock_config.python_cmd = "python3"
-        mock_run.side_effect = subprocess.TimeoutExpired(
-            cmd=["python3", "/tmp/test.py"], timeout=30
-        )
+    def test_worker_reused_with_fresh_namespace(self) -> None:
+        """Scripts share one worker process but not each other's globals."""
+        verify_z3("leaked = 1")
+        pid = simba.neuron.verify._z3_worker._proc.pid
+
+        result = verify_z3("print('leaked' in globals())")
+
+        assert result == "Execution Result:\nFalse\n"
+        assert simba.neuron.verify._z3_worker._proc.pid == pid
+
+    def test_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """verify_z3 kills an overrunning script and recovers on the next call."""
+        monkeypatch.setattr(simba.neuron.verify, "_Z3_TIMEOUT", 0.5)
 
         result = verify_z3("import time; time.sleep(999)")
 
         assert "timed out" in result
-        assert "30s" in result
+        assert "0.5s" in result
+        # Recovery respawns the worker and re-imports z3: give it the normal
+        # limit rather than the deliberately short one.
+        monkeypatch.undo()
+        assert verify_z3("print('PROVEN')") == "Execution Result:\nPROVEN\n"
+
+    def test_fd_level_output_is_captured(self) -> None:
+        """Writes that bypass sys.stdout are output, not protocol replies."""
+        result = verify_z3("import os; os.write(1, b'raw\\n'); print('PROVEN')")
+
+        assert result == "Execution Result:\nraw\nPROVEN\n"
+        assert verify_z3("print('next')") == "Execution Result:\nnext\n"
+
+    def test_garbled_reply_discards_worker(self) -> None:
+        """A reply that is not JSON never leaves the worker out of step."""
+        result = verify_z3("import os, sys; os.write(int(sys.argv[1]), b'junk\\n')")
+
+        assert result.startswith("Logic Execution Failed:")
+        assert simba.neuron.verify._z3_worker._proc is None
+        assert verify_z3("print('PROVEN')") == "Execution Result:\nPROVEN\n"
+
+    def test_global_state_reset_between_scripts(self) -> None:
+        """Builtins, imported modules and z3 params do not leak across scripts."""
+        verify_z3(
+            "import builtins, colorsys\n"
+            "builtins.leaked = 1\n"
+            "set_param('smt.random_seed', 7)"
+        )
 
-    @patch("simba.neuron.verify.subprocess.run")
-    @patch("simba.neuron.verify.simba.neuron.config.CONFIG")
-    def test_runtime_error(self, mock_config: MagicMock, mock_run: MagicMock) -> None:
-        """verify_z3 returns script error when subprocess exits with non-zero code."""
-        mock_config.python_cmd = "python3"
-        mock_run.return_value = MagicMock(
-            stdout="",
-            stderr="NameError: name 'foo' is not defined\n",
-            returncode=1,
+        result = verify_z3(
+            "import builtins, sys\n"
+            "print(hasattr(builtins, 'leaked'), 'colorsys' in sys.modules)\n"
+            "print(get_param('smt.random_seed'))"
+        )
+
+        assert result == "Execution Result:\nFalse False\n0\n"
+
+    def test_process_state_reset_between_scripts(self, tmp_path) -> None:
+        """cwd, environ, sys.path, recursion limit and z3 patches do not leak."""
+        verify_z3(
+            "import os, sys, z3\n"
+            f"os.chdir({str(tmp_path)!r})\n"
+            "os.environ['SIMBA_LEAKED'] = '1'\n"
+            "sys.path.append('/leaked')\n"
+            "sys.setrecursionlimit(50)\n"
+            "z3.Solver = None\n"
+            "z3.z3.Solver = None"
+        )
+
+        result = verify_z3(
+            "import os, sys, z3\n"
+            f"print(os.getcwd() == {str(tmp_path)!r}, 'SIMBA_LEAKED' in os.environ)\n"
+            "print('/leaked' in sys.path, sys.getrecursionlimit() == 50)\n"
+            "print(z3.Solver is None, z3.z3.Solver is None)"
+        )
+
+        assert result == "Execution Result:\nFalse False\nFalse False\nFalse False\n"
+
+    def test_reading_stdin_does_not_consume_requests(self) -> None:
+        """fd 0 is /dev/null for scripts, not the worker's request pipe."""
+        assert verify_z3("import os; print(os.read(0, 100))") == (
+            "Execution Result:\nb''\n"
         )
+        assert verify_z3("print('next')") == "Execution Result:\nnext\n"
 
+    def test_waiting_for_busy_worker_times_out(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A caller queued behind a running script waits at most the limit."""
+        monkeypatch.setattr(simba.neuron.verify, "_Z3_TIMEOUT", 0.2)
+        simba.neuron.verify._z3_worker._lock.acquire()
+        try:
+            result = verify_z3("print('PROVEN')")
+        finally:
+            simba.neuron.verify._z3_worker._lock.release()
+
+        assert result == "Error: Z3 verification timed out (limit: 0.2s)."
+
+    def test_runtime_error(self) -> None:
+        """verify_z3 returns script error when the script raises."""
         result = verify_z3("foo")
 
         assert "Script Error" in result
         assert "Exit Code 1" in result
         assert "NameError" in result
 
+    def test_exit_code_preserved(self) -> None:
+        """sys.exit(n) reports exit code n without killing the worker."""
+        assert verify_z3("import sys; sys.exit(3)").startswith(
+            "Script Error (Exit Code 3)"
+        )
+        assert verify_z3("print('ok')") == "Execution Result:\nok\n"
+
+    @patch("simba.neuron.verify.simba.neuron.config.CONFIG")
+    def test_worker_start_failure(self, mock_config: MagicMock) -> None:
+        """A worker that cannot start is reported, not raised."""
+        simba.neuron.verify._z3_worker.close()
+        mock_config.python_cmd = "/nonexistent/python"
+
+        assert verify_z3("print(1)").startswith("Logic Execution Failed:")
+
+    def test_worker_startup_error_reported(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A worker that dies while starting up shows its traceback."""
+        simba.neuron.verify._z3_worker.close()
+        monkeypatch.setattr(
+            simba.neuron.verify,
+            "_Z3_WORKER_SCRIPT",
+            "import simba_no_such_module\n" + simba.neuron.verify._Z3_WORKER_SCRIPT,
+        )
+
+        result = verify_z3("print(1)")
+
+        assert "Z3 worker exited before replying." in result
+        assert "ModuleNotFoundError" in result
+
 
 # ---------------------------------------------------------------------------
 # analyze_datalog tests
@@ -101,11 +204,17 @@ class TestAnalyzeDatalog:
     def test_success(self, mock_config: MagicMock, mock_run: MagicMock) -> None:
         """analyze_datalog returns analysis output on successful execution."""
         mock_config.souffle_cmd = "/usr/bin/souffle"
-        mock_run.return_value = MagicMock(
-            stdout="edge(1,2)\nedge(2,3)\n",
-            stderr="",
-            returncode=0,
-        )
+        programs: list[str] = []
+
+        def _run(cmd: list[str], **kwargs: object) -> MagicMock:
+            programs.append(Path(cmd[-1]).read_text())
+            return MagicMock(
+                stdout=b"edge(1,2)\nedge(2,3)\n",
+                stderr=b"",
+                returncode=0,
+            )
+
+        mock_run.side_effect = _run
 
         result = analyze_datalog(".decl edge(a:number, b:number)\n", facts_dir="/tmp")
 
@@ -119,6 +228,31 @@ class TestAnalyzeDatalog:
         assert "/tmp" in cmd
         assert "-D" in cmd
         assert "-" in cmd
+        assert programs == [".decl edge(a:number, b:number)\n"]
+        assert not Path(cmd[-1]).exists()
+        assert "input" not in call_args.kwargs
+        assert "text" not in call_args.kwargs
+
+    @pytest.mark.skipif(shutil.which("souffle") is None, reason="needs souffle")
+    def test_real_souffle(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """analyze_datalog evaluates a program against real facts with souffle."""
+        monkeypatch.setattr(
+            simba.neuron.config.CONFIG, "souffle_cmd", shutil.which("souffle")
+        )
+        (tmp_path / "edge.facts").write_text("1\t2\n2\t3\n")
+
+        result = analyze_datalog(
+            ".decl edge(a:number, b:number)\n.input edge\n"
+            ".decl path(a:number, b:number)\n.output path\n"
+            "path(a, b) :- edge(a, b).\n"
+            "path(a, c) :- path(a, b), edge(b, c).\n",
+            facts_dir=str(tmp_path),
+        )
+
+        assert result.startswith("Analysis Output:")
+        assert "1\t3" in result
 
     @patch("simba.neuron.verify.simba.neuron.config.CONFIG")
     def test_souffle_not_found(self, mock_config: MagicMock) -> None:
@@ -137,8 +271,8 @@ class TestAnalyzeDatalog:
         """analyze_datalog returns error output when souffle reports an error."""
         mock_config.souffle_cmd = "/usr/bin/souffle"
         mock_run.return_value = MagicMock(
-            stdout="",
-            stderr="Error: syntax error at line 1\n",
+            stdout=b"",
+            stderr=b"Error: syntax error at line 1\n",
             returncode=1,
         )
 
@@ -146,42 +280,3 @@ class TestAnalyzeDatalog:
 
         assert "Souffle Logic Error:" in result
         assert "syntax error" in result
-
-
-# ---------------------------------------------------------------------------
-# TempFileCleanup tests
-# ---------------------------------------------------------------------------
-
-
-class TestTempFileCleanup:
-    """Tests for the TempFileCleanup context manager."""
-
-    def test_creates_and_cleans_up_file(self, tmp_path: Path) -> None:
-        """TempFileCleanup deletes the file on context exit."""
-        temp_file = tmp_path / "test_cleanup.txt"
-        temp_file.write_text("temporary content")
-        assert temp_file.exists()
-
-        with TempFileCleanup(temp_file) as path:
-            assert path == temp_file
-            assert path.exists()
-
-        assert not temp_file.exists()
-
-    def test_no_error_if_file_missing(self, tmp_path: Path) -> None:
-        """TempFileCleanup does not raise if file was already deleted."""
-        nonexistent = tmp_path / "does_not_exist.txt"
-
-        with TempFileCleanup(nonexistent) as path:
-            assert path == nonexistent
-
-        # Should not raise -- file never existed
-        assert not nonexistent.exists()
-
-    def test_returns_path_object(self, tmp_path: Path) -> None:
-        """TempFileCleanup __enter__ returns a Path instance."""
-        temp_file = tmp_path / "pathcheck.txt"
-        temp_file.write_text("check")
-
-        with TempFileCleanup(str(temp_file)) as path:
-            assert isinstance(path, Path)
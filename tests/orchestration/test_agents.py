@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import os
 import pathlib
+import subprocess
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -28,6 +31,12 @@ def _isolate_agent_db(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
     import simba.orchestration.agents as _mod
 
     monkeypatch.setattr(_mod, "_agent_logger", None)
+    monkeypatch.setattr(_mod, "_LIVE_PROCS", {})
+    yield
+    # Drain the background log writer while the temp DB is still patched in.
+    if _mod._agent_logger is not None:
+        for handler in _mod._agent_logger.handlers:
+            handler.close()
 
 
 # ---- 1. get_db creates agent schema ----------------------------------------
@@ -65,6 +74,18 @@ class TestGetAgentDb:
         for level in simba.orchestration.config.LogLevel:
             assert level.name.lower() in names
 
+    def test_active_runs_scan_uses_covering_index(self):
+        import simba.orchestration.agents as _mod
+
+        query = _mod.AgentRun.select(*_mod._STATUS_CHECK_FIELDS).where(
+            _mod.pw.SQL(_mod._ACTIVE_RUNS_WHERE)
+        )
+        sql, params = query.sql()
+        with simba.db.get_db() as conn:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+
+        assert "COVERING INDEX idx_active_runs" in plan[0][3]
+
     def test_idempotent(self):
         """Opening the DB twice must not raise or duplicate rows."""
         with simba.db.get_db() as conn1:
@@ -138,6 +159,29 @@ class TestAgentStatusUpdate:
         assert row is not None
         assert row[0] == "something broke"
 
+    def test_non_terminal_update_keeps_error_and_completion(self):
+        """Only terminal states touch error/completed_at_utc."""
+        self._insert_run("tkt-keep")
+        agent_status_update("tkt-keep", "failed", message="boom")
+        agent_status_update("tkt-keep", "running")
+
+        with simba.db.get_db() as conn:
+            row = conn.execute(
+                "SELECT status_id, error, completed_at_utc FROM agent_runs"
+                " WHERE ticket_id=?",
+                ("tkt-keep",),
+            ).fetchone()
+        assert row[0] == simba.orchestration.config.Status.RUNNING
+        assert row[1] == "boom"
+        assert row[2] is not None
+
+        agent_status_update("tkt-keep", "completed", message="ignored")
+        with simba.db.get_db() as conn:
+            row = conn.execute(
+                "SELECT error FROM agent_runs WHERE ticket_id=?", ("tkt-keep",)
+            ).fetchone()
+        assert row[0] is None
+
     def test_invalid_status_returns_error(self):
         """An invalid status string should return an error message."""
         result = agent_status_update("tkt-x", "bogus_status")
@@ -204,28 +248,27 @@ class TestCheckProcessAlive:
         assert _check_process_alive(None) == (False, False)
 
     def test_alive_process(self):
-        """When os.kill succeeds and ps reports a normal status, alive=True."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "S"
-
+        """A running state letter in /proc/<pid>/stat means alive."""
         with (
-            patch("simba.orchestration.agents.os.kill") as mock_kill,
+            patch("simba.orchestration.agents._PROCFS", True),
             patch(
-                "simba.orchestration.agents.subprocess.run",
-                return_value=mock_result,
+                "simba.orchestration.agents._read_proc_stat",
+                return_value=b"42 (claude) S 1 42 42 0 -1",
             ),
         ):
-            mock_kill.return_value = None  # signal 0 success
             is_alive, is_zombie = _check_process_alive(42)
 
         assert is_alive is True
         assert is_zombie is False
 
     def test_dead_process(self):
-        """When os.kill raises ProcessLookupError, process is dead."""
-        with patch(
-            "simba.orchestration.agents.os.kill", side_effect=ProcessLookupError
+        """No /proc/<pid> entry means the process is gone."""
+        with (
+            patch("simba.orchestration.agents._PROCFS", True),
+            patch(
+                "simba.orchestration.agents._read_proc_stat",
+                side_effect=FileNotFoundError,
+            ),
         ):
             is_alive, is_zombie = _check_process_alive(42)
 
@@ -233,24 +276,37 @@ class TestCheckProcessAlive:
         assert is_zombie is False
 
     def test_zombie_process(self):
-        """When ps reports 'Z+' status, report as zombie."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Z+"
-
+        """State 'Z' is a zombie, even when comm contains spaces and parens."""
         with (
-            patch("simba.orchestration.agents.os.kill") as mock_kill,
+            patch("simba.orchestration.agents._PROCFS", True),
             patch(
-                "simba.orchestration.agents.subprocess.run",
-                return_value=mock_result,
+                "simba.orchestration.agents._read_proc_stat",
+                return_value=b"42 (a) Z (b) Z 1 42 42 0 -1",
             ),
         ):
-            mock_kill.return_value = None
             is_alive, is_zombie = _check_process_alive(42)
 
         assert is_alive is False
         assert is_zombie is True
 
+    def test_real_processes(self):
+        """End to end against this process and a reaped child."""
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        child.wait()
+
+        assert _check_process_alive(os.getpid()) == (True, False)
+        assert _check_process_alive(child.pid) == (False, False)
+
+    def test_without_procfs_falls_back_to_kill(self):
+        """Without /proc, liveness comes from kill(pid, 0)."""
+        with (
+            patch("simba.orchestration.agents._PROCFS", False),
+            patch("simba.orchestration.agents.os.kill") as mock_kill,
+        ):
+            assert _check_process_alive(42) == (True, False)
+            mock_kill.side_effect = ProcessLookupError
+            assert _check_process_alive(42) == (False, False)
+
 
 # ---- 6. dispatch_agent with mocked subprocess.Popen ------------------------
 
@@ -282,6 +338,26 @@ class TestDispatchAgent:
         assert row[1] == 54321
         assert row[2] == simba.orchestration.config.Status.STARTED
 
+    def test_dispatch_log_committed_with_run(self):
+        """The agent_dispatched log row lands in the same commit as the run."""
+        mock_proc = MagicMock()
+        mock_proc.pid = 22222
+
+        with patch(
+            "simba.orchestration.agents.subprocess.Popen", return_value=mock_proc
+        ):
+            dispatch_agent("analyst", "tkt-d3", "Do analysis")
+
+        with simba.db.get_db() as conn:
+            row = conn.execute(
+                "SELECT event, func, data FROM agent_logs WHERE ticket_id=?",
+                ("tkt-d3",),
+            ).fetchone()
+
+        assert row[0] == "agent_dispatched"
+        assert row[1] == "dispatch_agent"
+        assert '"pid":22222' in row[2]
+
     def test_popen_called_with_correct_args(self, tmp_path: pathlib.Path):
         """Verify subprocess.Popen is invoked with expected command structure."""
         mock_proc = MagicMock()
@@ -311,3 +387,294 @@ class TestDispatchAgent:
         """Sanity-check that VALID_AGENTS is a non-empty list of strings."""
         assert len(VALID_AGENTS) > 0
         assert all(isinstance(a, str) for a in VALID_AGENTS)
+
+
+# ---- 7b. agent_status_check polls children dispatched in-process ----------
+
+
+class TestLiveProcs:
+    def _dispatch(self, proc: MagicMock, ticket_id: str = "tkt-p1") -> None:
+        with patch("simba.orchestration.agents.subprocess.Popen", return_value=proc):
+            dispatch_agent("analyst", ticket_id, "Do analysis")
+
+    def test_dispatch_keeps_popen_on_vfork_path(self):
+        proc = MagicMock(pid=33333)
+        with patch(
+            "simba.orchestration.agents.subprocess.Popen", return_value=proc
+        ) as popen:
+            dispatch_agent("analyst", "tkt-p1", "Do analysis")
+
+        kwargs = popen.call_args.kwargs
+        assert kwargs.get("preexec_fn") is None
+        assert kwargs["start_new_session"] is True
+
+    def test_running_child_polled_without_proc_check(self):
+        proc = MagicMock(pid=33333)
+        proc.poll.return_value = None
+        self._dispatch(proc)
+
+        with patch("simba.orchestration.agents._check_process_alive") as check:
+            out = agent_status_check("tkt-p1")
+
+        check.assert_not_called()
+        assert "started" in out
+
+    def test_exited_child_is_captured_and_forgotten(self):
+        import simba.orchestration.agents as _mod
+
+        proc = MagicMock(pid=33333)
+        proc.poll.return_value = 0
+        self._dispatch(proc)
+
+        out = agent_status_check("tkt-p1")
+
+        assert "completed" in out
+        assert "tkt-p1" not in _mod._LIVE_PROCS
+
+    def test_output_files_removed_once_result_stored(self, tmp_path):
+        proc = MagicMock(pid=33333)
+        proc.poll.return_value = 0
+        self._dispatch(proc)
+        logs_dir = tmp_path / ".simba" / "orchestration" / "logs"
+        (logs_dir / "tkt-p1.stdout").write_text(
+            '{"type": "result", "result": "all done"}\n'
+        )
+
+        agent_status_check("tkt-p1")
+
+        assert list(logs_dir.iterdir()) == []
+        with simba.db.get_db() as conn:
+            row = conn.execute(
+                "SELECT stdout, result FROM agent_runs WHERE ticket_id = ?",
+                ("tkt-p1",),
+            ).fetchone()
+        assert row[0] is None
+        assert row[1] == "all done"
+
+    def test_exited_children_stored_in_one_transaction(self):
+        for i, ticket_id in enumerate(("tkt-p1", "tkt-p2")):
+            proc = MagicMock(pid=40000 + i)
+            proc.poll.return_value = 0
+            self._dispatch(proc, ticket_id)
+
+        real = simba.db.write_transaction
+        calls: list[object] = []
+
+        def _counting(*args, **kwargs):
+            calls.append(args)
+            return real(*args, **kwargs)
+
+        with patch.object(simba.db, "write_transaction", _counting):
+            out = agent_status_check()
+
+        assert len(calls) == 1
+        assert out.count("completed") == 2
+        with simba.db.get_db() as conn:
+            done = conn.execute(
+                "SELECT count(*) FROM agent_runs WHERE status_id = ?",
+                (simba.orchestration.config.Status.COMPLETED,),
+            ).fetchone()[0]
+        assert done == 2
+
+    def test_exited_children_detected_with_one_directory_scan(self):
+        import simba.orchestration.agents as _mod
+
+        for i, ticket_id in enumerate(("tkt-p1", "tkt-p2")):
+            proc = MagicMock(pid=40000 + i)
+            proc.poll.return_value = 0
+            self._dispatch(proc, ticket_id)
+        (_mod._logs_dir() / "tkt-p2.stdout").unlink()
+        (_mod._logs_dir() / "tkt-p2.stderr").unlink()
+
+        with patch.object(_mod.os, "scandir", wraps=os.scandir) as scandir:
+            out = agent_status_check()
+
+        assert scandir.call_count == 1
+        assert "40000): completed" in out
+        assert "40001): finished (no output files)" in out
+
+
+class TestChildReaper:
+    @pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="needs pidfd_open")
+    def test_watched_child_is_reaped(self):
+        import time
+
+        import simba.orchestration.agents as _mod
+
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        _mod._watch_child(child)
+
+        deadline = time.monotonic() + 10
+        while child.returncode is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert child.returncode == 0
+        assert not pathlib.Path(f"/proc/{child.pid}").exists()
+
+    def test_sigchld_handler_skipped_with_pidfd(self):
+        import simba.orchestration.agents as _mod
+
+        with (
+            patch.object(_mod, "_HAVE_PIDFD", True),
+            patch("simba.orchestration.agents.signal.signal") as install,
+        ):
+            _mod.register_sigchld_handler()
+        install.assert_not_called()
+
+
+# ---- 8. SQLiteLogHandler batches writes on a background thread -------------
+
+
+class TestSQLiteLogHandler:
+    def test_flush_writes_queued_records(self):
+        import simba.orchestration.agents as _mod
+
+        logger = _mod._get_logger()
+        assert logger is not None
+        for i in range(3):
+            logger.info(
+                "Status updated",
+                extra={"ticket_id": f"tkt-l{i}", "event": "status_changed"},
+            )
+        logger.handlers[0].flush()
+
+        with simba.db.get_db() as conn:
+            rows = conn.execute(
+                "SELECT ticket_id, event, data FROM agent_logs ORDER BY id"
+            ).fetchall()
+        assert [tuple(r) for r in rows] == [
+            (f"tkt-l{i}", "status_changed", "{}") for i in range(3)
+        ]
+
+    def test_level_and_timestamp_taken_from_record(self):
+        import simba.orchestration.agents as _mod
+
+        logger = _mod._get_logger()
+        assert logger is not None
+        logger.critical("boom", extra={"event": "error"})
+        logger.handlers[0].flush()
+
+        with simba.db.get_db() as conn:
+            level_id, ts = conn.execute(
+                "SELECT level_id, timestamp_utc FROM agent_logs"
+            ).fetchone()
+        assert level_id == simba.orchestration.config.LogLevel.ERROR
+        assert abs(ts - simba.orchestration.config.utc_now()) <= 1
+
+    def test_debug_records_dropped_by_default(self, monkeypatch):
+        import simba.orchestration.agents as _mod
+
+        monkeypatch.delenv("SIMBA_LOG_LEVEL", raising=False)
+        logger = _mod._setup_logger()
+        logger.debug("Zombie process reaped", extra={"event": "zombie_reaped"})
+        logger.info("Status updated", extra={"event": "status_changed"})
+        logger.handlers[0].flush()
+
+        with simba.db.get_db() as conn:
+            events = [r[0] for r in conn.execute("SELECT event FROM agent_logs")]
+        assert events == ["status_changed"]
+        logger.handlers[0].close()
+
+    def test_debug_records_kept_when_enabled(self, monkeypatch):
+        import simba.orchestration.agents as _mod
+
+        monkeypatch.setenv("SIMBA_LOG_LEVEL", "debug")
+        logger = _mod._setup_logger()
+        logger.debug("Zombie process reaped", extra={"event": "zombie_reaped"})
+        logger.handlers[0].flush()
+
+        with simba.db.get_db() as conn:
+            events = [r[0] for r in conn.execute("SELECT event FROM agent_logs")]
+        assert events == ["zombie_reaped"]
+        logger.handlers[0].close()
+
+    def test_close_drains_and_stops_writer(self):
+        import simba.orchestration.agents as _mod
+
+        handler = _mod.SQLiteLogHandler()
+        logger = _mod.logging.getLogger("test.agents.close")
+        logger.addHandler(handler)
+        try:
+            logger.warning("bye", extra={"event": "shutdown"})
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        assert not handler._thread.is_alive()
+        with simba.db.get_db() as conn:
+            row = conn.execute("SELECT event FROM agent_logs").fetchone()
+        assert row[0] == "shutdown"
+
+
+# ---- 9. _extract_result parses Claude's stream-json output -----------------
+
+
+class TestExtractResult:
+    def test_stream_json_picks_result_event(self):
+        from simba.orchestration.agents import _extract_result
+
+        stdout = (
+            '{"type": "system", "subtype": "init"}\n'
+            '{"type": "assistant", "message": {"result": "not this"}}\n'
+            '{"type": "result", "result": "final answer"}\n'
+        )
+        assert _extract_result(stdout, "", "stream-json") == "final answer"
+
+    def test_stream_json_skips_garbage_tail(self):
+        from simba.orchestration.agents import _extract_result
+
+        stdout = '{"type": "result", "result": "ok"}\n\n{"result": truncated'
+        assert _extract_result(stdout, "", "stream-json") == "ok"
+
+    def test_stream_json_without_result_returns_raw(self):
+        from simba.orchestration.agents import _extract_result
+
+        stdout = '{"type": "system"}\n'
+        assert _extract_result(stdout, "", "stream-json") == '{"type": "system"}'
+
+    def test_stream_json_compact_fast_path(self):
+        from simba.orchestration.agents import _extract_result
+
+        stdout = (
+            '{"type":"assistant","text":"{\\"type\\":\\"result\\""}\n'
+            '{"type":"result","subtype":"success","result":"done"}\n'
+            "trailing noise\n"
+        )
+        assert _extract_result(stdout, "", "stream-json") == "done"
+
+    def test_stream_json_marker_mid_line_is_not_trusted(self):
+        from simba.orchestration.agents import _stream_json_result
+
+        buf = b'{"type":"result","result":"real"}\nx {"type":"result" broken\n'
+        assert _stream_json_result(buf) == "real"
+
+    def test_lines_reversed(self):
+        from simba.orchestration.agents import _iter_lines_reversed
+
+        assert list(_iter_lines_reversed("a\nb\n\nc")) == ["c", "", "b", "a"]
+        assert list(_iter_lines_reversed("")) == []
+
+
+class TestReadOutputFiles:
+    def test_safe_read_file(self, tmp_path):
+        from simba.orchestration.agents import _safe_read_file
+
+        path = tmp_path / "out"
+        assert _safe_read_file(path) == ""
+        path.write_bytes(b"")
+        assert _safe_read_file(path) == ""
+        path.write_bytes(b"ok \xff done")
+        assert _safe_read_file(path) == "ok � done"
+
+    def test_stream_json_result_read_from_tail(self, tmp_path):
+        from simba.orchestration.agents import _read_stream_json_result
+
+        path = tmp_path / "out"
+        path.write_bytes(
+            b'{"type": "assistant", "text": "\xff"}\n'
+            b'{"type": "result", "result": "caf\xc3\xa9"}\n'
+        )
+        assert _read_stream_json_result(path) == "café"
+        path.write_bytes(b'{"type": "system"}\n')
+        assert _read_stream_json_result(path) is None
+        assert _read_stream_json_result(tmp_path / "missing") is None
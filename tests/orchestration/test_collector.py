@@ -0,0 +1,165 @@
+"""Tests for simba.orchestration.collector — batched status reports."""
+
+from __future__ import annotations
+
+import pathlib
+import socket
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+import simba.db
+import simba.orchestration.agents
+import simba.orchestration.collector as collector
+import simba.orchestration.config
+
+
+@pytest.fixture(autouse=True)
+def _isolate(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """Temp DB, and run from tmp_path (no repo) so the socket lands there."""
+    db_path = tmp_path / ".simba" / "simba.db"
+    monkeypatch.setattr(simba.db, "get_db_path", lambda cwd=None: db_path)
+    monkeypatch.chdir(tmp_path)
+
+
+def _insert_run(ticket_id: str) -> None:
+    with simba.db.get_db() as conn:
+        conn.execute(
+            "INSERT INTO agent_runs (ticket_id, agent, status_id, created_at_utc)"
+            " VALUES (?, ?, ?, ?)",
+            (
+                ticket_id,
+                "analyst",
+                simba.orchestration.config.Status.PENDING,
+                simba.orchestration.config.utc_now(),
+            ),
+        )
+        conn.commit()
+
+
+def _row(ticket_id: str) -> tuple:
+    with simba.db.get_db() as conn:
+        return tuple(
+            conn.execute(
+                "SELECT status_id, error FROM agent_runs WHERE ticket_id = ?",
+                (ticket_id,),
+            ).fetchone()
+        )
+
+
+def test_report_round_trip():
+    data = collector.encode_report("tkt-1", "failed", "a\x1fb")
+    assert collector.decode_report(data) == ("tkt-1", "failed", "a\x1fb")
+    assert collector.decode_report(b"no separators") is None
+
+
+def test_send_without_collector_returns_false(caplog: pytest.LogCaptureFixture):
+    assert collector.send_status("tkt-1", "running") is False
+    assert not caplog.records
+
+
+def test_reports_in_one_window_share_a_transaction():
+    for ticket in ("tkt-a", "tkt-b"):
+        _insert_run(ticket)
+    batches: list[list[tuple[str, str, str]]] = []
+    real = simba.orchestration.agents.apply_status_reports
+
+    def _spy(reports):
+        batches.append(list(reports))
+        real(reports)
+
+    col = collector.StatusCollector()
+    with patch.object(simba.orchestration.agents, "apply_status_reports", _spy):
+        assert col.start() is True
+        assert collector.send_status("tkt-a", "running")
+        assert collector.send_status("tkt-b", "failed", "boom")
+        assert collector.send_status("tkt-a", "completed")
+        col.close()
+
+    assert batches == [
+        [
+            ("tkt-a", "running", ""),
+            ("tkt-b", "failed", "boom"),
+            ("tkt-a", "completed", ""),
+        ]
+    ]
+    assert _row("tkt-a")[0] == simba.orchestration.config.Status.COMPLETED
+    assert _row("tkt-b") == (simba.orchestration.config.Status.FAILED, "boom")
+    assert not collector.status_socket_path().exists()
+
+
+def test_socket_found_from_repo_subdirectory(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    (tmp_path / ".git").mkdir()
+    subdir = tmp_path / "pkg" / "sub"
+    subdir.mkdir(parents=True)
+    _insert_run("tkt-sub")
+    col = collector.StatusCollector()
+    assert col.path == tmp_path.resolve() / ".claude" / "status.sock"
+    assert col.start() is True
+    try:
+        monkeypatch.chdir(subdir)
+        assert collector.status_socket_path() == col.path
+        assert collector.send_status("tkt-sub", "running") is True
+    finally:
+        col.close()
+
+    assert _row("tkt-sub")[0] == simba.orchestration.config.Status.RUNNING
+
+
+def test_stale_socket_is_replaced(caplog: pytest.LogCaptureFixture):
+    path = collector.status_socket_path()
+    path.parent.mkdir()
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stale.bind(str(path))
+    stale.close()
+    assert collector.send_status("tkt-1", "running") is False
+    assert "Status report for tkt-1 not delivered" in caplog.text
+
+    col = collector.StatusCollector()
+    try:
+        assert col.start() is True
+        assert collector.send_status("tkt-1", "running") is True
+    finally:
+        col.close()
+
+
+def test_second_collector_defers_to_live_one():
+    first = collector.StatusCollector()
+    second = collector.StatusCollector()
+    try:
+        assert first.start() is True
+        assert second.start() is False
+    finally:
+        second.close()
+        first.close()
+
+
+def test_status_cli_with_collector_skips_database(
+    tmp_path: pathlib.Path, request: pytest.FixtureRequest
+):
+    _insert_run("tkt-x")
+    col = collector.StatusCollector()
+    assert col.start() is True
+    code = (
+        "import os, sys, simba.orchestration.__main__ as m; "
+        f"os.chdir({str(tmp_path)!r}); "
+        "m.main(['status', 'tkt-x', 'running']); "
+        "print('simba.db' in sys.modules)"
+    )
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=request.config.rootpath,
+        )
+    finally:
+        col.close()
+
+    assert proc.stdout.splitlines() == ["tkt-x -> running", "False"]
+    assert _row("tkt-x")[0] == simba.orchestration.config.Status.RUNNING
@@ -0,0 +1,402 @@
+"""Tests for simba.orchestration.__main__ — the orchestration CLI."""
+
+from __future__ import annotations
+
+import hashlib
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import simba.db
+import simba.orchestration.__main__ as cli
+import simba.orchestration.collector
+import simba.orchestration.config
+import simba.orchestration.templates
+
+
+@pytest.fixture(autouse=True)
+def _isolate_db(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """Point simba.db.get_db_path at a temp directory for every test."""
+    db_path = tmp_path / ".simba" / "simba.db"
+    monkeypatch.setattr(simba.db, "get_db_path", lambda cwd=None: db_path)
+
+    import simba.orchestration.agents as _mod
+
+    monkeypatch.setattr(_mod, "_agent_logger", None)
+    yield
+    # Drain the background log writer while the temp DB is still patched in.
+    if _mod._agent_logger is not None:
+        for handler in _mod._agent_logger.handlers:
+            handler.close()
+
+
+def _no_collector(*_args) -> bool:
+    return False
+
+
+def test_module_import_is_lazy():
+    """Importing the CLI must not pull in the per-command subsystem modules."""
+    code = (
+        "import sys, simba.orchestration.__main__; "
+        "print(sorted(m for m in sys.modules if m.startswith('simba.orchestration')))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = proc.stdout.strip()
+    assert loaded == "['simba.orchestration', 'simba.orchestration.__main__']"
+
+
+def test_status_command_skips_unrelated_subsystems(tmp_path: pathlib.Path):
+    """`status` (run by every subagent) loads only the DB and agent modules."""
+    code = (
+        "import os, sys, simba.orchestration.__main__ as m; "
+        f"os.chdir({str(tmp_path)!r}); "
+        "m.main(['status', 'tkt-x', 'running']); "
+        "print(sorted(n for n in sys.modules if n.startswith('simba.orchestration')))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = proc.stdout.strip().splitlines()[-1]
+    assert loaded == (
+        "['simba.orchestration', 'simba.orchestration.__main__', "
+        "'simba.orchestration.agents', 'simba.orchestration.collector', "
+        "'simba.orchestration.config']"
+    )
+
+
+def test_status_updates_run(capsys, monkeypatch):
+    monkeypatch.setattr(simba.orchestration.collector, "send_status", _no_collector)
+    with simba.db.get_db() as conn:
+        conn.execute(
+            "INSERT INTO agent_runs (ticket_id, agent, status_id, created_at_utc)"
+            " VALUES (?, ?, ?, ?)",
+            ("tkt-cli", "analyst", 2, simba.orchestration.config.utc_now()),
+        )
+        conn.commit()
+
+    assert cli.main(["status", "tkt-cli", "failed", "-m", "boom"]) == 0
+    assert "tkt-cli -> failed" in capsys.readouterr().out
+
+    with simba.db.get_db() as conn:
+        row = conn.execute(
+            "SELECT status_id, error FROM agent_runs WHERE ticket_id = ?",
+            ("tkt-cli",),
+        ).fetchone()
+    assert row[0] == simba.orchestration.config.Status.FAILED
+    assert row[1] == "boom"
+
+
+def test_status_without_collector_is_one_immediate_transaction(monkeypatch):
+    """The fallback write is BEGIN IMMEDIATE; UPDATE; COMMIT on an autocommit
+    connection -- no implicit transaction from the sqlite3 module."""
+    monkeypatch.setattr(simba.orchestration.collector, "send_status", _no_collector)
+    statements: list[str] = []
+    with simba.db.connect() as db:
+        conn = db.connection()
+        assert conn.isolation_level is None
+        conn.set_trace_callback(statements.append)
+        assert cli.main(["status", "tkt-tx", "completed"]) == 0
+        conn.set_trace_callback(None)
+
+    assert len(statements) == 3
+    assert statements[0] == "BEGIN IMMEDIATE"
+    assert statements[1].startswith("UPDATE agent_runs SET status_id = 4,")
+    assert statements[2] == "COMMIT"
+
+
+def test_agents_inject_defaults_to_all_sections(tmp_path: pathlib.Path):
+    agents_dir = tmp_path / "agents"
+    agents_dir.mkdir()
+    (agents_dir / "a.md").write_text("# Agent\n")
+
+    assert cli.main(["agents", "--inject", "--dir", str(agents_dir)]) == 0
+
+    content = (agents_dir / "a.md").read_text()
+    for section in simba.orchestration.templates.MANAGED_SECTIONS:
+        assert f"<!-- BEGIN SIMBA:{section} -->" in content
+
+
+def _write_agent(agents_dir: pathlib.Path, name: str = "a.md") -> pathlib.Path:
+    path = agents_dir / name
+    path.write_text(
+        "# Agent\n\n<!-- BEGIN SIMBA:search_tools -->\n"
+        "<!-- END SIMBA:search_tools -->\n"
+    )
+    return path
+
+
+def test_sync_records_cache_and_skips_unchanged(tmp_path, monkeypatch, capsys):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    agent = _write_agent(agents_dir)
+    argv = [
+        "sync",
+        "--claude-md",
+        str(tmp_path / "CLAUDE.md"),
+        "--agents-dir",
+        str(agents_dir),
+    ]
+
+    assert cli.main(argv) == 0
+    assert "a.md" in capsys.readouterr().out
+    cache_path = tmp_path / ".claude" / ".sync-cache.json"
+    assert str(agent) in cache_path.read_text()
+
+    calls: list[str] = []
+    real = simba.orchestration.templates.update_managed_sections
+
+    def _spy(content: str) -> str:
+        calls.append(content)
+        return real(content)
+
+    monkeypatch.setattr(simba.orchestration.templates, "update_managed_sections", _spy)
+    assert cli.main(argv) == 0
+    assert calls == []
+    assert "a.md" not in capsys.readouterr().out
+
+
+def test_sync_reprocesses_edited_file(tmp_path, capsys):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    agent = _write_agent(agents_dir)
+    argv = [
+        "sync",
+        "--claude-md",
+        str(tmp_path / "CLAUDE.md"),
+        "--agents-dir",
+        str(agents_dir),
+    ]
+    cli.main(argv)
+
+    agent.write_text(
+        "# Edited\n\n<!-- BEGIN SIMBA:search_tools -->\n"
+        "<!-- END SIMBA:search_tools -->\n"
+    )
+    assert cli.main(argv) == 0
+
+    content = agent.read_text()
+    assert content.startswith("# Edited")
+    assert "SEARCH TOOLS" in content
+
+
+def test_sync_cache_invalidated_by_section_change(tmp_path, monkeypatch):
+    cache_path = tmp_path / ".sync-cache.json"
+    simba.orchestration.templates.save_sync_cache(cache_path, {"x": [1, "d"]})
+    assert simba.orchestration.templates.load_sync_cache(cache_path) == {"x": [1, "d"]}
+
+    monkeypatch.setitem(
+        simba.orchestration.templates.MANAGED_SECTIONS, "search_tools", "changed"
+    )
+    assert simba.orchestration.templates.load_sync_cache(cache_path) == {}
+
+
+def test_sync_reports_changed_files_in_sorted_order(tmp_path, capsys):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    for name in ("c.md", "a.md", "b.md"):
+        _write_agent(agents_dir, name)
+    argv = ["sync", "--claude-md", str(tmp_path / "CLAUDE.md")]
+
+    assert cli.main([*argv, "--agents-dir", str(agents_dir)]) == 0
+
+    lines = [ln.strip() for ln in capsys.readouterr().out.splitlines()]
+    assert [ln for ln in lines if ln.endswith(".md")] == ["a.md", "b.md", "c.md"]
+
+
+def test_known_command_builds_only_its_subparser():
+    parser = cli._build_parser(["status", "tkt", "running"])
+    subparsers = parser._subparsers._group_actions[0]
+    assert list(subparsers.choices) == ["status"]
+
+
+def test_help_builds_every_subparser():
+    parser = cli._build_parser(["--help"])
+    subparsers = parser._subparsers._group_actions[0]
+    assert list(subparsers.choices) == list(cli._SUBPARSER_BUILDERS)
+
+
+def test_update_migrates_legacy_neuron_markers():
+    content = (
+        "<!-- BEGIN NEURON:search_tools -->\nold\n<!-- END NEURON:search_tools -->\n"
+    )
+    updated = simba.orchestration.templates.update_managed_sections(content)
+    assert "NEURON:" not in updated
+    assert "<!-- BEGIN SIMBA:search_tools -->" in updated
+    assert "SEARCH TOOLS" in updated
+
+
+def test_sync_renders_sections_once_per_run(tmp_path, monkeypatch):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    for name in ("a.md", "b.md", "c.md"):
+        _write_agent(agents_dir, name)
+
+    calls: list[None] = []
+    real = simba.orchestration.templates.build_updates
+
+    def _counting() -> dict[str, str]:
+        calls.append(None)
+        return real()
+
+    monkeypatch.setattr(simba.orchestration.templates, "build_updates", _counting)
+    argv = ["sync", "--claude-md", str(tmp_path / "CLAUDE.md")]
+    assert cli.main([*argv, "--agents-dir", str(agents_dir)]) == 0
+
+    assert len(calls) == 1
+    for name in ("a.md", "b.md", "c.md"):
+        assert "SEARCH TOOLS" in (agents_dir / name).read_text()
+
+
+def test_agents_update_shares_sync_cache(tmp_path, monkeypatch, capsys):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    _write_agent(agents_dir)
+    argv = ["agents", "--update", "--dir", str(agents_dir)]
+
+    assert cli.main(argv) == 0
+    assert "a.md" in capsys.readouterr().out
+    assert (tmp_path / ".claude" / ".sync-cache.json").exists()
+
+    calls: list[str] = []
+    monkeypatch.setattr(
+        simba.orchestration.templates,
+        "update_managed_sections",
+        lambda content, updates=None: calls.append(content) or content,
+    )
+    assert cli.main(argv) == 0
+    assert calls == []
+    assert "a.md" not in capsys.readouterr().out
+
+
+def test_update_keeps_file_when_only_timestamp_would_change(monkeypatch):
+    content = simba.orchestration.templates.update_managed_sections(
+        "<!-- BEGIN SIMBA:search_tools -->\n<!-- END SIMBA:search_tools -->\n"
+    )
+
+    # Mid-2999 in every timezone.
+    monkeypatch.setattr(
+        simba.orchestration.templates.time, "time", lambda: 32487696000.0
+    )
+    assert simba.orchestration.templates.update_managed_sections(content) == content
+
+    edited = content.replace("SEARCH TOOLS", "OLD TOOLS")
+    updated = simba.orchestration.templates.update_managed_sections(edited)
+    assert "SEARCH TOOLS" in updated
+    assert "@ 2999-" in updated
+
+
+def test_timestamp_formatted_once_per_minute(monkeypatch):
+    clock = [32487696000.0]
+    calls: list[object] = []
+    real = simba.orchestration.templates.time.strftime
+    monkeypatch.setattr(simba.orchestration.templates.time, "time", lambda: clock[0])
+    monkeypatch.setattr(
+        simba.orchestration.templates.time,
+        "strftime",
+        lambda fmt, t: calls.append(t) or real(fmt, t),
+    )
+    monkeypatch.setattr(simba.orchestration.templates, "_timestamp_cache", None)
+
+    first = simba.orchestration.templates._current_timestamp()
+    clock[0] += 30
+    assert simba.orchestration.templates._current_timestamp() == first
+    assert len(calls) == 1
+
+    clock[0] += 60
+    assert simba.orchestration.templates._current_timestamp() != first
+    assert len(calls) == 2
+
+
+def test_inject_reports_files_in_sorted_order(tmp_path, capsys):
+    agents_dir = tmp_path / "agents"
+    agents_dir.mkdir()
+    for name in ("c.md", "a.md", "b.md"):
+        (agents_dir / name).write_text("# Agent\n")
+    (agents_dir / "d.md").write_text(
+        "# Agent\n\n<!-- BEGIN SIMBA:nav_tools -->\n<!-- END SIMBA:nav_tools -->\n"
+    )
+
+    simba.orchestration.templates.inject_markers(agents_dir, ["nav_tools"])
+
+    lines = [ln.strip() for ln in capsys.readouterr().out.splitlines()]
+    assert lines == [f"+ {n}.md: added nav_tools markers" for n in "abc"]
+    assert (
+        (agents_dir / "a.md")
+        .read_text()
+        .endswith("<!-- BEGIN SIMBA:nav_tools -->\n<!-- END SIMBA:nav_tools -->\n")
+    )
+
+
+def test_sync_ignores_non_markdown_and_directories(tmp_path):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    _write_agent(agents_dir)
+    (agents_dir / "notes.txt").write_text("<!-- BEGIN SIMBA:search_tools -->")
+    (agents_dir / "dir.md").mkdir()
+
+    changed = simba.orchestration.templates.sync_agents_dir(agents_dir)
+
+    assert [p.name for p in changed] == ["a.md"]
+    assert sorted(p.name for p in agents_dir.iterdir()) == [
+        "a.md",
+        "dir.md",
+        "notes.txt",
+    ]
+
+
+def test_sync_cache_digest_matches_written_bytes(tmp_path):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    agent = _write_agent(agents_dir)
+
+    assert simba.orchestration.templates.sync_agents_dir(agents_dir) == [agent]
+
+    cache = simba.orchestration.templates.load_sync_cache(
+        tmp_path / ".claude" / ".sync-cache.json"
+    )
+    digest = hashlib.blake2b(agent.read_bytes(), digest_size=16).hexdigest()
+    assert cache[str(agent)][1] == digest
+
+
+def test_sync_writes_through_symlinked_agent_file(tmp_path):
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    dotfiles = tmp_path / "dotfiles"
+    dotfiles.mkdir()
+    real = _write_agent(dotfiles)
+    real.chmod(0o640)
+    link = agents_dir / "a.md"
+    link.symlink_to(real)
+
+    assert simba.orchestration.templates.sync_agents_dir(agents_dir) == [link]
+
+    assert link.is_symlink()
+    assert "SEARCH TOOLS" in real.read_text()
+    assert real.stat().st_mode & 0o777 == 0o640
+    assert sorted(p.name for p in dotfiles.iterdir()) == ["a.md"]
+    assert sorted(p.name for p in agents_dir.iterdir()) == ["a.md"]
+
+
+def test_inject_appends_missing_blocks_in_section_order(tmp_path):
+    agents_dir = tmp_path / "agents"
+    agents_dir.mkdir()
+    agent = agents_dir / "a.md"
+    agent.write_text("# Agent\n\n\n")
+
+    simba.orchestration.templates.inject_markers(agents_dir, ["one", "two"])
+
+    assert agent.read_text() == (
+        "# Agent\n\n"
+        "<!-- BEGIN SIMBA:one -->\n<!-- END SIMBA:one -->\n\n"
+        "<!-- BEGIN SIMBA:two -->\n<!-- END SIMBA:two -->\n"
+    )
@@ -0,0 +1,272 @@
+"""Tests for simba.orchestration.proxy — the hot-reload MCP proxy."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import simba.orchestration.proxy
+
+# Stand-in MCP backend: echoes every stdin line back upper-cased.
+_ECHO_BACKEND = textwrap.dedent(
+    """
+    import sys
+    for line in sys.stdin:
+        sys.stdout.write(line.upper())
+        sys.stdout.flush()
+    """
+)
+
+
+def _start_proxy(
+    tmp_path: pathlib.Path, *, splice: bool, rootpath: pathlib.Path
+) -> subprocess.Popen[bytes]:
+    """Run an MCPProxy in a child process, wired to real stdio pipes."""
+    code = textwrap.dedent(
+        f"""
+        import asyncio, pathlib, sys
+        import simba.orchestration.proxy as proxy
+        if not {splice!r}:
+            proxy._can_splice = lambda fd: False
+        p = proxy.MCPProxy(
+            [sys.executable, "-c", {_ECHO_BACKEND!r}],
+            pid_file=pathlib.Path({str(tmp_path / "proxy.pid")!r}),
+            root_dir=pathlib.Path({str(tmp_path)!r}),
+        )
+        asyncio.run(p.run())
+        """
+    )
+    return subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=rootpath,
+    )
+
+
+def test_can_splice_only_pipes(tmp_path: pathlib.Path):
+    read_fd, write_fd = os.pipe()
+    try:
+        assert simba.orchestration.proxy._can_splice(read_fd) is hasattr(os, "splice")
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    with open(tmp_path / "f", "wb") as fh:
+        assert simba.orchestration.proxy._can_splice(fh.fileno()) is False
+
+
+@pytest.mark.asyncio
+async def test_stdout_writer_only_for_pipes(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    with open(tmp_path / "out", "wb") as fh:
+        monkeypatch.setattr(sys, "stdout", fh)
+        assert await simba.orchestration.proxy._stdout_writer() is None
+
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "wb") as fh:
+        monkeypatch.setattr(sys, "stdout", fh)
+        writer = await simba.orchestration.proxy._stdout_writer()
+        assert writer is not None
+        writer.write(b"ping\n")
+        await writer.drain()
+        writer.close()
+    try:
+        assert os.read(read_fd, 16) == b"ping\n"
+    finally:
+        os.close(read_fd)
+
+
+@pytest.mark.asyncio
+async def test_closing_stdout_writer_restores_blocking_mode(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    parent, child = socket.socketpair()
+    with parent, child, os.fdopen(os.dup(child.fileno()), "wb") as fh:
+        monkeypatch.setattr(sys, "stdout", fh)
+        writer = await simba.orchestration.proxy._stdout_writer()
+        assert writer is not None
+        # The transport's O_NONBLOCK lands on the description both fds share.
+        assert not os.get_blocking(child.fileno())
+        writer.write(b"x" * 1_000_000)
+        closing = asyncio.create_task(
+            simba.orchestration.proxy._close_stdout_writer(writer, True)
+        )
+        received = 0
+        while received < 1_000_000:
+            received += len(await asyncio.to_thread(parent.recv, 1 << 20))
+        await closing
+
+        assert os.get_blocking(child.fileno())
+
+
+@pytest.mark.skipif(not hasattr(os, "splice"), reason="splice mode is Linux-only")
+def test_backend_pipe_is_enlarged():
+    import fcntl
+
+    read_fd, write_fd = simba.orchestration.proxy._backend_pipe()
+    try:
+        size = fcntl.fcntl(write_fd, fcntl.F_GETPIPE_SZ)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    max_size = int(pathlib.Path("/proc/sys/fs/pipe-max-size").read_text())
+    wanted = simba.orchestration.proxy._PIPE_SIZE
+    assert size == (wanted if max_size >= wanted else 65536)
+
+
+@pytest.mark.parametrize("splice", [True, False], ids=["splice", "streams"])
+def test_forwards_lines_both_ways(
+    tmp_path: pathlib.Path, request: pytest.FixtureRequest, splice: bool
+):
+    if splice and not hasattr(os, "splice"):
+        pytest.skip("os.splice is Linux-only")
+    big = "x" * 300_000  # past asyncio's default 64 KiB line limit
+    proc = _start_proxy(tmp_path, splice=splice, rootpath=request.config.rootpath)
+    try:
+        proc.stdin.write(f"hello\n{big}\nbye\n".encode())
+        proc.stdin.flush()
+        lines = [proc.stdout.readline() for _ in range(3)]
+    finally:
+        proc.kill()
+        proc.wait()
+
+    assert lines == [b"HELLO\n", big.upper().encode() + b"\n", b"BYE\n"]
+
+
+def _wait_for_backend(proc: subprocess.Popen[bytes]) -> None:
+    while b"Backend started" not in proc.stderr.readline():
+        assert proc.poll() is None
+
+
+@pytest.mark.parametrize("splice", [True, False], ids=["splice", "streams"])
+def test_sighup_restarts_backend(
+    tmp_path: pathlib.Path, request: pytest.FixtureRequest, splice: bool
+):
+    if splice and not hasattr(os, "splice"):
+        pytest.skip("os.splice is Linux-only")
+    proc = _start_proxy(tmp_path, splice=splice, rootpath=request.config.rootpath)
+    try:
+        _wait_for_backend(proc)
+        proc.stdin.write(b"before\n")
+        proc.stdin.flush()
+        assert proc.stdout.readline() == b"BEFORE\n"
+
+        proc.send_signal(signal.SIGHUP)
+        _wait_for_backend(proc)
+        proc.stdin.write(b"after\n")
+        proc.stdin.flush()
+        assert proc.stdout.readline() == b"AFTER\n"
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+class _FakeTransport:
+    def __init__(self, buffered: int) -> None:
+        self.buffered = buffered
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+
+class _FakeWriter:
+    def __init__(self, buffered: int) -> None:
+        self.transport = _FakeTransport(buffered)
+        self.lines: list[bytes] = []
+        self.drains = 0
+
+    def write(self, data: bytes) -> None:
+        self.lines.append(data)
+
+    async def drain(self) -> None:
+        self.drains += 1
+
+
+def _stdin_pipe(monkeypatch: pytest.MonkeyPatch, data: bytes) -> None:
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, data)
+    os.close(write_fd)
+    monkeypatch.setattr(sys, "stdin", os.fdopen(read_fd, "rb"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("buffered", "drains"), [(0, 0), (1 << 16, 1)])
+async def test_stdin_drains_only_past_high_water(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    buffered: int,
+    drains: int,
+):
+    _stdin_pipe(monkeypatch, b"one\ntwo\n")
+    proxy = simba.orchestration.proxy.MCPProxy(
+        ["true"], pid_file=tmp_path / "proxy.pid", root_dir=tmp_path
+    )
+    writer = _FakeWriter(buffered)
+    proxy.backend = type("Backend", (), {"stdin": writer})()
+
+    await proxy.forward_stdin_to_backend()
+
+    # Both lines arrive in one read, so they reach the backend in one write.
+    assert writer.lines == [b"one\ntwo\n"]
+    assert writer.drains == drains
+
+
+@pytest.mark.asyncio
+async def test_stdin_holds_partial_line_until_newline(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    read_fd, write_fd = os.pipe()
+    monkeypatch.setattr(sys, "stdin", os.fdopen(read_fd, "rb"))
+    proxy = simba.orchestration.proxy.MCPProxy(
+        ["true"], pid_file=tmp_path / "proxy.pid", root_dir=tmp_path
+    )
+    writer = _FakeWriter(0)
+    proxy.backend = type("Backend", (), {"stdin": writer})()
+    task = asyncio.create_task(proxy.forward_stdin_to_backend())
+
+    os.write(write_fd, b'{"id": 1}\n{"id"')
+    while not writer.lines:
+        await asyncio.sleep(0.01)
+    assert writer.lines == [b'{"id": 1}\n']
+
+    os.write(write_fd, b": 2}\ntail")
+    os.close(write_fd)
+    await asyncio.wait_for(task, timeout=5)
+
+    assert writer.lines == [b'{"id": 1}\n', b'{"id": 2}\n', b"tail"]
+    assert proxy.running is False
+
+
+@pytest.mark.asyncio
+async def test_sighup_during_reload_restarts_again(tmp_path: pathlib.Path):
+    proxy = simba.orchestration.proxy.MCPProxy(
+        ["true"], pid_file=tmp_path / "proxy.pid", root_dir=tmp_path
+    )
+    starts = 0
+
+    async def _start_backend() -> None:
+        nonlocal starts
+        starts += 1
+        if starts == 1:
+            # Two more signals while the first restart is in flight.
+            proxy._handle_sighup()
+            proxy._handle_sighup()
+        await asyncio.sleep(0)
+
+    proxy.start_backend = _start_backend
+    proxy._handle_sighup()
+    first = proxy._reload_task
+    await first
+
+    assert proxy._reload_task is first  # later signals joined the same task
+    assert starts == 2
@@ -54,6 +54,30 @@ class TestLogActivity:
         assert rows[0]["tool_name"] == "grep"
         assert rows[1]["tool_name"] == "read"
 
+    def test_timestamp_formatted_once_per_second(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        tracker = simba.search.activity_tracker
+        clock = [1704067200.25]
+        calls: list[object] = []
+        real = tracker.time.strftime
+        monkeypatch.setattr(tracker.time, "time", lambda: clock[0])
+        monkeypatch.setattr(
+            tracker.time,
+            "strftime",
+            lambda fmt, t: calls.append(t) or real(fmt, t),
+        )
+        monkeypatch.setattr(tracker, "_timestamp_cache", None)
+
+        first = tracker._current_timestamp()
+        clock[0] += 0.5
+        assert tracker._current_timestamp() == first
+        assert len(calls) == 1
+
+        clock[0] += 1
+        assert tracker._current_timestamp() != first
+        assert len(calls) == 2
+
 
 # ---------------------------------------------------------------------------
 # TestReadActivityLog
@@ -83,6 +107,22 @@ class TestReadActivityLog:
         assert entries[0] == ("2024-01-01 10:00:00", "grep", "searched foo")
         assert entries[1] == ("2024-01-01 10:01:00", "read", "file.py")
 
+    def test_returns_newest_rows_while_rotation_pending(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        with simba.db.get_db(tmp_path) as conn:
+            conn.executemany(
+                "INSERT INTO activities (timestamp, tool_name, detail) "
+                "VALUES (?, ?, ?)",
+                [("2024-01-01 00:00:00", f"tool{i}", "") for i in range(210)],
+            )
+            conn.commit()
+
+        entries = simba.search.activity_tracker.read_activity_log(tmp_path)
+        assert len(entries) == 200
+        assert entries[0][1] == "tool10"
+        assert entries[-1][1] == "tool209"
+
     def test_returns_empty_list_when_db_missing(self, tmp_path: pathlib.Path) -> None:
         # Point to a path that does not have a DB file
         nonexistent = tmp_path / "nonexistent"
@@ -120,7 +160,7 @@ class TestClearActivityLog:
 class TestRotation:
     def test_keeps_only_last_200_rows(self, tmp_path: pathlib.Path) -> None:
         with simba.db.get_db(tmp_path) as conn:
-            for i in range(210):
+            for i in range(223):
                 conn.execute(
                     "INSERT INTO activities (timestamp, tool_name, detail) "
                     "VALUES (?, ?, ?)",
@@ -133,8 +173,44 @@ class TestRotation:
 
         with simba.db.get_db(tmp_path) as conn:
             count = conn.execute("SELECT COUNT(*) AS c FROM activities").fetchone()["c"]
-        # 210 existing + 1 new = 211, rotation keeps last 200
+        # 223 existing + 1 new = row id 224 (a multiple of 32), keeps last 200
         assert count == 200
+        entries = simba.search.activity_tracker.read_activity_log(tmp_path)
+        assert entries[0][1] == "tool24"
+        assert entries[-1][1] == "trigger"
+
+    def test_rotation_waits_for_threshold(self, tmp_path: pathlib.Path) -> None:
+        with simba.db.get_db(tmp_path) as conn:
+            for i in range(210):
+                conn.execute(
+                    "INSERT INTO activities (timestamp, tool_name, detail) "
+                    "VALUES (?, ?, ?)",
+                    (f"2024-01-01 00:00:{i:02d}", f"tool{i}", f"detail{i}"),
+                )
+            conn.commit()
+
+        simba.search.activity_tracker.log_activity(tmp_path, "trigger", "deferred")
+
+        with simba.db.get_db(tmp_path) as conn:
+            count = conn.execute("SELECT COUNT(*) AS c FROM activities").fetchone()["c"]
+        # Row id 211 is not a multiple of 32, so nothing is deleted yet.
+        assert count == 211
+
+    def test_threshold_under_cap_skips_delete(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        for i in range(31):
+            simba.search.activity_tracker.log_activity(tmp_path, f"tool{i}", "")
+
+        def _no_delete():
+            raise AssertionError("rotation ran below the row cap")
+
+        monkeypatch.setattr(
+            simba.search.activity_tracker.Activity, "delete", _no_delete
+        )
+        # Row id 32 hits the rotation threshold but cannot exceed 200 rows.
+        simba.search.activity_tracker.log_activity(tmp_path, "trigger", "")
+        assert len(simba.search.activity_tracker.read_activity_log(tmp_path)) == 32
 
     def test_no_rotation_under_200_rows(self, tmp_path: pathlib.Path) -> None:
         with simba.db.get_db(tmp_path) as conn:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 import unittest
 import unittest.mock
 
@@ -53,6 +54,20 @@ class TestCheckAll:
             assert found is True
             assert version == "1.0"
 
+    def test_probes_run_concurrently(self) -> None:
+        barrier = threading.Barrier(4, timeout=5)
+
+        def _probe(name: str) -> tuple[bool, str]:
+            barrier.wait()  # Raises BrokenBarrierError if probes run serially.
+            return (True, name)
+
+        with unittest.mock.patch(
+            "simba.search.deps.check_dependency", side_effect=_probe
+        ):
+            result = simba.search.deps.check_all()
+        assert list(result) == ["rg", "fzf", "jq", "qmd"]
+        assert result["jq"] == (True, "jq")
+
 
 # ---------------------------------------------------------------------------
 # TestGetInstallInstructions
@@ -5,6 +5,7 @@ from __future__ import annotations
 import pathlib
 import subprocess
 import sys
+import threading
 import unittest.mock
 
 import simba.db
@@ -86,6 +87,135 @@ class TestIndexCommand:
         qmd_calls = [c for c in mock_run.call_args_list if c.args[0][0] == "qmd"]
         assert len(qmd_calls) == 3
 
+    def test_context_added_after_collection(self, tmp_path: pathlib.Path) -> None:
+        deps = {
+            "rg": (False, "not found"),
+            "fzf": (False, "not found"),
+            "jq": (False, "not found"),
+            "qmd": (True, "1.0"),
+        }
+        calls: list[list[str]] = []
+
+        def _run(cmd: list[str], **_kwargs: object) -> unittest.mock.Mock:
+            calls.append(cmd)
+            return unittest.mock.Mock(returncode=0, stderr="")
+
+        db_path = tmp_path / ".simba" / "simba.db"
+        with (
+            unittest.mock.patch("simba.search.deps.check_all", return_value=deps),
+            unittest.mock.patch("simba.db.get_db_path", return_value=db_path),
+            unittest.mock.patch(
+                "simba.search.__main__.subprocess.run", side_effect=_run
+            ),
+        ):
+            code = simba.search.__main__._cmd_index(tmp_path)
+
+        assert code == 0
+        assert [c[1] for c in calls] == ["collection", "context", "embed"]
+
+    def test_failed_collection_stops_indexing(
+        self, tmp_path: pathlib.Path, capsys: object
+    ) -> None:
+        deps = {
+            "rg": (False, "not found"),
+            "fzf": (False, "not found"),
+            "jq": (False, "not found"),
+            "qmd": (True, "1.0"),
+        }
+        calls: list[list[str]] = []
+
+        def _run(cmd: list[str], **_kwargs: object) -> unittest.mock.Mock:
+            calls.append(cmd)
+            return unittest.mock.Mock(returncode=2, stderr="store is locked\n")
+
+        db_path = tmp_path / ".simba" / "simba.db"
+        with (
+            unittest.mock.patch("simba.search.deps.check_all", return_value=deps),
+            unittest.mock.patch("simba.db.get_db_path", return_value=db_path),
+            unittest.mock.patch(
+                "simba.search.__main__.subprocess.run", side_effect=_run
+            ),
+        ):
+            code = simba.search.__main__._cmd_index(tmp_path)
+
+        assert code == 0
+        assert [c[1] for c in calls] == ["collection"]
+        err = capsys.readouterr().err  # type: ignore[union-attr]
+        assert "QMD collection add returned code 2" in err
+        assert "store is locked" in err
+
+    def test_file_count_overlaps_embed(
+        self, tmp_path: pathlib.Path, capsys: object
+    ) -> None:
+        deps = {
+            "rg": (True, "14.0"),
+            "fzf": (False, "not found"),
+            "jq": (False, "not found"),
+            "qmd": (True, "1.0"),
+        }
+        counted = threading.Event()
+
+        def _run(cmd: list[str], **_kwargs: object) -> unittest.mock.Mock:
+            if cmd[0] == "rg":
+                counted.set()
+                return unittest.mock.Mock(returncode=0, stdout="a.py\nb.py\n")
+            if cmd[1] == "embed":
+                # Only finishes if the count is already running alongside it.
+                assert counted.wait(timeout=5)
+            return unittest.mock.Mock(returncode=0)
+
+        db_path = tmp_path / ".simba" / "simba.db"
+        with (
+            unittest.mock.patch("simba.search.deps.check_all", return_value=deps),
+            unittest.mock.patch("simba.db.get_db_path", return_value=db_path),
+            unittest.mock.patch(
+                "simba.search.__main__.subprocess.run", side_effect=_run
+            ),
+        ):
+            code = simba.search.__main__._cmd_index(tmp_path)
+
+        assert code == 0
+        out = capsys.readouterr().out  # type: ignore[union-attr]
+        assert "QMD indexing complete." in out
+        assert f"Project: {tmp_path.name} (2 files)" in out
+
+    def test_discarded_output_goes_to_devnull(
+        self, tmp_path: pathlib.Path, capsys: object
+    ) -> None:
+        deps = {
+            "rg": (False, "not found"),
+            "fzf": (False, "not found"),
+            "jq": (False, "not found"),
+            "qmd": (True, "1.0"),
+        }
+        kwargs: dict[str, dict] = {}
+
+        def _run(cmd: list[str], **kw: object) -> unittest.mock.Mock:
+            kwargs[cmd[1]] = kw
+            if cmd[1] == "embed":
+                return unittest.mock.Mock(returncode=2, stderr="no model\n")
+            return unittest.mock.Mock(returncode=0)
+
+        db_path = tmp_path / ".simba" / "simba.db"
+        with (
+            unittest.mock.patch("simba.search.deps.check_all", return_value=deps),
+            unittest.mock.patch("simba.db.get_db_path", return_value=db_path),
+            unittest.mock.patch(
+                "simba.search.__main__.subprocess.run", side_effect=_run
+            ),
+        ):
+            simba.search.__main__._cmd_index(tmp_path)
+
+        for sub in ("collection", "context", "embed"):
+            assert kwargs[sub]["stdout"] is subprocess.DEVNULL
+        assert kwargs["context"]["stderr"] is subprocess.DEVNULL
+        # Kept only for the steps whose failure is reported.
+        assert kwargs["collection"]["stderr"] is subprocess.PIPE
+        assert kwargs["embed"]["stderr"] is subprocess.PIPE
+        err = capsys.readouterr().err  # type: ignore[union-attr]
+        assert "QMD embed returned code 2" in err
+        assert "no model" in err
+
     def test_qmd_failure_does_not_crash(self, tmp_path: pathlib.Path) -> None:
         deps = {
             "rg": (False, "not found"),
@@ -130,3 +260,19 @@ class TestIndexCommand:
             code = simba.search.__main__.main()
 
         assert code == 0
+
+
+def test_module_import_is_lazy() -> None:
+    """Importing the CLI must not pull in project memory or the deps checker."""
+    code = (
+        "import sys, simba.search.__main__; "
+        "print(sorted(m for m in sys.modules if m.startswith('simba.search')))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = proc.stdout.strip()
+    assert loaded == "['simba.search', 'simba.search.__main__']"
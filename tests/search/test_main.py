@@ -0,0 +1,41 @@
+"""Tests for the ``simba search`` CLI's JSON output."""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import unittest.mock
+
+import pytest
+
+import simba.search.__main__
+
+
+@pytest.fixture
+def _run_stats(tmp_path: pathlib.Path):
+    def run(*extra: str) -> int:
+        db_path = tmp_path / ".simba" / "simba.db"
+        with (
+            unittest.mock.patch("simba.db.get_db_path", return_value=db_path),
+            unittest.mock.patch.object(sys, "argv", ["simba search", "stats", *extra]),
+            unittest.mock.patch("pathlib.Path.cwd", return_value=tmp_path),
+        ):
+            return simba.search.__main__.main()
+
+    return run
+
+
+def test_piped_output_is_compact(_run_stats, capsys) -> None:
+    assert _run_stats() == 0
+    out = capsys.readouterr().out
+    assert out.count("\n") == 1
+    assert ", " not in out
+    assert json.loads(out)
+
+
+def test_pretty_flag_indents(_run_stats, capsys) -> None:
+    assert _run_stats("--pretty") == 0
+    out = capsys.readouterr().out
+    assert out.startswith("{\n  ")
+    assert json.loads(out)
@@ -75,10 +75,48 @@ class TestSchema:
                 "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
             ).fetchall()
         table_names = {row["name"] for row in rows}
+        fts_tables = {"sessions_fts", "knowledge_fts", "facts_fts"}
         if _has_fts5():
-            assert "memory_fts" in table_names
+            assert fts_tables <= table_names
         else:
-            assert "memory_fts" not in table_names
+            assert not fts_tables & table_names
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_fts_index_stores_no_copy_of_the_text(self, cwd: pathlib.Path) -> None:
+        pm.add_fact(fact="Pin numpy below 2.0")
+        with simba.db.get_db(cwd) as conn:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'facts_fts%_content'"
+            ).fetchall()
+        assert rows == []
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_migrates_legacy_memory_fts(self, cwd: pathlib.Path) -> None:
+        with simba.db.get_db(cwd) as conn:
+            for suffix in pm._FTS_TOKENIZERS:
+                for table in pm._FTS_SOURCES:
+                    fts = f"{table}_{suffix}"
+                    conn.execute(f"DROP TABLE {fts}")
+                    for event in ("ai", "ad", "au"):
+                        conn.execute(f"DROP TRIGGER {fts}_{event}")
+            conn.executescript(
+                """
+                CREATE VIRTUAL TABLE memory_fts USING fts5(
+                    content, source_type, source_id
+                );
+                CREATE TRIGGER facts_ai AFTER INSERT ON facts BEGIN
+                    INSERT INTO memory_fts(content, source_type, source_id)
+                    VALUES (NEW.fact, 'fact', NEW.id);
+                END;
+                INSERT INTO facts(fact) VALUES ('Deploys go through staging');
+                """
+            )
+            pm._init_schema(conn)
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert "memory_fts" not in names
+        assert "facts_ai" not in names
+        results = pm.search_fts("staging", snippet=False)
+        assert results == [{"source_type": "fact", "source_id": 1}]
 
 
 # ---------------------------------------------------------------------------
@@ -124,6 +162,34 @@ class TestAddSession:
 # ---------------------------------------------------------------------------
 
 
+class TestAddMany:
+    def test_add_sessions_inserts_every_row(self, cwd: pathlib.Path) -> None:
+        rows = [(f"summary {i}", "[]", "[]", f"topic{i}") for i in range(3)]
+        assert pm.add_sessions(rows) == 3
+        assert pm.get_stats(cwd)["sessions"] == 3
+        topics = {s["topics"] for s in pm.get_recent_sessions(10)}
+        assert topics == {"topic0", "topic1", "topic2"}
+
+    def test_add_facts_uses_one_transaction(
+        self, cwd: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        opened = []
+        real = simba.db.write_transaction
+
+        def _counting(*args, **kwargs):
+            opened.append(args)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(simba.db, "write_transaction", _counting)
+        assert pm.add_facts([(f"fact {i}", "general") for i in range(1200)]) == 1200
+        assert len(opened) == 1
+        assert pm.get_stats(cwd)["facts"] == 1200
+
+    def test_empty_batch_is_a_no_op(self, cwd: pathlib.Path) -> None:
+        assert pm.add_facts([]) == 0
+        assert pm.add_sessions(iter(())) == 0
+
+
 class TestAddKnowledge:
     def test_returns_positive_rowid(self, cwd: pathlib.Path) -> None:
         rowid = pm.add_knowledge(
@@ -197,6 +263,63 @@ class TestSearchFts:
         assert len(results) >= 1
         assert results[0]["source_type"] == "session"
 
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_without_snippet_returns_ids_only(self, cwd: pathlib.Path) -> None:
+        rowid = pm.add_fact(fact="Redis caching is disabled in tests")
+        results = pm.search_fts("caching", snippet=False)
+        assert results == [{"source_type": "fact", "source_id": rowid}]
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_identifier_query_matches_substring(self, cwd: pathlib.Path) -> None:
+        rowid = pm.add_fact(fact="Call fetchUserProfile before rendering")
+        # The porter index only sees the whole token "fetchuserprofile".
+        results = pm.search_fts("UserProfile", snippet=False)
+        assert results == [{"source_type": "fact", "source_id": rowid}]
+        assert pm.search_fts("UserAccount") == []
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_new_index_is_built_from_existing_rows(self, cwd: pathlib.Path) -> None:
+        rowid = pm.add_fact(fact="Use parse_config_file for TOML")
+        with simba.db.get_db(cwd) as conn:
+            conn.execute("DROP TABLE facts_fts_tri")
+            pm._init_schema(conn)
+            rows = conn.execute(
+                "SELECT rowid FROM facts_fts_tri WHERE facts_fts_tri MATCH ?",
+                ('"config_file"',),
+            ).fetchall()
+        assert [r[0] for r in rows] == [rowid]
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_updates_and_deletes_stay_in_sync(self, cwd: pathlib.Path) -> None:
+        pm.add_knowledge(area="auth", summary="JWT tokens", patterns="")
+        pm.add_knowledge(area="auth", summary="Session cookies", patterns="")
+        assert pm.search_fts("JWT") == []
+        assert len(pm.search_fts("cookies")) == 1
+        with simba.db.get_db(cwd) as conn:
+            conn.execute("DELETE FROM knowledge")
+            conn.commit()
+        assert pm.search_fts("cookies") == []
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_ranks_across_sources(self, cwd: pathlib.Path) -> None:
+        pm.add_fact(fact="redis redis redis cache")
+        pm.add_session(
+            summary="Touched the cache once among many other unrelated words",
+            files_touched="",
+            tools_used="",
+            topics="",
+        )
+        results = pm.search_fts("redis cache")
+        assert [r["source_type"] for r in results] == ["fact"]
+        assert "**redis**" in results[0]["match"]
+
+    def test_looks_like_identifier(self) -> None:
+        assert pm._looks_like_identifier("build_context")
+        assert pm._looks_like_identifier("getStats")
+        assert not pm._looks_like_identifier("redis caching")
+        assert not pm._looks_like_identifier("Caching")
+        assert not pm._looks_like_identifier("aB")
+
     def test_empty_query_returns_empty(self, cwd: pathlib.Path) -> None:
         assert pm.search_fts("") == []
 
@@ -206,6 +329,51 @@ class TestSearchFts:
         assert isinstance(results, list)
 
 
+# ---------------------------------------------------------------------------
+# TestContextCache
+# ---------------------------------------------------------------------------
+
+
+def _cached(cwd: pathlib.Path, kind: str) -> list[str]:
+    with simba.db.get_db(cwd) as conn:
+        rows = conn.execute(
+            "SELECT text FROM context_cache WHERE kind = ?"
+            " ORDER BY created_at DESC, source_id DESC",
+            (kind,),
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+class TestContextCache:
+    def test_keeps_newest_rows_per_kind(self, cwd: pathlib.Path) -> None:
+        pm.add_facts([(f"fact {i}", "general") for i in range(8)])
+        for i in range(5):
+            pm.add_session(f"session {i}", "", "", "")
+        assert _cached(cwd, "fact") == [f"fact {i}" for i in (7, 6, 5, 4, 3)]
+        assert _cached(cwd, "session") == ["session 4", "session 3", "session 2"]
+
+    def test_delete_and_update_refill(self, cwd: pathlib.Path) -> None:
+        pm.add_facts([(f"fact {i}", "general") for i in range(6)])
+        with simba.db.get_db(cwd) as conn:
+            conn.execute("DELETE FROM facts WHERE fact = 'fact 5'")
+            conn.execute("UPDATE facts SET fact = 'edited' WHERE fact = 'fact 4'")
+            conn.commit()
+        assert _cached(cwd, "fact") == [
+            "edited",
+            "fact 3",
+            "fact 2",
+            "fact 1",
+            "fact 0",
+        ]
+
+    def test_seeded_when_created(self, cwd: pathlib.Path) -> None:
+        pm.add_fact(fact="Older than the cache")
+        with simba.db.get_db(cwd) as conn:
+            conn.execute("DROP TABLE context_cache")
+            pm._init_schema(conn)
+        assert _cached(cwd, "fact") == ["Older than the cache"]
+
+
 # ---------------------------------------------------------------------------
 # TestGetContext
 # ---------------------------------------------------------------------------
@@ -224,6 +392,62 @@ class TestGetContext:
         assert "## Relevant Code Areas" in ctx
         assert "auth" in ctx
 
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_knowledge_matches_patterns_via_fts(self, cwd: pathlib.Path) -> None:
+        pm.add_knowledge(area="api", summary="HTTP handlers", patterns="retries")
+        pm.add_fact(fact="Retry budget is three attempts")
+        ctx = pm.get_context(query="retry")
+        assert "- **api**: HTTP handlers" in ctx
+
+    @pytest.mark.skipif(not _has_fts5(), reason="FTS5 not available")
+    def test_knowledge_ignores_other_sources(self, cwd: pathlib.Path) -> None:
+        pm.add_knowledge(area="auth", summary="JWT tokens", patterns="")
+        pm.add_fact(fact="Deploys go through staging")
+        ctx = pm.get_context(query="staging")
+        assert "## Relevant Code Areas" not in ctx
+
+    def test_knowledge_falls_back_to_like_without_fts(self, cwd: pathlib.Path) -> None:
+        pm.add_knowledge(area="auth", summary="JWT-based auth", patterns="")
+        with simba.db.get_db(cwd) as conn:
+            conn.execute("DROP TABLE knowledge_fts")
+        ctx = pm.get_context(query="JWT")
+        assert "- **auth**: JWT-based auth" in ctx
+
+    def test_reads_in_one_transaction(
+        self, cwd: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        pm.add_fact(fact="Always run linter before commit")
+        pm.add_knowledge(area="lint", summary="ruff config", patterns="")
+        begins: list[str | None] = []
+        real_begin = simba.db.database.begin
+
+        def _begin(lock_type=None):
+            begins.append(lock_type)
+            return real_begin(lock_type)
+
+        monkeypatch.setattr(simba.db.database, "begin", _begin)
+        ctx = pm.get_context(query="lint")
+        assert "## Relevant Code Areas" in ctx
+        assert begins == ["DEFERRED"]
+
+    def test_skips_lookups_once_budget_is_spent(
+        self, cwd: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        pm.add_fact(fact="A fact long enough to use up the whole budget")
+        monkeypatch.setattr(pm, "_match_knowledge", pytest.fail)
+        monkeypatch.setattr(pm, "search_fts", pytest.fail)
+        ctx = pm.get_context(query="budget", token_budget=5)
+        assert ctx == "## Project Facts\n- A"
+
+    def test_budget_counts_section_separators(self, cwd: pathlib.Path) -> None:
+        pm.add_fact(fact="one")
+        pm.add_session("two", "", "", "")
+        full = pm.get_context(query="")
+        assert full == "## Project Facts\n- one\n\n## Recent Work\n- two"
+        assert pm.get_context(query="", token_budget=10) == full[:40]
+        assert len(full) == 44
+        assert pm.get_context(query="", token_budget=11) == full
+
     def test_truncates_to_token_budget(self, cwd: pathlib.Path) -> None:
         for i in range(20):
             pm.add_fact(fact=f"Fact number {i} with extra padding words")
@@ -303,3 +527,6 @@ class TestEscapeFtsQuery:
 
     def test_empty_string(self) -> None:
         assert pm._escape_fts_query("") == ""
+
+    def test_embedded_and_lone_quotes_dropped(self) -> None:
+        assert pm._escape_fts_query('a"b " c\t"') == '"ab" "c"'
@@ -78,6 +78,26 @@ class TestSearch:
         assert results[0]["score"] == "0.95"
         assert results[1]["path"] == "src/bar.py"
 
+    def test_parses_bytes_with_stdin_closed(self) -> None:
+        mock_result = unittest.mock.Mock()
+        mock_result.stdout = json.dumps([{"path": "qmd://a/qmd://b.py"}]).encode()
+        with unittest.mock.patch(
+            "simba.search.qmd.subprocess.run", return_value=mock_result
+        ) as mock_run:
+            results = simba.search.qmd.search("query")
+        assert results == [{"path": "a/qmd://b.py", "snippet": "", "score": ""}]
+        kwargs = mock_run.call_args.kwargs
+        assert kwargs["stdin"] is subprocess.DEVNULL
+        assert "text" not in kwargs
+
+    def test_returns_empty_list_on_undecodable_output(self) -> None:
+        mock_result = unittest.mock.Mock()
+        mock_result.stdout = b"\xff\xfe["
+        with unittest.mock.patch(
+            "simba.search.qmd.subprocess.run", return_value=mock_result
+        ):
+            assert simba.search.qmd.search("query") == []
+
     def test_returns_empty_list_on_subprocess_error(self) -> None:
         with unittest.mock.patch(
             "simba.search.qmd.subprocess.run",
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import pathlib
+import threading
 import unittest.mock
 
 import pytest
@@ -190,3 +191,30 @@ class TestBuildContext:
         assert "**Search terms:**" in result
         # "authentication" is not in the stop list so it should appear
         assert "authentication" in result
+
+    def test_qmd_runs_alongside_memory_read(self, cwd: pathlib.Path) -> None:
+        _seed_db(cwd)
+        memory_read = threading.Event()
+        real_get_context = simba.search.project_memory.get_context
+
+        def _get_context(*args, **kwargs):
+            memory_read.set()
+            return real_get_context(*args, **kwargs)
+
+        def _search(*_args, **_kwargs):
+            # Only completes if the memory read starts while qmd is running.
+            assert memory_read.wait(timeout=5)
+            return [{"path": "src/auth.py", "snippet": "", "score": "0.5"}]
+
+        with (
+            unittest.mock.patch("simba.search.qmd.is_available", return_value=True),
+            unittest.mock.patch("simba.search.qmd.search", side_effect=_search),
+            unittest.mock.patch(
+                "simba.search.project_memory.get_context", side_effect=_get_context
+            ),
+        ):
+            result = simba.search.rag_context.build_context(
+                "how does the authentication module work", cwd
+            )
+        assert "# Memory Context" in result
+        assert "src/auth.py" in result
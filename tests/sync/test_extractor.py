@@ -36,7 +36,7 @@ def db_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
     """Create a test DB with watermarks and the kg_edges schema.
 
     The extractor now stores facts into the temporal knowledge graph
-    (``kg_edges``) via :func:`simba.kg.store.kg_add`, so the test DB needs
+    (``kg_edges``) via :func:`simba.kg.store.kg_add_many`, so the test DB needs
     the kg schema (table + FTS mirror + sync triggers) installed.
     """
     simba_dir = tmp_path / ".simba"
@@ -48,7 +48,7 @@ def db_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
     simba.kg.store._init_schema(conn)
     conn.commit()
     conn.close()
-    # kg_add() now uses simba.db.connect() -> get_db_path; redirect it to this
+    # kg_add_many() uses simba.db.connect() -> get_db_path; redirect it to this
     # test DB so facts land here (not the real repo DB). Freeze the KG clock so
     # re-adding a fact collides on the UNIQUE(..., valid_from) key
     # deterministically (otherwise the two runs can straddle a second boundary).
@@ -202,6 +202,38 @@ class TestRunExtract:
             result = run_extract(db_dir)
         assert result.facts_duplicate >= 1
 
+    @patch("httpx.Client")
+    def test_facts_stored_in_one_transaction(
+        self, mock_client_cls: MagicMock, db_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client = MagicMock()
+        mock_client_cls.return_value = client
+        memories = [
+            {
+                "id": f"m{i}",
+                "type": "WORKING_SOLUTION",
+                "content": f"use {tool} for linting",
+                "context": "",
+                "createdAt": f"2025-01-0{i + 1}T00:00:00",
+            }
+            for i, tool in enumerate(("ruff", "black", "isort"))
+        ]
+        client.get.return_value = _mock_list_response(memories)
+        begins: list[str | None] = []
+        real_begin = simba.db.database.begin
+
+        def _begin(lock_type=None):
+            begins.append(lock_type)
+            return real_begin(lock_type)
+
+        monkeypatch.setattr(simba.db.database, "begin", _begin)
+        monkeypatch.setattr(simba.kg.store, "kg_add", pytest.fail)
+
+        result = run_extract(db_dir)
+
+        assert result.facts_extracted == 3
+        assert begins == ["IMMEDIATE"]
+
     @patch("httpx.Client")
     def test_no_match_memories_collected(
         self, mock_client_cls: MagicMock, db_dir: Path
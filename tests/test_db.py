@@ -5,6 +5,8 @@ from __future__ import annotations
 import pathlib
 import shutil
 import sqlite3
+import threading
+import time
 
 import pytest
 
@@ -29,6 +31,44 @@ class TestFindRepoRoot:
         result = simba.db.find_repo_root(tmp_path)
         assert result is None
 
+    def test_ignores_git_file(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / ".git").write_text("gitdir: elsewhere\n")
+        assert simba.db.find_repo_root(tmp_path) is None
+
+    def test_remembers_found_root(self, tmp_path: pathlib.Path) -> None:
+        repo = tmp_path / "repo"
+        (repo / ".git").mkdir(parents=True)
+        subdir = repo / "src"
+        subdir.mkdir()
+        assert simba.db.find_repo_root(subdir) == repo.resolve()
+        assert simba.db._repo_roots[subdir] == repo.resolve()
+        # A hit costs one stat of the cached root, not another walk.
+        (subdir / ".git").mkdir()
+        assert simba.db.find_repo_root(subdir) == repo.resolve()
+
+    def test_drops_root_whose_repo_is_gone(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / ".git").mkdir()
+        assert simba.db.find_repo_root(tmp_path) == tmp_path.resolve()
+        (tmp_path / ".git").rmdir()
+        assert simba.db.find_repo_root(tmp_path) is None
+        assert tmp_path not in simba.db._repo_roots
+
+    def test_relative_path_follows_chdir(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        first, second = tmp_path / "first", tmp_path / "second"
+        for repo in (first, second):
+            (repo / ".git").mkdir(parents=True)
+        monkeypatch.chdir(first)
+        assert simba.db.find_repo_root(pathlib.Path(".")) == first.resolve()
+        monkeypatch.chdir(second)
+        assert simba.db.find_repo_root(pathlib.Path(".")) == second.resolve()
+
+    def test_rechecks_after_a_miss(self, tmp_path: pathlib.Path) -> None:
+        assert simba.db.find_repo_root(tmp_path) is None
+        (tmp_path / ".git").mkdir()
+        assert simba.db.find_repo_root(tmp_path) == tmp_path.resolve()
+
 
 class TestResolveProjectId:
     @pytest.fixture(autouse=True)
@@ -112,6 +152,28 @@ class TestRegisterSchema:
         assert len(calls) >= 1
         assert len(tables) == 1
 
+    def test_initializers_run_once_per_database(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls: list[bool] = []
+        monkeypatch.setattr(
+            simba.db,
+            "_SCHEMA_INITIALIZERS",
+            [*simba.db._SCHEMA_INITIALIZERS, lambda conn: calls.append(True)],
+        )
+
+        for _ in range(3):
+            with simba.db.get_db(tmp_path):
+                pass
+        with simba.db.connect(tmp_path):
+            pass
+        assert calls == [True]
+
+        simba.db.get_db_path(tmp_path).unlink()
+        with simba.db.get_db(tmp_path):
+            pass
+        assert calls == [True, True]
+
     def test_register_adds_to_list(self, monkeypatch: pytest.MonkeyPatch) -> None:
         original = list(simba.db._SCHEMA_INITIALIZERS)
         monkeypatch.setattr(simba.db, "_SCHEMA_INITIALIZERS", original)
@@ -147,6 +209,154 @@ class TestGetDb:
         with pytest.raises(sqlite3.ProgrammingError):
             conn.execute("SELECT 1")
 
+    def test_connection_uses_wal(self, tmp_path: pathlib.Path) -> None:
+        with simba.db.get_db(tmp_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_peewee_connection_uses_wal(self, tmp_path: pathlib.Path) -> None:
+        with simba.db.connect(tmp_path) as db:
+            assert db.pragma("journal_mode") == "wal"
+            assert db.pragma("temp_store") == 2  # MEMORY
+            assert db.pragma("mmap_size") == 268435456
+
+    def test_connections_enlarge_statement_cache(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        seen: list[int] = []
+        real_connect = sqlite3.connect
+
+        def _connect(*args, **kwargs):
+            seen.append(kwargs.get("cached_statements"))
+            return real_connect(*args, **kwargs)
+
+        monkeypatch.setattr(sqlite3, "connect", _connect)
+        simba.db.open_db(tmp_path / "raw.db").close()
+        with simba.db.connect(tmp_path):
+            pass
+        assert seen == [simba.db.CACHED_STATEMENTS] * 2
+
+    def test_first_open_analyzes(self, tmp_path: pathlib.Path) -> None:
+        with simba.db.get_db(tmp_path) as conn:
+            assert conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+
+    def test_close_does_not_optimize(self, tmp_path: pathlib.Path) -> None:
+        statements: list[str] = []
+        with simba.db.get_db(tmp_path) as conn:
+            conn.set_trace_callback(statements.append)
+        with simba.db.connect(tmp_path) as db:
+            db.connection().set_trace_callback(statements.append)
+        assert statements == []
+
+    def test_reopen_optimizes_without_waiting(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        with simba.db.get_db(tmp_path):
+            pass
+        statements: list[str] = []
+        real_connect = sqlite3.connect
+
+        def _connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        monkeypatch.setattr(sqlite3, "connect", _connect)
+        simba.db._raw_schema_ready.clear()
+        with simba.db.get_db(tmp_path) as conn:
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        i = statements.index("PRAGMA optimize=0x10002")
+        assert statements[i - 2 : i + 2] == [
+            "PRAGMA busy_timeout = 0",
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'",
+            "PRAGMA optimize=0x10002",
+            "PRAGMA busy_timeout = 5000",
+        ]
+
+    def test_refresh_skipped_while_another_writer_holds_lock(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        with simba.db.get_db(tmp_path) as conn:
+            conn.execute("DROP TABLE sqlite_stat1")
+        db_path = simba.db.get_db_path(tmp_path)
+        writer = sqlite3.connect(db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("PRAGMA busy_timeout = 5000")
+            start = time.monotonic()
+            simba.db._refresh_stats(conn)
+            assert time.monotonic() - start < 2
+            assert not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        finally:
+            conn.close()
+            writer.rollback()
+            writer.close()
+
+
+class TestOpenDb:
+    def test_creates_schema_and_parent_dirs(self, tmp_path: pathlib.Path) -> None:
+        db_path = tmp_path / ".simba" / "simba.db"
+        conn = simba.db.open_db(db_path)
+        try:
+            assert db_path.exists()
+            assert conn.row_factory is sqlite3.Row
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
+    def test_shared_connection_usable_from_other_thread(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        conn = simba.db.open_db(tmp_path / "simba.db", check_same_thread=False)
+        result: list[int] = []
+        worker = threading.Thread(
+            target=lambda: result.append(conn.execute("SELECT 1").fetchone()[0])
+        )
+        worker.start()
+        worker.join()
+        conn.close()
+        assert result == [1]
+
+
+class TestTransactions:
+    def test_write_transaction_commits(self, tmp_path: pathlib.Path) -> None:
+        with simba.db.write_transaction(tmp_path) as db:
+            db.execute_sql("CREATE TABLE t (x INTEGER)")
+            db.execute_sql("INSERT INTO t VALUES (1)")
+        with simba.db.read_transaction(tmp_path) as db:
+            assert db.execute_sql("SELECT x FROM t").fetchall() == [(1,)]
+
+    def test_write_transaction_rolls_back_on_error(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        with simba.db.write_transaction(tmp_path) as db:
+            db.execute_sql("CREATE TABLE t (x INTEGER)")
+        with pytest.raises(RuntimeError), simba.db.write_transaction(tmp_path) as db:
+            db.execute_sql("INSERT INTO t VALUES (1)")
+            raise RuntimeError("boom")
+        with simba.db.read_transaction(tmp_path) as db:
+            assert db.execute_sql("SELECT count(*) FROM t").fetchone() == (0,)
+
+    def test_reader_not_blocked_by_open_writer(self, tmp_path: pathlib.Path) -> None:
+        with simba.db.write_transaction(tmp_path) as db:
+            db.execute_sql("CREATE TABLE t (x INTEGER)")
+        writer = sqlite3.connect(str(simba.db.get_db_path(tmp_path)))
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("INSERT INTO t VALUES (1)")
+            with simba.db.read_transaction(tmp_path) as db:
+                assert db.execute_sql("SELECT count(*) FROM t").fetchone() == (0,)
+        finally:
+            writer.rollback()
+            writer.close()
+
 
 class TestGetConnection:
     def test_returns_none_when_db_missing(self, tmp_path: pathlib.Path) -> None:
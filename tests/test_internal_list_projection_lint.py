@@ -47,11 +47,11 @@ ALLOWLIST: set[tuple[str, int]] = {
     ("src/simba/__main__.py", 2999),
     # `simba eval build`: human-invoked CLI; needs real content/context to
     # build eval cases.
-    ("src/simba/__main__.py", 4167),
+    ("src/simba/__main__.py", 4160),
     # `simba rules list`: human-facing CLI, type-filtered + limit=50.
-    ("src/simba/rules_cli.py", 104),
+    ("src/simba/rules_cli.py", 119),
     # `simba rules prune`: human-facing CLI, type-filtered + limit=1000.
-    ("src/simba/rules_cli.py", 168),
+    ("src/simba/rules_cli.py", 181),
 }
 
 
@@ -205,6 +205,24 @@ class TestUpdateBlocks:
         result = simba.markers.update_blocks(content, {"anything": "value\n"})
         assert result == content
 
+    def test_names_sharing_a_prefix(self) -> None:
+        content = (
+            "<!-- BEGIN SIMBA:tools -->\nold\n<!-- END SIMBA:tools -->\n"
+            "<!-- BEGIN SIMBA:tools_extra -->\nold\n<!-- END SIMBA:tools_extra -->\n"
+        )
+        result = simba.markers.update_blocks(
+            content, {"tools": "T\n", "tools_extra": "X\n"}
+        )
+        assert result == (
+            "<!-- BEGIN SIMBA:tools -->\nT\n<!-- END SIMBA:tools -->\n"
+            "<!-- BEGIN SIMBA:tools_extra -->\nX\n<!-- END SIMBA:tools_extra -->\n"
+        )
+
+    def test_new_content_inserted_literally(self) -> None:
+        content = "<!-- BEGIN SIMBA:re -->\n<!-- END SIMBA:re -->\n"
+        result = simba.markers.update_blocks(content, {"re": "rg '\\d+' \\1\n"})
+        assert "rg '\\d+' \\1\n" in result
+
 
 class TestHasMarker:
     def test_true_when_marker_exists(self) -> None:
@@ -218,6 +236,27 @@ class TestHasMarker:
         assert simba.markers.has_marker(content, "core") is False
 
 
+class TestPresentMarkers:
+    def test_returns_only_exact_begin_markers(self) -> None:
+        content = (
+            "<!-- BEGIN SIMBA:core -->\n<!-- END SIMBA:core -->\n"
+            "<!-- BEGIN SIMBA:core_extra -->\n<!-- END SIMBA:core_extra -->\n"
+            "<!-- END SIMBA:tools -->\n"
+        )
+        found = simba.markers.present_markers(content, ["core", "tools", "a.b"])
+        assert found == {"core"}
+
+    def test_agrees_with_has_marker(self) -> None:
+        content = "x <!-- BEGIN SIMBA:a.b --> y <!-- BEGIN SIMBA:axb -->"
+        names = ["a.b", "axb", "ab", "a"]
+        assert simba.markers.present_markers(content, names) == {
+            n for n in names if simba.markers.has_marker(content, n)
+        }
+
+    def test_no_names(self) -> None:
+        assert simba.markers.present_markers("<!-- BEGIN SIMBA:x -->", []) == set()
+
+
 class TestMakeEmptyBlock:
     def test_correct_format(self) -> None:
         block = simba.markers.make_empty_block("managed")
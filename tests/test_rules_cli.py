@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import contextlib
+
+import httpx
+import pytest
+
+import simba.config
 import simba.db
 import simba.rules_cli as rc
 
@@ -26,8 +32,25 @@ def _rule(mid, project, content="Bash: boom", created="2026-05-30T00:00:00Z"):
     }
 
 
+class _FakeClient:
+    """Stands in for the CLI's shared httpx.Client; tests patch its verbs."""
+
+    def _unexpected(self, *a, **k):
+        raise AssertionError("unexpected daemon call")
+
+    get = post = delete = _unexpected
+
+
+_CLIENT = _FakeClient()
+
+
+@pytest.fixture(autouse=True)
+def _fake_client(monkeypatch):
+    monkeypatch.setattr(rc, "_client", lambda: contextlib.nullcontext(_CLIENT))
+
+
 def _patch_list(monkeypatch, memories):
-    monkeypatch.setattr(rc.httpx, "get", lambda *a, **k: _Resp({"memories": memories}))
+    monkeypatch.setattr(_CLIENT, "get", lambda *a, **k: _Resp({"memories": memories}))
 
 
 class TestAddScoping:
@@ -39,7 +62,7 @@ class TestAddScoping:
             sent.update(json or {})
             return _Resp({"status": "stored", "id": "m1"})
 
-        monkeypatch.setattr(rc.httpx, "post", _post)
+        monkeypatch.setattr(_CLIENT, "post", _post)
         rc.main(["add", "--tool", "Bash", "--correction", "do X", "--project", "/repo"])
         # Stored under the resolved id (matcher recalls by the same), not /repo.
         assert sent["projectPath"] == "resolved-X"
@@ -64,6 +87,35 @@ class TestListScoping:
         assert "m1" in out
         assert "m2" in out
 
+    def test_list_output_lines(self, monkeypatch, capsys) -> None:
+        monkeypatch.setattr(simba.db, "resolve_project_id", lambda p=None: "proj-A")
+        rule = _rule("m1", "proj-A")
+        rule["context"] = '{"tool": "Bash", "correction": "use rg"}'
+        _patch_list(monkeypatch, [rule, _rule("m2", "proj-A")])
+
+        rc.main(["list"])
+        assert capsys.readouterr().out == (
+            "  m1  [Bash]  Bash: boom\n"
+            "         INSTEAD: use rg\n"
+            "         project: proj-A\n"
+            "  m2  [?]  Bash: boom\n"
+            "         project: proj-A\n"
+        )
+
+    def test_list_pushes_project_filter_to_daemon(self, monkeypatch) -> None:
+        monkeypatch.setattr(simba.db, "resolve_project_id", lambda p=None: "proj-A")
+        sent: list[dict] = []
+
+        def _get(url, params=None, **k):
+            sent.append(params)
+            return _Resp({"memories": []})
+
+        monkeypatch.setattr(_CLIENT, "get", _get)
+        rc.main(["list"])
+        rc.main(["list", "--all"])
+        assert sent[0]["projectPath"] == "proj-A"
+        assert "projectPath" not in sent[1]
+
 
 class TestPrune:
     def test_dry_run_lists_without_deleting(self, monkeypatch, capsys) -> None:
@@ -73,7 +125,7 @@ class TestPrune:
         def _no_delete(*a, **k):
             raise AssertionError("delete must not be called on --dry-run")
 
-        monkeypatch.setattr(rc.httpx, "delete", _no_delete)
+        monkeypatch.setattr(_CLIENT, "delete", _no_delete)
 
         rc.main(["prune", "--dry-run"])
         out = capsys.readouterr().out
@@ -88,7 +140,7 @@ class TestPrune:
             deleted.append(url.rsplit("/", 1)[-1])
             return _Resp({}, status=200)
 
-        monkeypatch.setattr(rc.httpx, "delete", _delete)
+        monkeypatch.setattr(_CLIENT, "delete", _delete)
 
         rc.main(["prune", "--all-projects"])
         out = capsys.readouterr().out
@@ -100,7 +152,7 @@ class TestPrune:
         _patch_list(monkeypatch, [_rule("m1", "proj-A"), _rule("m2", "proj-B")])
         deleted: list[str] = []
         monkeypatch.setattr(
-            rc.httpx,
+            _CLIENT,
             "delete",
             lambda url, **k: deleted.append(url.rsplit("/", 1)[-1]) or _Resp({}, 200),
         )
@@ -119,7 +171,7 @@ class TestPrune:
         )
         deleted: list[str] = []
         monkeypatch.setattr(
-            rc.httpx,
+            _CLIENT,
             "delete",
             lambda url, **k: deleted.append(url.rsplit("/", 1)[-1]) or _Resp({}, 200),
         )
@@ -131,3 +183,53 @@ class TestPrune:
         monkeypatch.setattr(simba.db, "resolve_project_id", lambda p=None: "proj-A")
         _patch_list(monkeypatch, [_rule("m1", "proj-A")])
         assert rc.main(["prune", "--older-than", "soon"]) == 1
+
+
+class TestSharedClient:
+    def test_prune_reuses_one_client(self, monkeypatch, capsys) -> None:
+        monkeypatch.setattr(simba.db, "resolve_project_id", lambda p=None: "proj-A")
+        monkeypatch.setattr(rc, "_daemon_url", lambda: "http://daemon")
+        seen: list[tuple[str, str]] = []
+        memories = [_rule("m1", "proj-A"), _rule("m2", "proj-A")]
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.method, request.url.path))
+            if request.url.path == "/list":
+                return httpx.Response(200, json={"memories": memories})
+            return httpx.Response(200, json={})
+
+        clients: list[httpx.Client] = []
+
+        def _client() -> httpx.Client:
+            client = httpx.Client(
+                base_url=rc._daemon_url(), transport=httpx.MockTransport(_handler)
+            )
+            clients.append(client)
+            return client
+
+        monkeypatch.setattr(rc, "_client", _client)
+        assert rc.main(["prune"]) == 0
+
+        assert len(clients) == 1
+        assert clients[0].is_closed
+        assert seen == [
+            ("GET", "/list"),
+            ("DELETE", "/memory/m1"),
+            ("DELETE", "/memory/m2"),
+        ]
+
+    def test_daemon_url_loads_config_once(self, monkeypatch) -> None:
+        loads: list[str] = []
+        real_load = simba.config.load
+
+        def _load(section, *a, **k):
+            loads.append(section)
+            return real_load(section, *a, **k)
+
+        rc._daemon_url.cache_clear()
+        monkeypatch.setattr(simba.config, "load", _load)
+        try:
+            assert rc._daemon_url() == rc._daemon_url()
+        finally:
+            rc._daemon_url.cache_clear()
+        assert loads == ["hooks"]
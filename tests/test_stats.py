@@ -5,6 +5,11 @@ from __future__ import annotations
 import pathlib
 import unittest.mock
 
+import pytest
+
+import simba.db
+import simba.search.activity_tracker
+import simba.search.project_memory
 import simba.stats
 
 
@@ -24,20 +29,17 @@ class TestCountActivities:
 
 class TestCodebaseSize:
     def test_returns_file_and_line_counts(self, tmp_path: pathlib.Path) -> None:
-        mock_files = unittest.mock.Mock()
-        mock_files.stdout = "a.py\nb.py\nc.py\n"
-
-        mock_lines = unittest.mock.Mock()
-        mock_lines.stdout = "a.py:10\nb.py:20\nc.py:30\n"
+        mock_counts = unittest.mock.Mock()
+        mock_counts.stdout = b"a.py\x0010\nb:c.py\x0020\nempty.py\x000\n"
 
         with unittest.mock.patch(
-            "simba.stats.subprocess.run",
-            side_effect=[mock_files, mock_lines],
-        ):
+            "simba.stats.subprocess.run", return_value=mock_counts
+        ) as mock_run:
             files, lines = simba.stats._codebase_size(tmp_path)
 
         assert files == 3
-        assert lines == 60
+        assert lines == 30
+        mock_run.assert_called_once()
 
     def test_returns_zeros_on_error(self, tmp_path: pathlib.Path) -> None:
         import subprocess
@@ -54,11 +56,8 @@ class TestCodebaseSize:
 
 class TestRunStats:
     def test_includes_all_sections(self, tmp_path: pathlib.Path) -> None:
-        mock_files = unittest.mock.Mock()
-        mock_files.stdout = "a.py\nb.py\n"
-
-        mock_lines = unittest.mock.Mock()
-        mock_lines.stdout = "a.py:100\nb.py:200\n"
+        mock_counts = unittest.mock.Mock()
+        mock_counts.stdout = b"a.py\x00100\nb.py\x00200\n"
 
         entries = [
             ("2025-01-01 10:00:00", "search", "query1"),
@@ -68,7 +67,7 @@ class TestRunStats:
         with (
             unittest.mock.patch(
                 "simba.stats.subprocess.run",
-                side_effect=[mock_files, mock_lines],
+                return_value=mock_counts,
             ),
             unittest.mock.patch(
                 "simba.search.activity_tracker.read_activity_log",
@@ -92,11 +91,8 @@ class TestRunStats:
     def test_includes_project_memory_when_available(
         self, tmp_path: pathlib.Path
     ) -> None:
-        mock_files = unittest.mock.Mock()
-        mock_files.stdout = ""
-
-        mock_lines = unittest.mock.Mock()
-        mock_lines.stdout = ""
+        mock_counts = unittest.mock.Mock()
+        mock_counts.stdout = b""
 
         db_file = tmp_path / ".simba" / "simba.db"
         db_file.parent.mkdir(parents=True, exist_ok=True)
@@ -105,7 +101,7 @@ class TestRunStats:
         with (
             unittest.mock.patch(
                 "simba.stats.subprocess.run",
-                side_effect=[mock_files, mock_lines],
+                return_value=mock_counts,
             ),
             unittest.mock.patch(
                 "simba.search.activity_tracker.read_activity_log",
@@ -123,16 +119,13 @@ class TestRunStats:
         assert "Facts: 10" in result
 
     def test_no_activity_log(self, tmp_path: pathlib.Path) -> None:
-        mock_files = unittest.mock.Mock()
-        mock_files.stdout = ""
-
-        mock_lines = unittest.mock.Mock()
-        mock_lines.stdout = ""
+        mock_counts = unittest.mock.Mock()
+        mock_counts.stdout = b""
 
         with (
             unittest.mock.patch(
                 "simba.stats.subprocess.run",
-                side_effect=[mock_files, mock_lines],
+                return_value=mock_counts,
             ),
             unittest.mock.patch(
                 "simba.search.activity_tracker.read_activity_log",
@@ -149,11 +142,8 @@ class TestRunStats:
         assert "Searches: 0" in result
 
     def test_token_savings_calculation(self, tmp_path: pathlib.Path) -> None:
-        mock_files = unittest.mock.Mock()
-        mock_files.stdout = ""
-
-        mock_lines = unittest.mock.Mock()
-        mock_lines.stdout = ""
+        mock_counts = unittest.mock.Mock()
+        mock_counts.stdout = b""
 
         # 3 searches + 2 reads = 150 + 2000 = 2150 tokens
         # without = 20000 tokens
@@ -169,7 +159,7 @@ class TestRunStats:
         with (
             unittest.mock.patch(
                 "simba.stats.subprocess.run",
-                side_effect=[mock_files, mock_lines],
+                return_value=mock_counts,
             ),
             unittest.mock.patch(
                 "simba.search.activity_tracker.read_activity_log",
@@ -185,3 +175,28 @@ class TestRunStats:
         assert "~2,150 tokens" in result
         assert "~20,000 tokens" in result
         assert "~89%" in result
+
+    def test_database_reads_share_one_connection(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        db_path = tmp_path / ".simba" / "simba.db"
+        monkeypatch.setattr(simba.db, "get_db_path", lambda cwd=None: db_path)
+        simba.search.activity_tracker.log_activity(tmp_path, "read", "a.py")
+        simba.search.project_memory.add_fact("uses ruff")
+
+        opened = []
+        real_connect = simba.db.database.connect
+
+        def _connect(*args, **kwargs):
+            opened.append(1)
+            return real_connect(*args, **kwargs)
+
+        monkeypatch.setattr(simba.db.database, "connect", _connect)
+        mock_run = unittest.mock.Mock(return_value=unittest.mock.Mock(stdout=b""))
+        monkeypatch.setattr(simba.stats.subprocess, "run", mock_run)
+
+        result = simba.stats.run_stats(tmp_path)
+
+        assert "Activity (1 logged events)" in result
+        assert "Facts: 1" in result
+        assert len(opened) == 1